@@ -0,0 +1,60 @@
+# benchmarks/bench_invoice_numbers.py
+# Several processes allocate invoice numbers concurrently from one database file,
+# each allocation in its own transaction. Checks for duplicates and reports throughput.
+#
+#   python -m benchmarks.bench_invoice_numbers
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.invoice_number_service import InvoiceNumberService
+
+PROCESSES = 4
+TRANSACTIONS = 500
+
+
+def _allocator(path, block_size, results):
+    engine = create_db_engine(path)
+    Session = sessionmaker(bind=engine)
+    service = InvoiceNumberService()
+    numbers = []
+    for _ in range(TRANSACTIONS):
+        with Session() as session:
+            numbers.extend(service.allocate_block(session, block_size))
+            session.commit()
+    results.put(numbers)
+
+
+def run(block_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_db_engine(path)
+        run_migrations(engine)
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_allocator, args=(path, block_size, results)) for _ in range(PROCESSES)]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        numbers = [n for _ in procs for n in results.get()]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+    return len(numbers), len(numbers) - len(set(numbers)), elapsed
+
+
+def main():
+    print(f"{'block':>6}{'numbers':>10}{'duplicates':>12}{'numbers/s':>12}")
+    for block_size in (1, 10, 100):
+        total, duplicates, elapsed = run(block_size)
+        print(f"{block_size:>6}{total:>10}{duplicates:>12}{total / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
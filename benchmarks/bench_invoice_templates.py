@@ -0,0 +1,72 @@
+# benchmarks/bench_invoice_templates.py
+# Renders invoices with each registered template, once placing the static
+# layer as a form XObject and once drawing it inline on every page (the
+# old way), and reports render time and PDF size. The multi-page case puts many
+# invoices in one document, where the form is stored once and reused per page.
+#
+#   python -m benchmarks.bench_invoice_templates
+import io
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from src.utils.invoice_documents import PdfSettings
+from src.utils.invoice_template import TEMPLATES
+
+RUNS = 300
+PAGES = 50
+
+SETTINGS = PdfSettings(
+    company_name="Sharma Traders", address="12 MG Road, Pune 411001", state_code="27",
+    gstin="27ABCDE1234F1Z5", pan_number="ABCDE1234F", mobile_number="9800000000",
+    email="accounts@sharmatraders.in", upi_id="sharmatraders@upi", tagline="Thank you for your business!",
+    logo_filepath="", chosen_template="Modern",
+)
+INVOICE = {
+    "invoice_number": "INV-2425-00042",
+    "date": "2024-06-01",
+    "vehicle_number": "MH-12-AB-1234",
+    "customer": {"name": "Acme Builders", "address": "Plot 7, MIDC, Nagpur", "gstin": "27AAACA1234A1Z5",
+                 "state_code": "27"},
+    "items": [{"product_name": f"Cement bag grade {i}", "quantity": 10 + i, "price_per_unit": 345.0} for i in range(8)],
+}
+
+
+def inline(template_cls):
+    class Inline(template_cls):
+        def place_static(self, layer="static"):
+            getattr(self, f"draw_{layer}")()
+    return Inline
+
+
+def render(template_cls, pages):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    for _ in range(pages):
+        template_cls(c, width, height, SETTINGS).draw_invoice(INVOICE)
+        c.showPage()
+    c.save()
+    return len(buffer.getvalue())
+
+
+def measure(template_cls, pages, runs):
+    render(template_cls, pages)
+    started = time.perf_counter()
+    for _ in range(runs):
+        size = render(template_cls, pages)
+    return (time.perf_counter() - started) / runs / pages * 1000, size
+
+
+def main():
+    print(f"{'template':<10}{'pages':>6}{'':>3}{'inline ms/pg':>14}{'form ms/pg':>12}{'inline bytes':>14}{'form bytes':>12}")
+    for name, template_cls in TEMPLATES.items():
+        for pages, runs in ((1, RUNS), (PAGES, max(1, RUNS // PAGES))):
+            inline_ms, inline_size = measure(inline(template_cls), pages, runs)
+            form_ms, form_size = measure(template_cls, pages, runs)
+            print(f"{name:<10}{pages:>6}{'':>3}{inline_ms:>14.2f}{form_ms:>12.2f}{inline_size:>14}{form_size:>12}")
+
+
+if __name__ == "__main__":
+    main()
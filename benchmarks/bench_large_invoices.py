@@ -0,0 +1,45 @@
+# benchmarks/bench_large_invoices.py
+# Renders invoices with thousands of line items and reports pages, render time,
+# peak Python memory (tracemalloc, measured in a second run because tracing
+# slows rendering down several times) and PDF size.
+#
+#   python -m benchmarks.bench_large_invoices
+import time
+import tracemalloc
+
+from src.utils.pdf_service import PdfService
+from benchmarks.bench_invoice_templates import INVOICE, SETTINGS
+
+LINES = (10, 100, 1000, 5000)
+
+
+def invoice(lines):
+    items = [{"product_name": f"Cement bag grade {i}", "quantity": 1 + i % 7, "price_per_unit": 345.0}
+             for i in range(lines)]
+    return dict(INVOICE, items=items)
+
+
+def render(service, invoice_data):
+    return bytes(service.render(invoice_data))
+
+
+def main():
+    service = PdfService(SETTINGS)
+    render(service, invoice(10))
+    print(f"{'lines':>6}{'pages':>7}{'seconds':>9}{'ms/line':>9}{'peak MB':>9}{'KB':>8}")
+    for lines in LINES:
+        invoice_data = invoice(lines)
+        started = time.perf_counter()
+        pdf = render(service, invoice_data)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        render(service, invoice_data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        pages = pdf.count(b"/Type /Page\n")
+        print(f"{lines:>6}{pages:>7}{elapsed:>9.2f}{elapsed / lines * 1000:>9.2f}{peak / 1e6:>9.1f}{len(pdf) / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_pdf_fonts.py
+# What embedding the Roboto fonts costs per invoice. Renders the same invoice
+# with built-in Helvetica (no rupee glyph, nothing embedded) and with Roboto as
+# registered by pdf_fonts, and reports render time and PDF size for
+# single-invoice documents and for one document of many invoices, where the
+# fonts are embedded once. Also reports the one-off cost of parsing and
+# registering the font files.
+#
+#   python -m benchmarks.bench_pdf_fonts
+import io
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from benchmarks.bench_invoice_templates import INVOICE, SETTINGS
+from src.utils import pdf_fonts
+from src.utils.invoice_template import TEMPLATES
+
+RUNS = 300
+PAGES = 50
+
+
+def with_fonts(template_cls, regular, bold):
+    swap = {pdf_fonts.REGULAR: regular, pdf_fonts.BOLD: bold}
+    return type(template_cls.__name__, (template_cls,), {
+        "regular_font": regular,
+        "bold_font": bold,
+        "labels": tuple((x, y, text, swap.get(font, font)) for x, y, text, font in template_cls.labels),
+    })
+
+
+def render(template_cls, pages):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    for _ in range(pages):
+        template_cls(c, width, height, SETTINGS).draw_invoice(INVOICE)
+        c.showPage()
+    c.save()
+    return len(buffer.getvalue())
+
+
+def measure(template_cls, pages, runs):
+    render(template_cls, pages)
+    started = time.perf_counter()
+    for _ in range(runs):
+        size = render(template_cls, pages)
+    return (time.perf_counter() - started) / runs / pages * 1000, size
+
+
+def main():
+    started = time.perf_counter()
+    pdf_fonts.register_fonts()
+    print(f"registering {len(pdf_fonts.FONT_FILES)} fonts (once per process): "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    variants = (
+        ("helvetica", "Helvetica", "Helvetica-Bold"),
+        ("pdf_fonts", pdf_fonts.REGULAR, pdf_fonts.BOLD),
+    )
+    print(f"{'template':<10}{'fonts':<11}{'pages':>6}{'ms/invoice':>12}{'bytes':>10}")
+    for name, template_cls in TEMPLATES.items():
+        for pages, runs in ((1, RUNS), (PAGES, max(1, RUNS // PAGES))):
+            for label, regular, bold in variants:
+                ms, size = measure(with_fonts(template_cls, regular, bold), pages, runs)
+                print(f"{name:<10}{label:<11}{pages:>6}{ms:>12.2f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
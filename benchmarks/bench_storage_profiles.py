@@ -0,0 +1,101 @@
+# benchmarks/bench_storage_profiles.py
+# Measures reader throughput and latency while a writer keeps committing,
+# comparing a bare SQLite engine with the tuned storage profiles. Readers and
+# the writer run in separate processes, like several app windows sharing one file.
+#
+#   python -m benchmarks.bench_storage_profiles
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from src.utils.database import create_db_engine
+
+DURATION = 3.0
+READERS = 3
+ROWS_PER_COMMIT = 2000
+CANDIDATES = ["bare", "desktop", "bulk-import"]
+
+
+def _make_engine(name, path):
+    if name == "bare":
+        return create_engine(f"sqlite:///{path}")
+    return create_db_engine(path, name)
+
+
+def _prepare(path):
+    setup_engine = create_engine(f"sqlite:///{path}")
+    with setup_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE invoices (id INTEGER PRIMARY KEY, customer_id INTEGER, total REAL, note TEXT)"))
+        conn.execute(text("INSERT INTO invoices (customer_id, total, note) VALUES (:c, :t, :n)"),
+                     [{"c": i % 50, "t": i * 1.5, "n": "x" * 200} for i in range(20000)])
+    setup_engine.dispose()
+
+
+def _writer(name, path, deadline, results):
+    engine = _make_engine(name, path)
+    commits = errors = 0
+    while time.time() < deadline:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO invoices (customer_id, total, note) VALUES (:c, :t, :n)"),
+                             [{"c": i % 50, "t": 1.0, "n": "y" * 200} for i in range(ROWS_PER_COMMIT)])
+            commits += 1
+        except Exception:
+            errors += 1
+    results.put(("writer", commits, errors, 0.0))
+
+
+def _reader(name, path, deadline, results):
+    engine = _make_engine(name, path)
+    reads = errors = 0
+    max_ms = 0.0
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT customer_id, SUM(total) FROM invoices WHERE id % 7 = 0 GROUP BY customer_id")).all()
+            reads += 1
+            max_ms = max(max_ms, (time.perf_counter() - started) * 1000)
+        except Exception:
+            errors += 1
+    results.put(("reader", reads, errors, max_ms))
+
+
+def run(name):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        _prepare(path)
+        # Switch the file to WAL up front for the tuned profiles so every process sees the same mode.
+        _make_engine(name, path).dispose()
+
+        results = multiprocessing.Queue()
+        deadline = time.time() + DURATION
+        procs = [multiprocessing.Process(target=_writer, args=(name, path, deadline, results))]
+        procs += [multiprocessing.Process(target=_reader, args=(name, path, deadline, results)) for _ in range(READERS)]
+        for p in procs:
+            p.start()
+        rows = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    stats = {"reads": 0, "commits": 0, "errors": 0, "max_read_ms": 0.0}
+    for kind, count, errors, max_ms in rows:
+        stats["commits" if kind == "writer" else "reads"] += count
+        stats["errors"] += errors
+        stats["max_read_ms"] = max(stats["max_read_ms"], max_ms)
+    return stats
+
+
+def main():
+    print(f"{'engine':<14}{'reads/s':>10}{'commits/s':>11}{'max read ms':>13}{'errors':>8}")
+    for name in CANDIDATES:
+        stats = run(name)
+        print(f"{name:<14}{stats['reads'] / DURATION:>10.1f}{stats['commits'] / DURATION:>11.1f}"
+              f"{stats['max_read_ms']:>13.1f}{stats['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "PyQt6>=6.6.1",
+        "SQLAlchemy>=2.0",
     ],
     python_requires=">=3.8",
     entry_points={
@@ -1,37 +1,37 @@
 # src/controllers/companies_products_controller.py
-from PyQt6.QtWidgets import QMessageBox
-from src.utils.database import SessionLocal
+from PyQt6.QtWidgets import QMessageBox, QPushButton
+from PyQt6.QtCore import Qt
+from src.utils.session_scope import read_scope, write_scope
 from src.models import CustomerCompany, Product, Inventory
+from src.models.rows import CompanyRow, company_row, product_row
 from src.utils.dialogs import CompanyDialog, ProductDialog
 from src.utils.helpers import log_action
+from src.utils.event_bus import record_change, CREATED, UPDATED, DELETED
+
+# Above this many changed companies the list is simply reloaded.
+COMPANY_CHANGE_LIMIT = 200
 
 class CompaniesProductsController:
     def __init__(self, view):
         self.view = view
-        self.db_session = SessionLocal()
-        self.selected_company = None
+        self.selected_company = None  # CompanyRow of the company whose products are shown
 
     def load_companies(self):
-        current_selection = self.view.company_list.currentItem()
-        current_id = current_selection.data(Qt.ItemDataRole.UserRole) if current_selection else None
-        self.view.company_list.clear()
-        companies = self.db_session.query(CustomerCompany).order_by(CustomerCompany.name).all()
-        for company in companies:
-            item_widget = self.view.ui_manager.create_list_item_widget(
-                company.name, company, self.show_edit_company_dialog, self.handle_delete_company
-            )
-            list_item = QListWidgetItem(self.view.company_list)
-            list_item.setSizeHint(item_widget.sizeHint())
-            list_item.setData(Qt.ItemDataRole.UserRole, company.id)
-            self.view.company_list.addItem(list_item)
-            self.view.company_list.setItemWidget(list_item, item_widget)
-            if company.id == current_id:
-                self.view.company_list.setCurrentItem(list_item)
+        with read_scope() as session:
+            companies = [CompanyRow(*row) for row in session.query(
+                CustomerCompany.id, CustomerCompany.name, CustomerCompany.gstin, CustomerCompany.state,
+                CustomerCompany.state_code, CustomerCompany.address
+            ).order_by(CustomerCompany.name)]
+        self.view.company_model.set_companies(companies)
+        if self.selected_company:
+            self.view.select_company(self.selected_company.id)
         self.view.update_delete_button_state()
 
-    def on_company_selected(self, item):
-        company_id = item.data(Qt.ItemDataRole.UserRole)
-        self.selected_company = self.db_session.query(CustomerCompany).get(company_id)
+    def on_company_selected(self, index):
+        company_id = index.data(Qt.ItemDataRole.UserRole)
+        with read_scope() as session:
+            company = session.get(CustomerCompany, company_id)
+            self.selected_company = company_row(company) if company else None
         if self.selected_company:
             self.view.company_detail_title.setText(f"Products for: {self.selected_company.name}")
             self.load_products_for_company()
@@ -43,39 +43,87 @@ class CompaniesProductsController:
         self.view.product_table.setRowCount(0)
         if not self.selected_company:
             return
-        for product in sorted(self.selected_company.products, key=lambda p: p.name):
-            row_pos = self.view.product_table.rowCount()
-            self.view.product_table.insertRow(row_pos)
-            self.view.ui_manager.create_product_table_row(
-                row_pos, product, self.show_edit_product_dialog, self.handle_delete_product
-            )
+        with read_scope() as session:
+            products = [product_row(p) for p in session.query(Product)
+                        .filter(Product.company_id == self.selected_company.id).order_by(Product.name)]
+        # Filling the rows would otherwise emit itemChanged once per check box.
+        self.view.product_table.blockSignals(True)
+        self.view.product_table.setRowCount(len(products))
+        for row_pos, product in enumerate(products):
+            self.view.ui_manager.create_product_table_row(row_pos, product)
+        self.view.product_table.blockSignals(False)
+        self.view.update_delete_button_state()
+
+    def _record_company_deleted(self, session, company_id):
+        # Its products go with it (delete-orphan cascade).
+        record_change(session, "Company", company_id, DELETED)
+        for (product_id,) in session.query(Product.id).filter(Product.company_id == company_id):
+            record_change(session, "Product", product_id, DELETED)
+
+    def apply_changes(self, batch):
+        """Applies committed company/product changes to the list and the product table."""
+        if batch.affects("Company"):
+            changed_ids = batch.ids("Company")
+            removed_ids = batch.ids("Company", kinds=(DELETED,))
+            if batch.has_unknown("Company") or len(changed_ids) > COMPANY_CHANGE_LIMIT:
+                if self.selected_company and self.selected_company.id in removed_ids:
+                    self.clear_selected_company()
+                self.load_companies()
+            else:
+                with read_scope() as session:
+                    companies = [CompanyRow(*row) for row in session.query(
+                        CustomerCompany.id, CustomerCompany.name, CustomerCompany.gstin, CustomerCompany.state,
+                        CustomerCompany.state_code, CustomerCompany.address
+                    ).filter(CustomerCompany.id.in_(changed_ids - removed_ids))]
+                self.view.company_model.apply_changes(companies, removed_ids)
+                if self.selected_company:
+                    updated = next((c for c in companies if c.id == self.selected_company.id), None)
+                    if self.selected_company.id in removed_ids:
+                        self.clear_selected_company()
+                    elif updated:
+                        self.selected_company = updated
+                        self.view.company_detail_title.setText(f"Products for: {updated.name}")
+                    if self.selected_company:
+                        self.view.select_company(self.selected_company.id)
+        if batch.affects("Product") and self.selected_company:
+            self.load_products_for_company()
         self.view.update_delete_button_state()
 
+    def clear_selected_company(self):
+        self.selected_company = None
+        self.view.product_table.setRowCount(0)
+        self.view.product_stack.setCurrentIndex(0)
+
+    def _count_products(self, session, company_ids):
+        return session.query(Product).filter(Product.company_id.in_(company_ids)).count()
+
     def show_add_company_dialog(self):
         dialog = CompanyDialog(parent=self.view)
         if dialog.exec():
             data = dialog.get_data()
             if data['name']:
-                new_company = CustomerCompany(**data)
-                self.db_session.add(new_company)
-                self.db_session.flush()
-                log_action(self.db_session, "CREATE", "Company", new_company.id, f"Company '{new_company.name}' created.")
-                self.db_session.commit()
-                self.load_companies()
+                with write_scope() as session:
+                    new_company = CustomerCompany(**data)
+                    session.add(new_company)
+                    session.flush()
+                    log_action(session, "CREATE", "Company", new_company.id, f"Company '{new_company.name}' created.")
+                    record_change(session, "Company", new_company, CREATED)
 
     def show_edit_company_dialog(self, company):
         dialog = CompanyDialog(company=company, parent=self.view)
         if dialog.exec():
             data = dialog.get_data()
             details = f"Updated company '{company.name}'."
-            for key, value in data.items():
-                setattr(company, key, value)
-            log_action(self.db_session, "UPDATE", "Company", company.id, details)
-            self.db_session.commit()
-            self.load_companies()
+            with write_scope() as session:
+                db_company = session.get(CustomerCompany, company.id)
+                for key, value in data.items():
+                    setattr(db_company, key, value)
+                log_action(session, "UPDATE", "Company", company.id, details)
+                record_change(session, "Company", company.id, UPDATED)
 
     def handle_delete_company(self, company):
-        product_count = len(company.products)
+        with read_scope() as session:
+            product_count = self._count_products(session, [company.id])
         title = "Confirm Deletion"
         text = f"Are you sure you want to delete '{company.name}'? This action cannot be undone."
         if product_count > 0:
@@ -84,17 +132,17 @@ class CompaniesProductsController:
         reply = QMessageBox.question(self.view, title, text, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel, QMessageBox.StandardButton.Cancel)
         if reply == QMessageBox.StandardButton.Yes:
             details = f"Company '{company.name}' and its {product_count} products deleted."
-            log_action(self.db_session, "DELETE", "Company", company.id, details)
-            self.db_session.delete(company)
-            self.db_session.commit()
-            self.load_companies()
-            self.view.product_stack.setCurrentIndex(0)
+            with write_scope() as session:
+                log_action(session, "DELETE", "Company", company.id, details)
+                self._record_company_deleted(session, company.id)
+                session.delete(session.get(CustomerCompany, company.id))
 
     def handle_bulk_delete_companies(self):
         company_ids_to_delete = self.view.get_checked_company_ids()
         if not company_ids_to_delete: return
 
-        product_count = sum(len(self.db_session.get(CustomerCompany, cid).products) for cid in company_ids_to_delete)
+        with read_scope() as session:
+            product_count = self._count_products(session, company_ids_to_delete)
         title = "Confirm Bulk Deletion"
         text = f"Are you sure you want to delete these {len(company_ids_to_delete)} companies?"
         if product_count > 0:
@@ -102,15 +150,13 @@ class CompaniesProductsController:
 
         reply = QMessageBox.question(self.view, title, text, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            for cid in company_ids_to_delete:
-                company = self.db_session.get(CustomerCompany, cid)
-                details = f"Company '{company.name}' and its products deleted in bulk."
-                log_action(self.db_session, "DELETE", "Company", cid, details)
-                self.db_session.delete(company)
-            self.db_session.commit()
-            self.load_companies()
-            if self.selected_company and self.selected_company.id in company_ids_to_delete:
-                self.view.product_stack.setCurrentIndex(0)
+            with write_scope() as session:
+                for cid in company_ids_to_delete:
+                    company = session.get(CustomerCompany, cid)
+                    details = f"Company '{company.name}' and its products deleted in bulk."
+                    log_action(session, "DELETE", "Company", cid, details)
+                    self._record_company_deleted(session, cid)
+                    session.delete(company)
 
     def show_add_product_dialog(self):
         if not self.selected_company: return
@@ -118,41 +164,42 @@ class CompaniesProductsController:
         if dialog.exec():
             data = dialog.get_data()
             if data['name']:
-                new_product = Product(name=data['name'], price=data['price'], company_id=self.selected_company.id)
-                new_inventory = Inventory(stock_quantity=0, product=new_product)
-                self.db_session.add(new_product)
-                self.db_session.add(new_inventory)
-                self.db_session.flush()
-                log_action(self.db_session, "CREATE", "Product", new_product.id, f"Product '{new_product.name}' created for company '{self.selected_company.name}'.")
-                self.db_session.commit()
-                self.load_products_for_company()
+                with write_scope() as session:
+                    new_product = Product(name=data['name'], price=data['price'], company_id=self.selected_company.id)
+                    new_inventory = Inventory(stock_quantity=0, product=new_product)
+                    session.add(new_product)
+                    session.add(new_inventory)
+                    session.flush()
+                    log_action(session, "CREATE", "Product", new_product.id, f"Product '{new_product.name}' created for company '{self.selected_company.name}'.")
+                    record_change(session, "Product", new_product, CREATED)
 
     def show_edit_product_dialog(self, product):
         dialog = ProductDialog(product=product, parent=self.view)
         if dialog.exec():
             data = dialog.get_data()
-            product.name = data['name']
-            product.price = data['price']
-            log_action(self.db_session, "UPDATE", "Product", product.id, f"Product '{product.name}' updated.")
-            self.db_session.commit()
-            self.load_products_for_company()
+            with write_scope() as session:
+                db_product = session.get(Product, product.id)
+                db_product.name = data['name']
+                db_product.price = data['price']
+                log_action(session, "UPDATE", "Product", product.id, f"Product '{data['name']}' updated.")
+                record_change(session, "Product", product.id, UPDATED)
 
     def handle_delete_product(self, product):
         reply = QMessageBox.question(self.view, "Confirm Deletion", f"Are you sure you want to delete '{product.name}'?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            log_action(self.db_session, "DELETE", "Product", product.id, f"Product '{product.name}' deleted.")
-            self.db_session.delete(product)
-            self.db_session.commit()
-            self.load_products_for_company()
+            with write_scope() as session:
+                log_action(session, "DELETE", "Product", product.id, f"Product '{product.name}' deleted.")
+                record_change(session, "Product", product.id, DELETED)
+                session.delete(session.get(Product, product.id))
 
     def handle_bulk_delete_products(self):
         product_ids_to_delete = self.view.get_checked_product_ids()
         if not product_ids_to_delete: return
         reply = QMessageBox.question(self.view, "Confirm Deletion", f"Are you sure you want to delete these {len(product_ids_to_delete)} products?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            for pid in product_ids_to_delete:
-                product = self.db_session.get(Product, pid)
-                log_action(self.db_session, "DELETE", "Product", pid, f"Product '{product.name}' deleted in bulk.")
-                self.db_session.delete(product)
-            self.db_session.commit()
-            self.load_products_for_company()
+            with write_scope() as session:
+                for pid in product_ids_to_delete:
+                    product = session.get(Product, pid)
+                    log_action(session, "DELETE", "Product", pid, f"Product '{product.name}' deleted in bulk.")
+                    record_change(session, "Product", pid, DELETED)
+                    session.delete(product)
@@ -1,16 +1,14 @@
 # src/controllers/main_controller.py
-from PyQt6.QtWidgets import QFileDialog, QMessageBox
+import time
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
 from src.utils.csv_manager import CsvManager
+from src.utils.workers import JobTask
 
 class MainController:
     def __init__(self, main_view):
         self.main_view = main_view
-        self.csv_manager = CsvManager(
-            self.main_view.companies_tab_instance,
-            self.main_view.inventory_tab_instance,
-            self.main_view.audit_log_tab_instance,
-            self.main_view.invoice_history_tab_instance
-        )
+        self.csv_manager = CsvManager()
 
     def switch_page(self, name, button):
         if self.main_view.active_nav_button:
@@ -18,7 +16,7 @@ class MainController:
         button.setChecked(True)
         self.main_view.active_nav_button = button
 
-        self.main_view.stacked_widget.setCurrentWidget(self.main_view.tabs_map[name])
+        self.main_view.stacked_widget.setCurrentWidget(self.main_view.get_tab(name))
         self.main_view.header_title.setText(name)
         self.main_view.header_subtitle.setText(f"Manage your {name.lower()}")
 
@@ -37,12 +35,45 @@ class MainController:
                 QMessageBox.critical(self.main_view, "Import Error", "Could not determine import type from file name.")
                 return
 
-            success, message = self.csv_manager.handle_import_csv(file_name, import_type)
+            self.run_import(file_name, import_type)
+
+    def run_import(self, file_name, import_type):
+        """Imports on a pool thread, with a progress dialog that can cancel between chunks."""
+        task = JobTask(lambda progress, cancelled: self.csv_manager.handle_import_csv(
+            file_name, import_type, progress, cancelled))
+        progress_dialog = QProgressDialog("Importing…", "Cancel", 0, 0, self.main_view)
+        progress_dialog.setWindowTitle("Import CSV")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.canceled.connect(task.cancel)
+        started = {}
+
+        def show_progress(done, total):
+            # The first report is where a resumed import starts from.
+            first_done, first_time = started.setdefault("at", (done, time.monotonic()))
+            elapsed = time.monotonic() - first_time
+            rate = (done - first_done) / elapsed if elapsed > 0 else 0
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(f"Importing… row {done:,} of {total:,} ({rate:,.0f} rows/s)")
+
+        def finished(result):
+            progress_dialog.reset()
+            success, message = result
             if success:
                 QMessageBox.information(self.main_view, "Success", message)
             else:
                 QMessageBox.critical(self.main_view, "Import Error", message)
 
+        def failed(error):
+            progress_dialog.reset()
+            QMessageBox.critical(self.main_view, "Import Error", error)
+
+        task.signals.progress.connect(show_progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        QThreadPool.globalInstance().start(task)
+
     def handle_export_csv(self):
         dialog = QFileDialog(self.main_view)
         dialog.setFileMode(QFileDialog.FileMode.AnyFile)
@@ -1,16 +1,25 @@
+import time
+_IMPORT_START = time.perf_counter()
 import sys
 import os
+import logging
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtCore import QTimer
 
-from src.utils.database import Base, engine, SessionLocal
+from src.utils.database import engine, SessionLocal
+from src.utils.migrations import run_migrations
 from src.main_window import SaaSBillingApp
 from src.models import UserSettings # We only need one for the default check
+from src.utils.startup_profile import startup_profile
+from src.utils.lazy_imports import warm_up
+
+startup_profile.record("imports", time.perf_counter() - _IMPORT_START)
 
 def initialize_database():
-    """Creates the database and all tables."""
-    # The 'Base' object now knows about all models thanks to the imports in src/models/__init__.py
-    Base.metadata.create_all(bind=engine)
+    """Creates the database and brings its schema up to date."""
+    # Creates missing tables and applies pending migrations; a no-op when the schema is current.
+    run_migrations(engine)
     
     db = SessionLocal()
     if db.query(UserSettings).count() == 0:
@@ -20,15 +29,26 @@ def initialize_database():
     db.close()
 
 def main():
-    initialize_database()
-    app = QApplication(sys.argv)
-    
-    resource_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resources')
-    QFontDatabase.addApplicationFont(os.path.join(resource_path, "Roboto-Regular.ttf"))
-    QFontDatabase.addApplicationFont(os.path.join(resource_path, "Roboto-Medium.ttf"))
-    
-    window = SaaSBillingApp()
-    window.show()
+    if os.environ.get("BILLING_DEBUG"):
+        # Logs per-action session scopes, including identity-map sizes.
+        logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(name)s: %(message)s")
+    with startup_profile.measure("database init"):
+        initialize_database()
+    with startup_profile.measure("application + fonts"):
+        app = QApplication(sys.argv)
+
+        resource_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resources')
+        QFontDatabase.addApplicationFont(os.path.join(resource_path, "Roboto-Regular.ttf"))
+        QFontDatabase.addApplicationFont(os.path.join(resource_path, "Roboto-Medium.ttf"))
+
+    # Includes building the first visible tab; the others are built on first navigation.
+    with startup_profile.measure("main window"):
+        window = SaaSBillingApp()
+        window.show()
+    # Load reportlab in the background while the user looks at the window.
+    warm_up()
+    # Reported once the event loop is running, i.e. after the first paint has been queued.
+    QTimer.singleShot(0, startup_profile.report)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
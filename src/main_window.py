@@ -1,17 +1,24 @@
 import os
+import importlib
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QStackedWidget, QFileDialog, QMessageBox)
 from PyQt6.QtGui import QIcon
 
 from src.utils.theme import DARK_THEME
 from src.controllers.main_controller import MainController
-from src.tabs.dashboard_tab import DashboardTab
-from src.tabs.companies_products_tab import CompaniesProductsTab
-from src.tabs.create_invoice_tab import CreateInvoiceTab
-from src.tabs.invoice_history_tab import InvoiceHistoryTab
-from src.tabs.inventory_tab import InventoryTab
-from src.tabs.settings_tab import SettingsTab
-from src.tabs.audit_log_tab import AuditLogTab
+from src.utils.startup_profile import startup_profile
+
+# Tabs are imported and built the first time they are shown, so startup only
+# pays for the page that is actually on screen.
+TAB_CLASSES = {
+    "Dashboard": "src.tabs.dashboard_tab.DashboardTab",
+    "Companies & Products": "src.tabs.companies_products_tab.CompaniesProductsTab",
+    "Create Invoice": "src.tabs.create_invoice_tab.CreateInvoiceTab",
+    "Past Invoices": "src.tabs.invoice_history_tab.InvoiceHistoryTab",
+    "Inventory": "src.tabs.inventory_tab.InventoryTab",
+    "Audit Log": "src.tabs.audit_log_tab.AuditLogTab",
+    "Settings": "src.tabs.settings_tab.SettingsTab",
+}
 
 class SaaSBillingApp(QMainWindow):
     def __init__(self):
@@ -20,9 +27,10 @@ class SaaSBillingApp(QMainWindow):
         self.setGeometry(100, 100, 1440, 900)
         self.active_nav_button = None
         self.resource_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'resources')
+        self.tabs_map = {}  # name -> tab, only for tabs that have been built
 
-        self.init_ui()
         self.controller = MainController(self)
+        self.init_ui()
         self.apply_styles()
 
     def init_ui(self):
@@ -46,26 +54,21 @@ class SaaSBillingApp(QMainWindow):
 
         self.stacked_widget = QStackedWidget()
         right_area_layout.addWidget(self.stacked_widget)
-        
-        self.companies_tab_instance = CompaniesProductsTab()
-        self.inventory_tab_instance = InventoryTab()
-        self.audit_log_tab_instance = AuditLogTab()
-        self.invoice_history_tab_instance = InvoiceHistoryTab()
-
-        self.tabs_map = {
-            "Dashboard": DashboardTab(),
-            "Companies & Products": self.companies_tab_instance,
-            "Create Invoice": CreateInvoiceTab(),
-            "Past Invoices": InvoiceHistoryTab(),
-            "Inventory": self.inventory_tab_instance,
-            "Audit Log": self.audit_log_tab_instance,
-            "Settings": SettingsTab()
-        }
-        for widget in self.tabs_map.values():
-            self.stacked_widget.addWidget(widget)
 
         self.switch_page("Dashboard", self.dashboard_btn)
 
+    def get_tab(self, name):
+        """Returns the shared instance of a tab, building it on first use."""
+        tab = self.tabs_map.get(name)
+        if tab is None:
+            module_name, class_name = TAB_CLASSES[name].rsplit(".", 1)
+            with startup_profile.measure(f"tab: {name}"):
+                tab_class = getattr(importlib.import_module(module_name), class_name)
+                tab = tab_class()
+            self.tabs_map[name] = tab
+            self.stacked_widget.addWidget(tab)
+        return tab
+
     def create_top_header(self):
         header_widget = QWidget()
         header_widget.setObjectName("top-header")
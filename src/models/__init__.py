@@ -3,6 +3,8 @@
 from .user import UserSettings
 from .company import CustomerCompany
 from .product import Product
-from .invoice import Invoice, InvoiceItem, Payment
+from .invoice import Invoice, InvoiceItem, Payment, InvoiceSequence
 from .inventory import Inventory, InventoryHistory
-from .audit_log import AuditLog
\ No newline at end of file
+from .audit_log import AuditLog
+from .sales_summary import DailyCustomerSales, DailyProductSales, InvoiceStatusSummary
+from .import_checkpoint import ImportCheckpoint
\ No newline at end of file
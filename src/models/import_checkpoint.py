@@ -0,0 +1,15 @@
+# src/models/import_checkpoint.py
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from src.utils.database import Base
+
+class ImportCheckpoint(Base):
+    __tablename__ = 'import_checkpoints'
+    # How far an interrupted CSV import got; deleted once the import finishes.
+    kind = Column(String, primary_key=True)    # e.g. 'catalogue'
+    source = Column(String, primary_key=True)  # absolute path of the CSV file
+    # The file as it was when the import started; a changed file starts over.
+    file_size = Column(Integer, nullable=False)
+    file_mtime_ns = Column(Integer, nullable=False)
+    rows_done = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
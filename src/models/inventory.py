@@ -19,7 +19,8 @@ class InventoryHistory(Base):
     __tablename__ = 'inventory_history'
     id = Column(Integer, primary_key=True, index=True)
     # --- DEFINITIVE FIX: Also uses product_id for consistency ---
-    product_id = Column(Integer, ForeignKey('products.id'))
+    product_id = Column(Integer, ForeignKey('products.id'), index=True)
     change_quantity = Column(Integer)
+    new_quantity = Column(Integer)
     reason = Column(String)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
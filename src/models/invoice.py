@@ -6,10 +6,11 @@ class Invoice(Base):
     __tablename__ = 'invoices'
     id = Column(Integer, primary_key=True, index=True)
     invoice_number = Column(String, unique=True, nullable=False)
-    customer_id = Column(Integer, ForeignKey('customer_companies.id'))
+    customer_id = Column(Integer, ForeignKey('customer_companies.id'), index=True)
     vehicle_number = Column(String)
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     total_amount = Column(Float)
+    payment_status = Column(String, default='Pending', nullable=False, server_default='Pending')
     
     # SQLAlchemy can now find 'CustomerCompany' correctly
     customer = relationship("CustomerCompany", back_populates="invoices")
@@ -19,11 +20,14 @@ class Invoice(Base):
 class InvoiceItem(Base):
     __tablename__ = 'invoice_items'
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey('invoices.id'))
-    product_name = Column(String)
+    invoice_id = Column(Integer, ForeignKey('invoices.id'), index=True)
+    product_id = Column(Integer, ForeignKey('products.id', ondelete='SET NULL'), index=True)
+    # Snapshot of the product name at billing time; printed on the invoice even if the product is renamed or deleted.
+    product_name = Column(String, index=True)
     quantity = Column(Integer)
     price_per_unit = Column(Float)
     invoice = relationship("Invoice", back_populates="items")
+    product = relationship("Product", back_populates="invoice_items")
 
 class Payment(Base):
     __tablename__ = 'payments'
@@ -32,4 +36,10 @@ class Payment(Base):
     payment_date = Column(Date)
     amount_paid = Column(Float)
     payment_method = Column(String)
-    invoice = relationship("Invoice", back_populates="payments")
\ No newline at end of file
+    invoice = relationship("Invoice", back_populates="payments")
+
+class InvoiceSequence(Base):
+    __tablename__ = 'invoice_sequences'
+    # One counter per numbering series, e.g. 'INV' or 'INV-2425' for FY 2024-25.
+    series = Column(String, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
\ No newline at end of file
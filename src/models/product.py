@@ -8,8 +8,10 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     price = Column(Float, nullable=False)
-    company_id = Column(Integer, ForeignKey('customer_companies.id'))
+    company_id = Column(Integer, ForeignKey('customer_companies.id'), index=True)
     
     company = relationship("CustomerCompany", back_populates="products")
     # --- DEFINITIVE FIX: Establishes the one-to-one link to its inventory record ---
-    inventory = relationship("Inventory", back_populates="product", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    inventory = relationship("Inventory", back_populates="product", uselist=False, cascade="all, delete-orphan")
+    # No cascade: deleting a product only clears product_id on past invoice lines.
+    invoice_items = relationship("InvoiceItem", back_populates="product")
\ No newline at end of file
@@ -0,0 +1,20 @@
+# src/models/rows.py
+# Detached, read-only row tuples handed to the views. They hold plain values
+# only, so they never lazy-load and never pin a session or its identity map.
+from collections import namedtuple
+
+CompanyRow = namedtuple("CompanyRow", ["id", "name", "gstin", "state", "state_code", "address"])
+ProductRow = namedtuple("ProductRow", ["id", "name", "price", "company_id"])
+InventoryRow = namedtuple("InventoryRow", ["product_id", "product_name", "company_name", "stock_quantity",
+                                           "low_stock_threshold", "price"])
+InvoiceRow = namedtuple("InvoiceRow", ["id", "invoice_number", "customer_name", "date", "total_amount",
+                                       "payment_status"])
+AuditLogRow = namedtuple("AuditLogRow", ["id", "timestamp", "action", "entity_type", "entity_id", "details"])
+
+
+def company_row(company):
+    return CompanyRow(company.id, company.name, company.gstin, company.state, company.state_code, company.address)
+
+
+def product_row(product):
+    return ProductRow(product.id, product.name, product.price, product.company_id)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, Date
+from src.utils.database import Base
+
+# Pre-aggregated sales figures for the dashboard. They are kept up to date in the
+# same transaction that writes an invoice or changes its status (see
+# src/utils/sales_summary.py) and can be rebuilt from the invoices at any time.
+
+class DailyCustomerSales(Base):
+    __tablename__ = 'daily_customer_sales'
+    day = Column(Date, primary_key=True)
+    # 0 for invoices without a customer.
+    customer_id = Column(Integer, primary_key=True, autoincrement=False)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class DailyProductSales(Base):
+    __tablename__ = 'daily_product_sales'
+    day = Column(Date, primary_key=True)
+    # Keyed by the invoiced name, like the invoice lines themselves.
+    product_name = Column(String, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class InvoiceStatusSummary(Base):
+    __tablename__ = 'invoice_status_summary'
+    status = Column(String, primary_key=True)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
@@ -6,6 +6,8 @@ class UserSettings(Base):
     __tablename__ = 'user_settings'
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String)
+    address = Column(String)
+    state_code = Column(String)
     gstin = Column(String)
     pan_number = Column(String)
     mobile_number = Column(String)
@@ -1,8 +1,11 @@
 # src/tabs/audit_log_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableView,
                              QHeaderView, QHBoxLayout, QLabel, QAbstractItemView, QPushButton)
-from src.utils.database import SessionLocal
+from PyQt6.QtCore import Qt
+from sqlalchemy import func
 from src.models import AuditLog
+from src.models.rows import AuditLogRow
+from src.utils.sql_table_model import SqlTableModel, SqlColumn
 from src.utils.theme import DARK_THEME
 
 from src.tabs.base_tab import BaseTab
@@ -10,7 +13,6 @@ from src.tabs.base_tab import BaseTab
 class AuditLogTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
         self.init_ui()
         self.load_logs()
         self.apply_styles()
@@ -28,9 +30,23 @@ class AuditLogTab(BaseTab):
         refresh_btn.clicked.connect(self.load_logs)
         header_layout.addWidget(refresh_btn)
 
-        self.log_table = QTableWidget()
-        self.log_table.setColumnCount(4)
-        self.log_table.setHorizontalHeaderLabels(["Timestamp", "Action", "Entity", "Details"])
+        self.log_model = SqlTableModel(
+            [
+                SqlColumn("Timestamp", "timestamp", AuditLog.timestamp,
+                          lambda ts: ts.strftime("%Y-%m-%d %H:%M:%S") if ts else ""),
+                SqlColumn("Action", "action", func.coalesce(AuditLog.action, "")),
+                SqlColumn("Entity", lambda log: f"{log.entity_type} (ID: {log.entity_id})" if log.entity_id else log.entity_type,
+                          func.coalesce(AuditLog.entity_type, "")),
+                SqlColumn("Details", "details", func.coalesce(AuditLog.details, "")),
+            ],
+            self.logs_query, key_column=AuditLog.id, row_type=AuditLogRow,
+            sort_column=0, sort_order=Qt.SortOrder.DescendingOrder, loader=self.loader, parent=self
+        )
+        self.log_table = QTableView()
+        self.log_table.setModel(self.log_model)
+        self.log_table.verticalHeader().setVisible(False)
+        self.log_table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.DescendingOrder)
+        self.log_table.setSortingEnabled(True)
         self.log_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.log_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.log_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -40,21 +56,23 @@ class AuditLogTab(BaseTab):
         main_layout.addLayout(header_layout)
         main_layout.addWidget(self.log_table, 1)
 
+    def logs_query(self, session):
+        return session.query(
+            AuditLog.id, AuditLog.timestamp, AuditLog.action, AuditLog.entity_type, AuditLog.entity_id, AuditLog.details
+        )
+
     def load_logs(self):
-        self.log_table.setRowCount(0)
-        logs = self.db_session.query(AuditLog).order_by(AuditLog.timestamp.desc()).all()
-        for log in logs:
-            row = self.log_table.rowCount()
-            self.log_table.insertRow(row)
-            self.log_table.setItem(row, 0, QTableWidgetItem(log.timestamp.strftime("%Y-%m-%d %H:%M:%S")))
-            self.log_table.setItem(row, 1, QTableWidgetItem(log.action))
-            entity_str = f"{log.entity_type} (ID: {log.entity_id})" if log.entity_id else log.entity_type
-            self.log_table.setItem(row, 2, QTableWidgetItem(entity_str))
-            self.log_table.setItem(row, 3, QTableWidgetItem(log.details))
+        self.log_model.refresh()
+
+    def on_changes(self, batch):
+        if batch.has_unknown("AuditLog"):
+            self.load_logs()
+        elif batch.affects("AuditLog"):
+            self.log_model.refresh_rows(batch.ids("AuditLog"))
 
     def apply_styles(self):
         self.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {DARK_THEME['bg_surface']};
                 gridline-color: {DARK_THEME['border_main']};
                 border: 1px solid {DARK_THEME['border_main']};
@@ -68,7 +86,7 @@ class AuditLogTab(BaseTab):
                 border-bottom: 1px solid {DARK_THEME['border_main']};
                 font-weight: 600;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 10px;
                 border-bottom: 1px solid {DARK_THEME['border_main']};
                 color: {DARK_THEME['text_primary']};
@@ -1,12 +1,37 @@
 # src/tabs/base_tab.py
-from PyQt6.QtWidgets import QWidget
+from PyQt6.QtWidgets import QWidget, QMessageBox
+from PyQt6.QtCore import Qt, QTimer
+from src.utils.workers import DataLoader
+from src.utils.event_bus import event_bus
 
 class BaseTab(QWidget):
+    # Tabs do not keep a database session of their own. Each user action opens a
+    # short-lived scope from src.utils.session_scope and works on detached rows.
+    # Loading data for display goes through self.loader, which runs the queries
+    # on worker threads, and committed changes arrive in on_changes.
+    LOADING_INDICATOR_DELAY_MS = 150
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.loader = DataLoader(self)
+        self.loader.loadingChanged.connect(self.set_loading)
+        self.loader.failed.connect(self.on_load_failed)
+        # Only show the busy state for loads that are slow enough to notice.
+        self.loading_timer = QTimer(self)
+        self.loading_timer.setSingleShot(True)
+        self.loading_timer.setInterval(self.LOADING_INDICATOR_DELAY_MS)
+        self.loading_timer.timeout.connect(lambda: self.setCursor(Qt.CursorShape.BusyCursor))
+        event_bus.changed.connect(self.on_changes)
+
+    def set_loading(self, loading):
+        if loading:
+            self.loading_timer.start()
+        else:
+            self.loading_timer.stop()
+            self.unsetCursor()
+
+    def on_changes(self, batch):
+        """Called with a ChangeBatch (src/utils/event_bus.py) after other code commits changes."""
 
-    def get_db_session(self):
-        # This is a placeholder. In a real application, you would
-        # get the database session from a central location.
-        from src.utils.database import SessionLocal
-        return SessionLocal()
+    def on_load_failed(self, key, message):
+        QMessageBox.warning(self, "Loading Error", f"Could not load data:\n{message}")
@@ -1,17 +1,18 @@
-from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, QListWidget,
+from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, QListView,
                              QPushButton, QFrame, QStackedWidget, QTableWidget, QHeaderView,
                              QCheckBox, QLineEdit, QAbstractItemView)
 from PyQt6.QtCore import Qt
 from src.utils.theme import DARK_THEME
 from src.controllers.companies_products_controller import CompaniesProductsController
 from src.utils.ui_manager import UIManager
+from src.utils.company_list_model import CompanyListModel, CompanyFilterModel
 
 from src.tabs.base_tab import BaseTab
 
 class CompaniesProductsTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.ui_manager = UIManager(None, self)
+        self.ui_manager = UIManager(self)
         self.controller = CompaniesProductsController(self)
         self.init_ui()
         self.controller.load_companies()
@@ -38,12 +39,25 @@ class CompaniesProductsTab(BaseTab):
         self.company_search_input = QLineEdit()
         self.company_search_input.setPlaceholderText("Search companies...")
         self.company_search_input.textChanged.connect(self.filter_companies)
+        self.select_all_companies = QCheckBox("All")
+        self.select_all_companies.setToolTip("Select all companies shown")
+        self.select_all_companies.toggled.connect(self.on_select_all_companies)
+        search_layout.addWidget(self.select_all_companies)
         search_layout.addWidget(self.company_search_input)
         left_layout.addWidget(search_frame)
 
-        self.company_list = QListWidget()
-        self.company_list.itemSelectionChanged.connect(self.on_company_selection_changed)
-        self.company_list.itemClicked.connect(self.controller.on_company_selected)
+        self.company_model = CompanyListModel(self)
+        self.company_model.checkedCountChanged.connect(self.update_company_delete_button_state)
+        self.company_proxy = CompanyFilterModel(self.company_model, self)
+        self.company_list = QListView()
+        self.company_list.setModel(self.company_proxy)
+        self.company_list.setUniformItemSizes(True)
+        self.company_menu_delegate = self.ui_manager.create_row_menu_delegate(
+            self.company_list, lambda index: index.data(CompanyListModel.RowRole),
+            self.controller.show_edit_company_dialog, self.controller.handle_delete_company, align_right=True
+        )
+        self.company_list.setItemDelegate(self.company_menu_delegate)
+        self.company_list.clicked.connect(self.controller.on_company_selected)
         left_layout.addWidget(self.company_list)
 
         # Right Panel for Products
@@ -71,6 +85,14 @@ class CompaniesProductsTab(BaseTab):
         self.product_table.setHorizontalHeaderLabels(["", "Product Name", "Price", ""])
         self.product_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.product_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.product_menu_delegate = self.ui_manager.create_row_menu_delegate(
+            self.product_table, lambda index: self.product_table.item(index.row(), 0).data(Qt.ItemDataRole.UserRole),
+            self.controller.show_edit_product_dialog, self.controller.handle_delete_product
+        )
+        self.product_table.setItemDelegateForColumn(3, self.product_menu_delegate)
+        self.product_table.setColumnWidth(0, 40)
+        self.product_table.setColumnWidth(3, 50)
+        self.product_table.itemChanged.connect(self.on_product_item_changed)
         product_view_layout.addWidget(self.product_header)
         product_view_layout.addWidget(self.product_table, 1)
 
@@ -103,43 +125,44 @@ class CompaniesProductsTab(BaseTab):
         header.setProperty("delete_button", delete_btn)
         return header
 
+    def on_changes(self, batch):
+        self.controller.apply_changes(batch)
+
     def filter_companies(self):
-        search_text = self.company_search_input.text().lower()
-        for i in range(self.company_list.count()):
-            item = self.company_list.item(i)
-            widget = self.company_list.itemWidget(item)
-            item.setHidden(search_text not in widget.label.text().lower())
-
-    def on_company_selection_changed(self):
-        for i in range(self.company_list.count()):
-            item = self.company_list.item(i)
-            widget = self.company_list.itemWidget(item)
-            widget.setProperty("selected", item.isSelected())
-            widget.style().polish(widget)
+        self.company_proxy.setFilterFixedString(self.company_search_input.text())
+
+    def select_company(self, company_id):
+        index = self.company_proxy.mapFromSource(self.company_model.index_of(company_id))
+        if index.isValid():
+            self.company_list.setCurrentIndex(index)
+
+    def on_select_all_companies(self, checked):
+        self.company_model.set_checked(self.company_proxy.visible_ids(), checked)
 
     def get_checked_company_ids(self):
-        checked_ids = []
-        for i in range(self.company_list.count()):
-            item = self.company_list.item(i)
-            widget = self.company_list.itemWidget(item)
-            checkbox = widget.property("checkbox")
-            if checkbox and checkbox.isChecked():
-                checked_ids.append(item.data(Qt.ItemDataRole.UserRole))
-        return checked_ids
+        return self.company_model.checked_ids()
 
     def get_checked_product_ids(self):
         checked_ids = []
         for i in range(self.product_table.rowCount()):
-            widget = self.product_table.cellWidget(i, 0)
-            checkbox = widget.property("checkbox")
-            if checkbox and checkbox.isChecked():
-                checked_ids.append(widget.property("product_id"))
+            item = self.product_table.item(i, 0)
+            if item and item.checkState() == Qt.CheckState.Checked:
+                checked_ids.append(item.data(Qt.ItemDataRole.UserRole).id)
         return checked_ids
 
+    def on_product_item_changed(self, item):
+        if item.column() == 0:
+            self.update_delete_button_state()
+
+    def update_company_delete_button_state(self, checked_count):
+        self.company_header.property("delete_button").setEnabled(checked_count > 0)
+        if checked_count == 0 and self.select_all_companies.isChecked():
+            self.select_all_companies.blockSignals(True)
+            self.select_all_companies.setChecked(False)
+            self.select_all_companies.blockSignals(False)
+
     def update_delete_button_state(self):
-        # Company delete button
-        company_delete_btn = self.company_header.property("delete_button")
-        company_delete_btn.setEnabled(len(self.get_checked_company_ids()) > 0)
+        self.update_company_delete_button_state(self.company_model.checked_count())
 
         # Product delete button
         product_delete_btn = self.product_header.property("delete_button")
@@ -166,9 +189,9 @@ class CompaniesProductsTab(BaseTab):
                 border-radius: 6px;
                 padding: 8px;
             }}
-            QListWidget {{ border: none; }}
-            QListWidget::item {{ border-bottom: 1px solid {DARK_THEME['border_main']}; }}
-            QWidget[selected=true] {{ background-color: {DARK_THEME['bg_hover']}; }}
+            QListView {{ border: none; }}
+            QListView::item {{ padding: 10px 15px; border-bottom: 1px solid {DARK_THEME['border_main']}; color: {DARK_THEME['text_primary']}; }}
+            QListView::item:selected {{ background-color: {DARK_THEME['bg_hover']}; }}
 
             #placeholder-label {{
                 color: {DARK_THEME['text_secondary']};
@@ -222,14 +245,14 @@ class CompaniesProductsTab(BaseTab):
                 border-bottom: 1px solid {DARK_THEME['border_main']};
                 color: {DARK_THEME['text_primary']};
             }}
-            QCheckBox::indicator {{
+            QCheckBox::indicator, QTableWidget::indicator, QListView::indicator {{
                 width: 18px;
                 height: 18px;
                 border-radius: 4px;
                 border: 1px solid {DARK_THEME['border_main']};
             }}
-            QCheckBox::indicator:hover {{ border-color: {DARK_THEME['accent_primary']}; }}
-            QCheckBox::indicator:checked {{
+            QCheckBox::indicator:hover, QTableWidget::indicator:hover, QListView::indicator:hover {{ border-color: {DARK_THEME['accent_primary']}; }}
+            QCheckBox::indicator:checked, QTableWidget::indicator:checked, QListView::indicator:checked {{
                 background-color: {DARK_THEME['accent_primary']};
                 border-color: {DARK_THEME['accent_primary']};
             }}
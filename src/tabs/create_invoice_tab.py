@@ -1,21 +1,25 @@
 # src/tabs/create_invoice_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QPushButton, QComboBox,
                              QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QMessageBox, QDateEdit)
-from PyQt6.QtCore import QDate
+from PyQt6.QtCore import QDate, Qt
 
-from src.utils.database import SessionLocal
-from src.models import CustomerCompany, Product, Invoice, InvoiceItem, UserSettings, InventoryHistory
+from src.utils.session_scope import read_scope, write_scope
+from src.models import CustomerCompany, Product, UserSettings
 from src.utils.theme import DARK_THEME
-from src.utils.pdf_service import PdfService
+from src.utils.lazy_imports import lazy_import
 from src.utils.invoice_number_service import InvoiceNumberService
+from src.utils.invoice_service import InvoiceService, InsufficientStockError
+from src.utils import pdf_archive
 
 from src.tabs.base_tab import BaseTab
 
+# reportlab is only loaded when the first PDF is generated.
+pdf = lazy_import("src.utils.pdf_service")
+
 class CreateInvoiceTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
-        self.invoice_number_service = InvoiceNumberService()
+        self.invoice_service = InvoiceService(InvoiceNumberService())
         self.init_ui()
         self.apply_styles()
         self.load_initial_data()
@@ -88,36 +92,57 @@ class CreateInvoiceTab(BaseTab):
         main_layout.addLayout(bottom_layout)
 
     def load_initial_data(self):
-        # Load companies
-        companies = self.db_session.query(CustomerCompany).all()
-        for company in companies:
-            self.company_combo.addItem(company.name, company.id)
+        self.load_companies()
 
         # Load states for GST
         from src.utils.constants import INDIAN_STATES
         for state in INDIAN_STATES:
             self.state_combo.addItem(state['name'], state['code'])
 
+    def load_companies(self):
+        current_id = self.company_combo.currentData()
+        with read_scope() as session:
+            companies = session.query(CustomerCompany.id, CustomerCompany.name).order_by(CustomerCompany.name).all()
+        self.company_combo.blockSignals(True)
+        self.company_combo.clear()
+        for company_id, company_name in companies:
+            self.company_combo.addItem(company_name, company_id)
+        if current_id is not None and self.company_combo.findData(current_id) >= 0:
+            self.company_combo.setCurrentIndex(self.company_combo.findData(current_id))
+        self.company_combo.blockSignals(False)
+        if self.company_combo.currentData() != current_id:
+            self.on_company_selected(self.company_combo.currentIndex())
+
+    def on_changes(self, batch):
+        if batch.affects("Company"):
+            self.load_companies()
+        if batch.affects("Product"):
+            self.on_company_selected(self.company_combo.currentIndex())
+
     def on_company_selected(self, index):
         company_id = self.company_combo.itemData(index)
         if company_id:
-            company = self.db_session.query(CustomerCompany).get(company_id)
+            with read_scope() as session:
+                products = session.query(Product.id, Product.name).filter(Product.company_id == company_id).all()
             self.product_combo.clear()
-            for product in company.products:
-                self.product_combo.addItem(product.name, product.id)
+            for product_id, product_name in products:
+                self.product_combo.addItem(product_name, product_id)
 
     def add_product_to_table(self):
         product_id = self.product_combo.itemData(self.product_combo.currentIndex())
         if not product_id: return
 
-        product = self.db_session.query(Product).get(product_id)
+        with read_scope() as session:
+            product = session.get(Product, product_id)
         quantity = int(self.quantity_input.text())
         total_price = product.price * quantity
 
         row_position = self.items_table.rowCount()
         self.items_table.insertRow(row_position)
 
-        self.items_table.setItem(row_position, 0, QTableWidgetItem(product.name))
+        name_item = QTableWidgetItem(product.name)
+        name_item.setData(Qt.ItemDataRole.UserRole, product.id)
+        self.items_table.setItem(row_position, 0, name_item)
         self.items_table.setItem(row_position, 1, QTableWidgetItem(f"₹{product.price:,.2f}"))
         self.items_table.setItem(row_position, 2, QTableWidgetItem(str(quantity)))
         self.items_table.setItem(row_position, 3, QTableWidgetItem(f"₹{total_price:,.2f}"))
@@ -135,7 +160,8 @@ class CreateInvoiceTab(BaseTab):
         self.total_label.setText(f"Total Amount: ₹{total:,.2f}")
 
     def generate_invoice_pdf(self):
-        settings = self.db_session.query(UserSettings).first()
+        with read_scope() as session:
+            settings = session.query(UserSettings).first()
         if not settings:
             QMessageBox.critical(self, "Error", "Please configure your company settings first.")
             return
@@ -145,11 +171,13 @@ class CreateInvoiceTab(BaseTab):
             QMessageBox.critical(self, "Error", "Please select a customer.")
             return
 
-        customer = self.db_session.query(CustomerCompany).get(customer_id)
+        with read_scope() as session:
+            customer = session.get(CustomerCompany, customer_id)
 
         items = []
         for row in range(self.items_table.rowCount()):
             items.append({
+                "product_id": self.items_table.item(row, 0).data(Qt.ItemDataRole.UserRole),
                 "product_name": self.items_table.item(row, 0).text(),
                 "quantity": int(self.items_table.item(row, 2).text()),
                 "price_per_unit": float(self.items_table.item(row, 1).text().replace("₹", "").replace(",", ""))
@@ -175,50 +203,25 @@ class CreateInvoiceTab(BaseTab):
             }
         }
 
-        invoice = self.save_invoice(invoice_data)
-        invoice_data['invoice_number'] = invoice.invoice_number
+        invoice_number = self.save_invoice(invoice_data)
+        if not invoice_number:
+            return
+        invoice_data['invoice_number'] = invoice_number
 
-        pdf_service = PdfService(settings)
-        file_name = pdf_service.generate_invoice(invoice_data)
+        data = pdf.PdfService(settings).render(invoice_data)
+        file_name = pdf_archive.save_invoice_pdf(invoice_data, data)
         QMessageBox.information(self, "Success", f"Invoice PDF generated and saved as {file_name}")
 
     def save_invoice(self, invoice_data):
-        invoice_number = self.invoice_number_service.get_next_invoice_number()
-        new_invoice = Invoice(
-            invoice_number=invoice_number,
-            customer_id=invoice_data['customer_id'],
-            vehicle_number=invoice_data['vehicle_number'],
-            date=invoice_data['date'],
-            total_amount=invoice_data['total_amount']
-        )
-        self.db_session.add(new_invoice)
-        self.db_session.flush()
-
-        for item in invoice_data['items']:
-            product = self.db_session.query(Product).filter(Product.name == item['product_name']).first()
-            if product:
-                if product.inventory.stock_quantity < item['quantity']:
-                    QMessageBox.critical(self, "Error", f"Insufficient stock for {product.name}.")
-                    return None
-                product.inventory.stock_quantity -= item['quantity']
-                history_entry = InventoryHistory(
-                    product_id=product.id,
-                    change_quantity=-item['quantity'],
-                    reason=f"Invoice {invoice_number}",
-                    new_quantity=product.inventory.stock_quantity
-                )
-                self.db_session.add(history_entry)
-
-            new_item = InvoiceItem(
-                invoice_id=new_invoice.id,
-                product_name=item['product_name'],
-                quantity=item['quantity'],
-                price_per_unit=item['price_per_unit']
-            )
-            self.db_session.add(new_item)
-
-        self.db_session.commit()
-        return new_invoice
+        """Saves the invoice and adjusts stock in one transaction. Returns the invoice number, or None."""
+        try:
+            with write_scope() as session:
+                invoice = self.invoice_service.save_invoice(session, invoice_data)
+                invoice_number = invoice.invoice_number
+        except InsufficientStockError as e:
+            QMessageBox.critical(self, "Error", f"Insufficient stock for {e}.")
+            return None
+        return invoice_number
 
     def apply_styles(self):
         self.setStyleSheet(f"""
@@ -1,17 +1,49 @@
 # src/tabs/dashboard_tab.py
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout, QGridLayout
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout, QGridLayout, QComboBox
 from PyQt6.QtCore import Qt
 from sqlalchemy import func
 from src.utils.theme import DARK_THEME
-from src.utils.database import SessionLocal
-from src.models import Invoice, CustomerCompany, InvoiceItem
+from src.utils.plot_canvas import PlotCanvas
+from src.models import CustomerCompany
+from src.utils import sales_summary, revenue_series
 
 from src.tabs.base_tab import BaseTab
 
+def dashboard_summary(session):
+    """Runs on a worker thread; reads the pre-aggregated sales tables only."""
+    total_invoices, paid_invoices, total_revenue = sales_summary.status_totals(session)
+    unpaid_invoices = total_invoices - paid_invoices
+    total_companies = session.query(func.count(CustomerCompany.id)).scalar()
+    top_products = sales_summary.top_products(session, limit=5)
+    return total_invoices, paid_invoices, unpaid_invoices, total_companies, total_revenue, top_products
+
+# Periods shown on the revenue trend chart.
+TREND_PERIODS = {revenue_series.MONTHLY: 12, revenue_series.WEEKLY: 26}
+
+def revenue_trend(period):
+    """Query for the trend chart: the recent periods, the same periods a year earlier, and
+    how the current period compares with the previous one and with a year ago."""
+    def query(session):
+        series = revenue_series.revenue_series(session, period)
+        last = revenue_series.current_period(period)
+        recent = revenue_series.window(series, last, TREND_PERIODS[period])
+        year_before = revenue_series.window(series, last - revenue_series.PERIODS_PER_YEAR[period], TREND_PERIODS[period])
+        changes = {
+            "revenue": revenue_series.compare(recent.revenue),
+            "revenue_year": revenue_series.change(recent.revenue[-1], year_before.revenue[-1]),
+            "invoices": revenue_series.compare(recent.invoice_count),
+            "average_ticket": revenue_series.compare(recent.average_ticket),
+            "customers": revenue_series.compare(recent.customers),
+        }
+        return revenue_series.period_labels(recent), recent.revenue.tolist(), year_before.revenue.tolist(), changes
+    return query
+
+def format_change(change):
+    return "new" if change.change_pct is None else f"{change.change_pct:+.1f}%"
+
 class DashboardTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
         self.init_ui()
         self.load_dashboard_data()
         self.apply_styles()
@@ -32,16 +64,28 @@ class DashboardTab(BaseTab):
         main_layout.addLayout(stats_layout)
 
         # Graphs and other info
-        grid_layout = QGridLayout()
-        grid_layout.setSpacing(20)
+        self.chart_grid = QGridLayout()
+        self.chart_grid.setSpacing(20)
 
         self.top_products_chart = PlotCanvas(self, width=5, height=4)
         self.invoice_stats_chart = PlotCanvas(self, width=5, height=4)
-
-        grid_layout.addWidget(self.top_products_chart, 0, 0)
-        grid_layout.addWidget(self.invoice_stats_chart, 0, 1)
-
-        main_layout.addLayout(grid_layout)
+        self.chart_grid.addWidget(self.top_products_chart, 0, 0)
+        self.chart_grid.addWidget(self.invoice_stats_chart, 0, 1)
+
+        trend_header = QHBoxLayout()
+        self.trend_summary = QLabel("")
+        self.trend_summary.setObjectName("trend-summary")
+        self.trend_period_combo = QComboBox()
+        self.trend_period_combo.addItem("Monthly", revenue_series.MONTHLY)
+        self.trend_period_combo.addItem("Weekly", revenue_series.WEEKLY)
+        self.trend_period_combo.currentIndexChanged.connect(self.load_revenue_trend)
+        trend_header.addWidget(self.trend_summary, 1)
+        trend_header.addWidget(self.trend_period_combo)
+        self.revenue_trend_chart = PlotCanvas(self, width=10, height=3)
+        self.chart_grid.addLayout(trend_header, 1, 0, 1, 2)
+        self.chart_grid.addWidget(self.revenue_trend_chart, 2, 0, 1, 2)
+
+        main_layout.addLayout(self.chart_grid)
         main_layout.addStretch()
 
     def create_stat_card(self, title, value):
@@ -66,28 +110,22 @@ class DashboardTab(BaseTab):
         return graph_frame
 
     def load_dashboard_data(self):
-        total_invoices = self.db_session.query(Invoice).count()
-        paid_invoices = self.db_session.query(Invoice).filter(Invoice.payment_status == "Paid").count()
-        unpaid_invoices = total_invoices - paid_invoices
-        total_companies = self.db_session.query(CustomerCompany).count()
-        total_revenue = self.db_session.query(func.sum(Invoice.total_amount)).scalar() or 0
+        self.loader.load("summary", dashboard_summary, self.show_dashboard_data)
+        self.load_revenue_trend()
 
-        top_products = self.db_session.query(
-            InvoiceItem.product_name,
-            func.sum(InvoiceItem.quantity)
-        ).group_by(InvoiceItem.product_name).order_by(func.sum(InvoiceItem.quantity).desc()).limit(5).all()
-
-        top_companies = self.db_session.query(
-            CustomerCompany.name,
-            func.sum(Invoice.total_amount)
-        ).join(Invoice.customer).group_by(CustomerCompany.name).order_by(func.sum(Invoice.total_amount).desc()).limit(5).all()
+    def load_revenue_trend(self):
+        self.loader.load("trend", revenue_trend(self.trend_period_combo.currentData()), self.show_revenue_trend)
 
+    def on_changes(self, batch):
+        if batch.affects("Invoice", "Company"):
+            self.load_dashboard_data()
 
+    def show_dashboard_data(self, summary):
+        total_invoices, paid_invoices, unpaid_invoices, total_companies, total_revenue, top_products = summary
         self.total_invoices_card.findChild(QLabel, "stat-value").setText(str(total_invoices))
         self.total_companies_card.findChild(QLabel, "stat-value").setText(str(total_companies))
         self.total_revenue_card.findChild(QLabel, "stat-value").setText(f"₹{total_revenue:,.2f}")
 
-        # Update graphs
         self.top_products_chart.plot_bar(
             [p[0] for p in top_products],
             [p[1] for p in top_products],
@@ -101,6 +139,25 @@ class DashboardTab(BaseTab):
             "Invoice Status"
         )
 
+    def show_revenue_trend(self, trend):
+        labels, revenue, revenue_year_before, changes = trend
+        monthly = self.trend_period_combo.currentData() == revenue_series.MONTHLY
+        name = "month" if monthly else "week"
+        self.revenue_trend_chart.plot_line(
+            labels,
+            [("Revenue", revenue), ("A year earlier", revenue_year_before)],
+            "Monthly Revenue" if monthly else "Weekly Revenue",
+            "Month" if monthly else "Week",
+            "Revenue (₹)"
+        )
+        self.trend_summary.setText(
+            f"This {name}: ₹{changes['revenue'].current:,.2f} "
+            f"({format_change(changes['revenue'])} vs last {name}, {format_change(changes['revenue_year'])} vs a year ago)  ·  "
+            f"{changes['invoices'].current:.0f} invoices ({format_change(changes['invoices'])})  ·  "
+            f"{changes['customers'].current:.0f} customers  ·  "
+            f"Avg ticket ₹{changes['average_ticket'].current:,.2f} ({format_change(changes['average_ticket'])})"
+        )
+
     def apply_styles(self):
         self.setStyleSheet(f"""
             QFrame#stat-card {{
@@ -127,6 +184,10 @@ class DashboardTab(BaseTab):
                 padding: 20px;
                 min-height: 200px;
             }}
+            QLabel#trend-summary {{
+                color: {DARK_THEME['text_secondary']};
+                font-size: 13px;
+            }}
             QFrame#graph-card QLabel {{
                 color: {DARK_THEME['text_secondary']};
                 font-size: 16px;
@@ -1,13 +1,18 @@
 # src/tabs/inventory_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QLineEdit, QComboBox,
-                             QHeaderView, QPushButton, QFrame, QLabel, QAbstractItemView)
-from PyQt6.QtCore import Qt
-from src.utils.database import SessionLocal
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QLineEdit, QComboBox,
+                             QHeaderView, QFrame, QLabel, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+from src.utils.session_scope import write_scope
+from sqlalchemy import func
 from src.models import CustomerCompany, Product, Inventory, InventoryHistory
+from src.models.rows import InventoryRow
+from src.utils.inventory_queries import inventory_stats, inventory_rows_query, stock_quantity
+from src.utils.sql_table_model import SqlTableModel, SqlColumn
+from src.utils.delegates import ButtonsDelegate
 from src.utils.dialogs import StockAdjustmentDialog
 from src.utils.theme import DARK_THEME
-from sqlalchemy.orm import joinedload
 from src.utils.helpers import log_action
+from src.utils.event_bus import record_change, UPDATED, DELETED
 from src.utils.ui_manager import UIManager
 
 from src.tabs.base_tab import BaseTab
@@ -15,8 +20,7 @@ from src.tabs.base_tab import BaseTab
 class InventoryTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
-        self.ui_manager = UIManager(self.db_session, self)
+        self.ui_manager = UIManager(self)
         self.init_ui()
         self.load_inventory_data()
         self.apply_styles()
@@ -42,104 +46,109 @@ class InventoryTab(BaseTab):
         controls_layout = QHBoxLayout(controls_frame)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search product or company...")
-        self.search_input.textChanged.connect(self.load_inventory_data)
+        # Wait for a short pause in typing instead of querying on every keystroke.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.load_inventory_rows)
+        self.search_input.textChanged.connect(self.search_timer.start)
         self.stock_filter_combo = QComboBox()
         self.stock_filter_combo.addItems(["All Stock", "Low Stock", "Out of Stock"])
-        self.stock_filter_combo.currentIndexChanged.connect(self.load_inventory_data)
+        self.stock_filter_combo.currentIndexChanged.connect(self.load_inventory_rows)
         controls_layout.addWidget(QLabel("Search:"))
         controls_layout.addWidget(self.search_input, 1)
         controls_layout.addWidget(QLabel("Filter by:"))
         controls_layout.addWidget(self.stock_filter_combo)
 
-        self.inventory_table = QTableWidget()
-        self.inventory_table.setColumnCount(5)
-        self.inventory_table.setHorizontalHeaderLabels(["Product Name", "Company", "Current Stock", "Price", "Actions"])
+        self.inventory_model = SqlTableModel(
+            [
+                SqlColumn("Product Name", "product_name", Product.name),
+                SqlColumn("Company", "company_name", func.coalesce(CustomerCompany.name, "")),
+                SqlColumn("Current Stock", "stock_quantity", stock_quantity,
+                          alignment=Qt.AlignmentFlag.AlignCenter),
+                SqlColumn("Price", "price", Product.price, lambda price: f"₹{price:,.2f}"),
+                SqlColumn("Actions"),
+            ],
+            self.inventory_query("", "All Stock"), key_column=Product.id, row_type=InventoryRow,
+            loader=self.loader, parent=self
+        )
+
+        self.inventory_table = QTableView()
+        self.inventory_table.setModel(self.inventory_model)
+        self.inventory_table.verticalHeader().setVisible(False)
+        self.inventory_table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.inventory_table.setSortingEnabled(True)
         self.inventory_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.inventory_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.inventory_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.adjust_delegate = ButtonsDelegate([
+            ("Adjust Stock", lambda index: self.show_adjust_stock_dialog(self.inventory_model.row_at(index.row()))),
+        ], self.inventory_table)
+        self.inventory_table.setItemDelegateForColumn(4, self.adjust_delegate)
+        self.inventory_table.setColumnWidth(4, 130)
 
         main_layout.addWidget(stats_frame)
         main_layout.addWidget(controls_frame)
         main_layout.addWidget(self.inventory_table, 1)
 
     def load_inventory_data(self):
-        search_text = self.search_input.text().lower()
-        stock_filter = self.stock_filter_combo.currentText()
-        
-        query = self.db_session.query(Product).options(
-            joinedload(Product.company),
-            joinedload(Product.inventory)
-        )
-        
-        if search_text:
-            query = query.filter(Product.name.ilike(f"%{search_text}%") | CustomerCompany.name.ilike(f"%{search_text}%"))
+        """Refreshes the stats cards and the table, e.g. after stock or products changed."""
+        self.loader.load("stats", inventory_stats, self.show_stats)
+        self.load_inventory_rows()
 
-        all_products_for_stats = self.db_session.query(Product).all()
-        
-        if stock_filter == "Low Stock":
-            product_ids = [p.id for p in all_products_for_stats if p.inventory and p.inventory.stock_quantity <= p.inventory.low_stock_threshold and p.inventory.stock_quantity > 0]
-            query = query.filter(Product.id.in_(product_ids))
-        elif stock_filter == "Out of Stock":
-            product_ids = [p.id for p in all_products_for_stats if p.inventory and p.inventory.stock_quantity == 0]
-            query = query.filter(Product.id.in_(product_ids))
-
-        products = query.order_by(Product.name).all()
-        
-        self.inventory_table.setRowCount(0)
-        low_stock_count = 0
-        out_of_stock_count = 0
-        
-        for p in all_products_for_stats:
-            stock = p.inventory.stock_quantity if p.inventory else 0
-            low_thresh = p.inventory.low_stock_threshold if p.inventory else 10
-            if stock <= low_thresh and stock > 0: low_stock_count += 1
-            if stock == 0: out_of_stock_count += 1
-            
-        self.total_products_card.findChild(QLabel, "stat-value").setText(str(len(all_products_for_stats)))
+    def show_stats(self, stats):
+        total_products, low_stock_count, out_of_stock_count = stats
+        self.total_products_card.findChild(QLabel, "stat-value").setText(str(total_products))
         self.low_stock_card.findChild(QLabel, "stat-value").setText(str(low_stock_count))
         self.out_of_stock_card.findChild(QLabel, "stat-value").setText(str(out_of_stock_count))
 
-        for product in products:
-            row = self.inventory_table.rowCount()
-            self.inventory_table.insertRow(row)
-            self.inventory_table.setItem(row, 0, QTableWidgetItem(product.name))
-            self.inventory_table.setItem(row, 1, QTableWidgetItem(product.company.name))
-            stock_value = product.inventory.stock_quantity if product.inventory else 0
-            stock_item = QTableWidgetItem(str(stock_value))
-            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.inventory_table.setItem(row, 2, stock_item)
-            price_item = QTableWidgetItem(f"₹{product.price:,.2f}")
-            self.inventory_table.setItem(row, 3, price_item)
-            adjust_btn = QPushButton("Adjust Stock")
-            adjust_btn.setObjectName("secondary-button")
-            adjust_btn.clicked.connect(lambda chk, p=product: self.show_adjust_stock_dialog(p))
-            self.inventory_table.setCellWidget(row, 4, adjust_btn)
-
-    def show_adjust_stock_dialog(self, product):
-        current_stock = product.inventory.stock_quantity if product.inventory else 0
-        dialog = StockAdjustmentDialog(product.name, current_stock, self)
+    def on_changes(self, batch):
+        # Company names are shown on every row, so renaming a company reloads the table.
+        if batch.has_unknown("Product", "Inventory") or batch.ids("Company", kinds=(UPDATED, DELETED)):
+            self.load_inventory_data()
+            return
+        product_ids = batch.ids("Product", "Inventory")
+        if product_ids:
+            self.loader.load("stats", inventory_stats, self.show_stats)
+            self.inventory_model.refresh_rows(product_ids)
+
+    def inventory_query(self, search_text, stock_filter):
+        # Pages are fetched on a worker thread, so the widget values are captured here.
+        return lambda session: inventory_rows_query(session, search_text, stock_filter)
+
+    def load_inventory_rows(self):
+        """Reloads only the table for the current search text and stock filter.
+
+        A reload supersedes any page still being fetched for an older search."""
+        self.inventory_model.set_query_factory(
+            self.inventory_query(self.search_input.text().strip(), self.stock_filter_combo.currentText())
+        )
+
+    def show_adjust_stock_dialog(self, row):
+        dialog = StockAdjustmentDialog(row.product_name, row.stock_quantity, self)
         if dialog.exec():
             data = dialog.get_data()
             adjustment = data['adjustment']
             if adjustment != 0:
-                if not product.inventory:
-                    product.inventory = Inventory(stock_quantity=0, product=product)
-                    self.db_session.add(product.inventory)
+                with write_scope() as session:
+                    product = session.get(Product, row.product_id)
+                    if not product.inventory:
+                        product.inventory = Inventory(stock_quantity=0, product=product)
+                        session.add(product.inventory)
 
-                details = f"Stock for '{product.name}' changed by {adjustment}. Old: {product.inventory.stock_quantity}, New: {product.inventory.stock_quantity + adjustment}."
-                product.inventory.stock_quantity += adjustment
+                    details = f"Stock for '{product.name}' changed by {adjustment}. Old: {product.inventory.stock_quantity}, New: {product.inventory.stock_quantity + adjustment}."
+                    product.inventory.stock_quantity += adjustment
 
-                history_entry = InventoryHistory(
-                    product_id=product.id,
-                    change_quantity=adjustment,
-                    reason=data['reason'],
-                    new_quantity=product.inventory.stock_quantity
-                )
-                self.db_session.add(history_entry)
+                    history_entry = InventoryHistory(
+                        product_id=product.id,
+                        change_quantity=adjustment,
+                        reason=data['reason'],
+                        new_quantity=product.inventory.stock_quantity
+                    )
+                    session.add(history_entry)
 
-                log_action(self.db_session, "STOCK_ADJUST", "Inventory", product.id, details)
-                self.db_session.commit()
-                self.load_inventory_data()
+                    log_action(session, "STOCK_ADJUST", "Inventory", product.id, details)
+                    record_change(session, "Inventory", product.id, UPDATED)
 
     def apply_styles(self):
         self.setStyleSheet(f"""
@@ -147,9 +156,7 @@ class InventoryTab(BaseTab):
             QLabel#stat-title {{ color: {DARK_THEME['text_secondary']}; font-size: 13px; font-weight: 500; }}
             QLabel#stat-value {{ color: {DARK_THEME['text_primary']}; font-size: 24px; font-weight: 600; }}
             QFrame#panel-header {{ border-bottom: 1px solid {DARK_THEME['border_main']}; padding: 10px; }}
-            QTableWidget {{ background-color: transparent; gridline-color: {DARK_THEME['border_main']}; border: none; }}
+            QTableView {{ background-color: transparent; gridline-color: {DARK_THEME['border_main']}; border: none; }}
             QHeaderView::section {{ background-color: {DARK_THEME['bg_sidebar']}; color: {DARK_THEME['text_secondary']}; padding: 10px; border: none; font-weight: 600; }}
-            QTableWidget::item {{ padding: 10px; border-bottom: 1px solid {DARK_THEME['border_main']}; color: {DARK_THEME['text_primary']}; }}
-            QPushButton#secondary-button {{ background-color: transparent; color: {DARK_THEME['text_secondary']}; border: 1px solid {DARK_THEME['border_main']}; padding: 5px 10px; border-radius: 6px; }}
-            QPushButton#secondary-button:hover {{ border-color: {DARK_THEME['accent_primary']}; color: {DARK_THEME['accent_primary']}; }}
+            QTableView::item {{ padding: 10px; border-bottom: 1px solid {DARK_THEME['border_main']}; color: {DARK_THEME['text_primary']}; }}
         """)
\ No newline at end of file
@@ -1,17 +1,27 @@
 # src/tabs/invoice_history_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
-                             QHeaderView, QPushButton, QHBoxLayout, QComboBox, QMessageBox)
-from src.utils.database import SessionLocal
-from src.models import Invoice, UserSettings
+from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QMessageBox, QAbstractItemView,
+                             QPushButton, QFileDialog, QProgressDialog)
+from PyQt6.QtCore import Qt, QThreadPool
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
+from src.utils.session_scope import read_scope, write_scope
+from src.utils.sql_table_model import SqlTableModel, SqlColumn
+from src.utils.delegates import ButtonsDelegate, ComboBoxDelegate
+from src.utils.dialogs import InvoiceExportDialog, StatementDialog
+from src.utils.workers import JobTask
+from src.utils import bulk_pdf_export, customer_statement, invoice_documents, pdf_archive, pdf_cache
+from src.utils.helpers import log_action
+from src.utils import sales_summary
+from src.utils.event_bus import record_change, UPDATED
+from src.models import Invoice, CustomerCompany
+from src.models.rows import InvoiceRow
 from src.utils.theme import DARK_THEME
-from src.utils.pdf_service import PdfService
 
 from src.tabs.base_tab import BaseTab
 
 class InvoiceHistoryTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
         self.init_ui()
         self.load_invoices()
         self.apply_styles()
@@ -21,101 +31,106 @@ class InvoiceHistoryTab(BaseTab):
         main_layout.setContentsMargins(20, 20, 20, 20)
         main_layout.setSpacing(15)
 
-        self.invoice_table = QTableWidget()
-        self.invoice_table.setColumnCount(6)
-        self.invoice_table.setHorizontalHeaderLabels(["Invoice #", "Company", "Date", "Total", "Status", "Actions"])
+        header_layout = QHBoxLayout()
+        header_layout.addStretch()
+        self.statement_btn = QPushButton("Customer Statement…")
+        self.statement_btn.setObjectName("primary-button")
+        self.statement_btn.clicked.connect(self.create_statement)
+        header_layout.addWidget(self.statement_btn)
+        self.export_pdfs_btn = QPushButton("Export PDFs…")
+        self.export_pdfs_btn.setObjectName("primary-button")
+        self.export_pdfs_btn.clicked.connect(self.export_invoice_pdfs)
+        header_layout.addWidget(self.export_pdfs_btn)
+        main_layout.addLayout(header_layout)
+
+        self.invoice_model = SqlTableModel(
+            [
+                SqlColumn("Invoice #", "invoice_number", Invoice.invoice_number),
+                SqlColumn("Company", "customer_name", func.coalesce(CustomerCompany.name, "")),
+                SqlColumn("Date", "date", Invoice.date, lambda d: d.strftime("%Y-%m-%d")),
+                SqlColumn("Total", "total_amount", func.coalesce(Invoice.total_amount, 0),
+                          lambda total: f"₹{total or 0:,.2f}"),
+                SqlColumn("Status", "payment_status", Invoice.payment_status, on_edit=self.update_status),
+                SqlColumn("Actions"),
+            ],
+            self.invoices_query, key_column=Invoice.id, row_type=InvoiceRow,
+            sort_column=2, sort_order=Qt.SortOrder.DescendingOrder, loader=self.loader, parent=self
+        )
+
+        self.invoice_table = QTableView()
+        self.invoice_table.setModel(self.invoice_model)
+        self.invoice_table.verticalHeader().setVisible(False)
         self.invoice_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.invoice_table.horizontalHeader().setSortIndicator(2, Qt.SortOrder.DescendingOrder)
+        self.invoice_table.setSortingEnabled(True)
+        # Status and actions are painted by delegates; a real combo box only exists while editing.
+        self.status_delegate = ComboBoxDelegate(["Pending", "Paid", "Overdue"], self.invoice_table)
+        self.actions_delegate = ButtonsDelegate([
+            ("Download PDF", lambda index: self.redownload_invoice(self.invoice_model.row_at(index.row()).id)),
+            ("Share", lambda index: self.share_invoice(self.invoice_model.row_at(index.row()).id)),
+        ], self.invoice_table)
+        self.invoice_table.setItemDelegateForColumn(4, self.status_delegate)
+        self.invoice_table.setItemDelegateForColumn(5, self.actions_delegate)
+        self.invoice_table.setEditTriggers(QAbstractItemView.EditTrigger.CurrentChanged |
+                                           QAbstractItemView.EditTrigger.SelectedClicked)
+        self.invoice_table.setColumnWidth(5, 220)
 
         main_layout.addWidget(self.invoice_table)
 
+    def invoices_query(self, session):
+        return session.query(
+            Invoice.id, Invoice.invoice_number, CustomerCompany.name, Invoice.date,
+            Invoice.total_amount, Invoice.payment_status
+        ).outerjoin(Invoice.customer)
+
     def load_invoices(self):
-        self.invoice_table.setRowCount(0)
-        invoices = self.db_session.query(Invoice).order_by(Invoice.invoice_date.desc()).all()
-        for inv in invoices:
-            row = self.invoice_table.rowCount()
-            self.invoice_table.insertRow(row)
-            self.invoice_table.setItem(row, 0, QTableWidgetItem(inv.invoice_number))
-            self.invoice_table.setItem(row, 1, QTableWidgetItem(inv.customer.name))
-            self.invoice_table.setItem(row, 2, QTableWidgetItem(inv.invoice_date.strftime("%Y-%m-%d")))
-            self.invoice_table.setItem(row, 3, QTableWidgetItem(f"₹{inv.total_amount:,.2f}"))
-
-            status_combo = QComboBox()
-            status_combo.addItems(["Pending", "Paid", "Overdue"])
-            status_combo.setCurrentText(inv.payment_status)
-            # status_combo.currentTextChanged.connect(lambda text, inv_id=inv.id: self.update_status(text, inv_id))
-            self.invoice_table.setCellWidget(row, 4, status_combo)
-
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            download_btn = QPushButton("Download PDF")
-            download_btn.clicked.connect(lambda chk, inv=inv: self.redownload_invoice(inv))
-            share_btn = QPushButton("Share")
-            share_btn.clicked.connect(lambda chk, inv=inv: self.share_invoice(inv))
-            actions_layout.addWidget(download_btn)
-            actions_layout.addWidget(share_btn)
-            actions_layout.setContentsMargins(0,0,0,0)
-            self.invoice_table.setCellWidget(row, 5, actions_widget)
-
-    def redownload_invoice(self, invoice):
-        settings = self.db_session.query(UserSettings).first()
-        if not settings:
-            QMessageBox.critical(self, "Error", "Please configure your company settings first.")
-            return
+        self.invoice_model.refresh()
 
-        items = []
-        for item in invoice.items:
-            items.append({
-                "product_name": item.product_name,
-                "quantity": item.quantity,
-                "price_per_unit": item.price_per_unit
-            })
-
-        invoice_data = {
-            "invoice_number": invoice.invoice_number,
-            "date": invoice.date.strftime("%Y-%m-%d"),
-            "vehicle_number": invoice.vehicle_number,
-            "customer": {
-                "name": invoice.customer.name,
-                "address": invoice.customer.address,
-                "gstin": invoice.customer.gstin,
-                "state_code": invoice.customer.state_code
-            },
-            "items": items
-        }
-
-        pdf_service = PdfService(settings)
-        file_name = pdf_service.generate_invoice(invoice_data)
-        QMessageBox.information(self, "Success", f"Invoice PDF re-downloaded and saved as {file_name}")
+    def on_changes(self, batch):
+        if batch.has_unknown("Invoice") or batch.ids("Company", kinds=(UPDATED,)):
+            self.load_invoices()
+        elif batch.affects("Invoice"):
+            self.invoice_model.refresh_rows(batch.ids("Invoice"))
+
+    def update_status(self, row, status):
+        with write_scope() as session:
+            invoice = session.get(Invoice, row.id)
+            sales_summary.record_status_change(session, invoice.payment_status, status, invoice.total_amount)
+            invoice.payment_status = status
+            log_action(session, "UPDATE", "Invoice", row.id,
+                       f"Invoice '{row.invoice_number}' marked as {status}.")
+            record_change(session, "Invoice", row.id, UPDATED)
 
-    def share_invoice(self, invoice):
-        settings = self.db_session.query(UserSettings).first()
+    def load_invoice_for_pdf(self, invoice_id):
+        """Returns (settings, invoice_data) for the PDF service, or (None, None) if settings are missing."""
+        with read_scope() as session:
+            settings = invoice_documents.load_pdf_settings(session)
+            if not settings:
+                return None, None
+            invoice = (session.query(Invoice)
+                       .options(joinedload(Invoice.customer), selectinload(Invoice.items))
+                       .filter(Invoice.id == invoice_id).one())
+            return settings, invoice_documents.invoice_data(invoice)
+
+    def archive_invoice_pdf(self, invoice_id):
+        """Returns the invoice's path in the PDF archive, or None if settings are missing."""
+        settings, invoice_data = self.load_invoice_for_pdf(invoice_id)
         if not settings:
             QMessageBox.critical(self, "Error", "Please configure your company settings first.")
+            return None
+        data = pdf_cache.default_cache().invoice_pdf(settings, invoice_data)
+        return pdf_archive.save_invoice_pdf(invoice_data, data)
+
+    def redownload_invoice(self, invoice_id):
+        file_name = self.archive_invoice_pdf(invoice_id)
+        if not file_name:
             return
+        QMessageBox.information(self, "Success", f"Invoice PDF re-downloaded and saved as {file_name}")
 
-        items = []
-        for item in invoice.items:
-            items.append({
-                "product_name": item.product_name,
-                "quantity": item.quantity,
-                "price_per_unit": item.price_per_unit
-            })
-
-        invoice_data = {
-            "invoice_number": invoice.invoice_number,
-            "date": invoice.date.strftime("%Y-%m-%d"),
-            "vehicle_number": invoice.vehicle_number,
-            "customer": {
-                "name": invoice.customer.name,
-                "address": invoice.customer.address,
-                "gstin": invoice.customer.gstin,
-                "state_code": invoice.customer.state_code
-            },
-            "items": items
-        }
-
-        pdf_service = PdfService(settings)
-        file_name = pdf_service.generate_invoice(invoice_data)
+    def share_invoice(self, invoice_id):
+        file_name = self.archive_invoice_pdf(invoice_id)
+        if not file_name:
+            return
 
         try:
             from PyQt6.QtGui import QDesktopServices
@@ -124,10 +139,108 @@ class InvoiceHistoryTab(BaseTab):
         except ImportError:
             QMessageBox.critical(self, "Error", "Could not open file. PySide6 is required for this feature.")
 
+    def export_invoice_pdfs(self):
+        dialog = InvoiceExportDialog(self)
+        if not dialog.exec():
+            return
+        if dialog.as_zip.isChecked():
+            output, _ = QFileDialog.getSaveFileName(self, "Export Invoice PDFs To", "invoices.zip", "ZIP files (*.zip)")
+            if output and not bulk_pdf_export.is_zip(output):
+                output += ".zip"
+        else:
+            output = QFileDialog.getExistingDirectory(self, "Export Invoice PDFs To")
+        if not output:
+            return
+
+        criteria = dialog.get_data()
+        task = JobTask(lambda progress, cancelled: bulk_pdf_export.export_invoices(
+            output, progress=progress, cancelled=cancelled, **criteria))
+        progress_dialog = QProgressDialog("Rendering invoice PDFs…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Export Invoice PDFs")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.canceled.connect(task.cancel)
+
+        def show_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(f"Rendering invoice PDFs… {done} of {total}")
+
+        def finished(result):
+            progress_dialog.reset()
+            self.export_pdfs_btn.setEnabled(True)
+            message = f"Wrote {len(result.written)} of {result.total} invoice PDFs to {output}."
+            if result.cancelled and bulk_pdf_export.is_zip(output):
+                message = f"Export cancelled; {output} was not written."
+            elif result.cancelled:
+                message = "Export cancelled. " + message
+            if result.failed:
+                message += "\n\nFailed:\n" + "\n".join(f"{number}: {error}" for number, error in result.failed[:10])
+            QMessageBox.information(self, "Export Invoice PDFs", message)
+
+        def failed(error):
+            progress_dialog.reset()
+            self.export_pdfs_btn.setEnabled(True)
+            QMessageBox.critical(self, "Export Invoice PDFs", error)
+
+        task.signals.progress.connect(show_progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        self.export_pdfs_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def create_statement(self):
+        with read_scope() as session:
+            customers = session.query(CustomerCompany.id, CustomerCompany.name).order_by(CustomerCompany.name).all()
+        dialog = StatementDialog(customers, self)
+        if not dialog.exec():
+            return
+        criteria = dialog.get_data()
+        file_name = customer_statement.statement_file_name(dialog.customer.currentText(), criteria["date_from"],
+                                                           criteria["date_to"])
+        output, _ = QFileDialog.getSaveFileName(self, "Save Customer Statement", file_name, "PDF files (*.pdf)")
+        if not output:
+            return
+        if not output.lower().endswith(".pdf"):
+            output += ".pdf"
+
+        task = JobTask(lambda progress, cancelled: customer_statement.write_statement(
+            output, progress=progress, cancelled=cancelled, **criteria))
+        progress_dialog = QProgressDialog("Rendering statement…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Customer Statement")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.canceled.connect(task.cancel)
+
+        def show_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(f"Rendering statement… invoice {done} of {total}")
+
+        def finished(summary):
+            progress_dialog.reset()
+            self.statement_btn.setEnabled(True)
+            if summary is None:
+                QMessageBox.information(self, "Customer Statement", "Statement cancelled.")
+                return
+            QMessageBox.information(self, "Customer Statement",
+                                    f"Statement of {summary.invoice_count} invoices and {summary.payment_count} "
+                                    f"payments saved as {output}")
+
+        def failed(error):
+            progress_dialog.reset()
+            self.statement_btn.setEnabled(True)
+            QMessageBox.critical(self, "Customer Statement", error)
+
+        task.signals.progress.connect(show_progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        self.statement_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(task)
 
     def apply_styles(self):
         self.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {DARK_THEME['bg_surface']};
                 gridline-color: {DARK_THEME['border_main']};
                 border: 1px solid {DARK_THEME['border_main']};
@@ -139,7 +252,15 @@ class InvoiceHistoryTab(BaseTab):
                 padding: 10px;
                 border: none;
             }}
-            QTableWidget::item {{
+            QPushButton#primary-button {{
+                background-color: {DARK_THEME['accent_primary']};
+                color: {DARK_THEME['text_on_accent']};
+                border: none;
+                padding: 10px 20px;
+                border-radius: 6px;
+                font-weight: 600;
+            }}
+            QTableView::item {{
                 padding: 10px;
                 color: {DARK_THEME['text_primary']};
             }}
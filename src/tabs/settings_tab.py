@@ -1,18 +1,19 @@
 # src/tabs/settings_tab.py
+import re
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                             QPushButton, QGridLayout, QFrame, QMessageBox)
+                             QPushButton, QGridLayout, QFrame, QMessageBox, QComboBox)
 from PyQt6.QtCore import Qt
 from src.utils.theme import DARK_THEME
-from src.utils.database import SessionLocal
+from src.utils.session_scope import read_scope, write_scope
 from src.models.user import UserSettings
 from src.utils.helpers import log_action
+from src.utils.invoice_documents import TEMPLATE_NAMES, DEFAULT_TEMPLATE
 
 from src.tabs.base_tab import BaseTab
 
 class SettingsTab(BaseTab):
     def __init__(self):
         super().__init__()
-        self.db_session = self.get_db_session()
         self.init_ui()
         self.load_settings()
         self.apply_styles()
@@ -61,12 +62,16 @@ class SettingsTab(BaseTab):
         grid_layout.addWidget(contact_card, 0, 1)
 
         # --- Invoice Customization Card ---
-        invoice_card = self.create_card("Invoice Customization", "Add a custom message to your invoices.")
+        invoice_card = self.create_card("Invoice Customization", "Choose a layout and add a custom message to your invoices.")
         invoice_form_layout = QGridLayout()
         self.tagline_input = QLineEdit()
         self.tagline_input.setPlaceholderText("e.g., Thank you for your business!")
         invoice_form_layout.addWidget(QLabel("Invoice Tagline / Footer Note"), 0, 0)
         invoice_form_layout.addWidget(self.tagline_input, 0, 1)
+        self.template_combo = QComboBox()
+        self.template_combo.addItems(TEMPLATE_NAMES)
+        invoice_form_layout.addWidget(QLabel("Invoice Template"), 1, 0)
+        invoice_form_layout.addWidget(self.template_combo, 1, 1)
         invoice_card.layout().addLayout(invoice_form_layout)
         grid_layout.addWidget(invoice_card, 1, 0, 1, 2)
 
@@ -100,7 +105,8 @@ class SettingsTab(BaseTab):
         return card
 
     def load_settings(self):
-        settings = self.db_session.query(UserSettings).first()
+        with read_scope() as session:
+            settings = session.query(UserSettings).first()
         if settings:
             self.company_name_input.setText(settings.company_name or "")
             self.gstin_input.setText(settings.gstin or "")
@@ -110,8 +116,7 @@ class SettingsTab(BaseTab):
             self.email_input.setText(settings.email or "")
             self.upi_id_input.setText(settings.upi_id or "")
             self.tagline_input.setText(settings.tagline or "")
-
-import re
+            self.template_combo.setCurrentText(settings.chosen_template or DEFAULT_TEMPLATE)
 
     def save_settings(self):
         gstin = self.gstin_input.text()
@@ -125,21 +130,23 @@ import re
             QMessageBox.critical(self, "Error", "Invalid PAN format.")
             return
 
-        settings = self.db_session.query(UserSettings).first()
+        with write_scope() as session:
+            settings = session.query(UserSettings).first()
+            if settings:
+                details = "Updated company settings."
+                settings.company_name = self.company_name_input.text()
+                settings.gstin = gstin
+                settings.pan_number = pan
+                settings.address = self.address_input.text()
+                settings.mobile_number = self.mobile_input.text()
+                settings.email = self.email_input.text()
+                settings.upi_id = self.upi_id_input.text()
+                settings.tagline = self.tagline_input.text()
+                settings.chosen_template = self.template_combo.currentText()
+
+                log_action(session, "UPDATE", "Settings", settings.id, details)
+
         if settings:
-            details = "Updated company settings."
-            settings.company_name = self.company_name_input.text()
-            settings.gstin = gstin
-            settings.pan_number = pan
-            settings.address = self.address_input.text()
-            settings.mobile_number = self.mobile_input.text()
-            settings.email = self.email_input.text()
-            settings.upi_id = self.upi_id_input.text()
-            settings.tagline = self.tagline_input.text()
-            
-            log_action(self.db_session, "UPDATE", "Settings", settings.id, details)
-            self.db_session.commit()
-            
             msg_box = QMessageBox(self)
             msg_box.setText("Settings have been saved successfully.")
             msg_box.setIcon(QMessageBox.Icon.Information)
@@ -177,7 +184,7 @@ import re
                 color: {DARK_THEME['text_secondary']};
                 padding-bottom: 10px;
             }}
-            QLineEdit {{
+            QLineEdit, QComboBox {{
                 background-color: {DARK_THEME['bg_input']};
                 color: {DARK_THEME['text_primary']};
                 border: 1px solid {DARK_THEME['border_main']};
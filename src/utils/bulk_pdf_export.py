@@ -0,0 +1,171 @@
+# src/utils/bulk_pdf_export.py
+# Renders many invoice PDFs at once, e.g. a month's invoices for the accountant:
+#
+#     python -m src.utils.bulk_pdf_export exports/2024-05 --from-date 2024-05-01 --to-date 2024-05-31
+#     python -m src.utils.bulk_pdf_export exports/batch --from-number INV-2425-00100 --to-number INV-2425-00250
+#     python -m src.utils.bulk_pdf_export exports/2024-05.zip --from-date 2024-05-01 --to-date 2024-05-31
+#
+# Invoices are read in chunks (customers and items eager-loaded) on the calling
+# thread and rendered by a process pool, one chunk per task. Only a few chunks
+# are in flight at a time, so memory does not grow with the size of the range.
+# For a folder the workers write the files themselves; for a .zip they send the
+# PDF bytes back and this process adds them to the archive.
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from sqlalchemy import func
+from src.models import Invoice
+from src.utils.session_scope import read_scope
+from src.utils.invoice_documents import (DEFAULT_CHUNK_SIZE, invoice_filter, iter_invoice_chunks,
+                                         load_pdf_settings)
+
+ExportResult = namedtuple("ExportResult", ["total", "written", "failed", "cancelled"])
+
+
+class BulkExportError(Exception):
+    pass
+
+
+def _render_chunk(settings, invoices, output_dir):
+    # Runs in a worker process; only the workers need reportlab.
+    from src.utils import pdf_service
+    if output_dir is None:
+        return pdf_service.render_invoices(settings, invoices)
+    return pdf_service.render_invoice_files(settings, invoices, output_dir)
+
+
+def is_zip(output):
+    return output.lower().endswith(".zip")
+
+
+def export_invoices(output, date_from=None, date_to=None, number_from=None, number_to=None,
+                    workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, cancelled=None,
+                    session_factory=None):
+    """Writes one PDF per selected invoice into the folder `output`, or into a
+    zip archive if `output` ends in .zip.
+
+    progress(done, total) is called after every chunk; `cancelled` is a
+    threading.Event-like object checked between chunks. Chunks already being
+    rendered finish, the rest are dropped; a cancelled zip export writes
+    nothing and leaves `output` as it was. Returns an ExportResult, with
+    `written` as the paths (or archive member names) and `failed` as
+    [(invoice_number, error)].
+    """
+    if not is_zip(output):
+        return _export(output, None, date_from, date_to, number_from, number_to,
+                       workers, chunk_size, progress, cancelled, session_factory)
+    # Built next to the target and renamed at the end, like every other PDF write.
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            result = _export(None, archive, date_from, date_to, number_from, number_to,
+                             workers, chunk_size, progress, cancelled, session_factory)
+        # A partial archive must not replace a complete one already at `output`.
+        if result.cancelled:
+            os.remove(tmp_path)
+            return result._replace(written=[])
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return result
+
+
+def _export(output_dir, archive, date_from, date_to, number_from, number_to,
+            workers, chunk_size, progress, cancelled, session_factory):
+    workers = workers or os.cpu_count() or 1
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    written, failed = [], []
+    with read_scope(session_factory) as session:
+        settings = load_pdf_settings(session)
+        if settings is None:
+            raise BulkExportError("Please configure your company settings first.")
+        conditions = invoice_filter(session, date_from, date_to, number_from, number_to)
+        total = session.query(func.count(Invoice.id)).filter(*conditions).scalar()
+        if progress:
+            progress(0, total)
+        if not total:
+            return ExportResult(0, [], [], False)
+        # Small ranges are still spread over every worker.
+        chunk_size = max(1, min(chunk_size, -(-total // workers)))
+
+        # spawn rather than fork: the GUI process has Qt and SQLite threads running.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, total), mp_context=context) as pool:
+            chunks = iter_invoice_chunks(session, conditions, chunk_size)
+            pending = set()
+            was_cancelled = False
+            while True:
+                was_cancelled = was_cancelled or bool(cancelled and cancelled.is_set())
+                while not was_cancelled and len(pending) < workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.add(pool.submit(_render_chunk, settings, chunk, output_dir))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        if archive is not None:
+                            number, path, data, error = result
+                            if data is not None:
+                                archive.writestr(path, data)
+                        else:
+                            number, path, error = result
+                        if error:
+                            failed.append((number, error))
+                        else:
+                            written.append(path)
+                if progress:
+                    progress(len(written) + len(failed), total)
+    return ExportResult(total, written, failed, was_cancelled)
+
+
+def _date(value):
+    return datetime.date.fromisoformat(value)
+
+
+def main(argv=None):
+    from src.utils.migrations import run_migrations
+    from src.utils.database import engine
+
+    parser = argparse.ArgumentParser(description="Render invoice PDFs for a date or invoice-number range.")
+    parser.add_argument("output", help="folder for the PDFs, or a .zip file")
+    parser.add_argument("--from-date", type=_date)
+    parser.add_argument("--to-date", type=_date)
+    parser.add_argument("--from-number")
+    parser.add_argument("--to-number")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    run_migrations(engine)
+
+    def report(done, total):
+        print(f"\r{done}/{total} invoices", end="", file=sys.stderr, flush=True)
+
+    try:
+        result = export_invoices(args.output, args.from_date, args.to_date, args.from_number, args.to_number,
+                                 workers=args.workers, chunk_size=args.chunk_size, progress=report)
+    except (BulkExportError, ValueError) as exc:
+        parser.exit(1, f"{exc}\n")
+    print(file=sys.stderr)
+    for number, error in result.failed:
+        print(f"{number}: {error}", file=sys.stderr)
+    print(f"Wrote {len(result.written)} of {result.total} invoice PDFs to {args.output}.")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# src/utils/company_list_model.py
+# List model for the company panel. Rows are CompanyRow tuples; the check boxes
+# used for bulk deletion live in a set of ids, so toggling a row and asking how
+# many rows are checked are both O(1) regardless of the number of customers.
+from bisect import bisect_left
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+
+
+class CompanyListModel(QAbstractListModel):
+    RowRole = Qt.ItemDataRole.UserRole + 1
+    checkedCountChanged = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_by_id = {}
+        self._checked = set()
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        company = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return company.name
+        if role == Qt.ItemDataRole.UserRole:
+            return company.id
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if company.id in self._checked else Qt.CheckState.Unchecked
+        if role == self.RowRole:
+            return company
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        company_id = self._rows[index.row()].id
+        was_checked = company_id in self._checked
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self._checked.add(company_id)
+        else:
+            self._checked.discard(company_id)
+        if was_checked != (company_id in self._checked):
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            self.checkedCountChanged.emit(len(self._checked))
+        return True
+
+    # --- public helpers ---
+    def set_companies(self, companies):
+        """Replaces the rows, keeping the check state of companies that still exist."""
+        self.beginResetModel()
+        self._rows = list(companies)
+        self._reindex()
+        self._checked &= self._row_by_id.keys()
+        self.endResetModel()
+        self.checkedCountChanged.emit(len(self._checked))
+
+    def apply_changes(self, companies, removed_ids=()):
+        """Updates or inserts `companies` at their place in name order and removes `removed_ids`."""
+        checked_before = len(self._checked)
+        changed_ids = set(removed_ids) | {company.id for company in companies}
+        # Highest row first, so the rows still to remove keep their positions.
+        for row in sorted((self._row_by_id[cid] for cid in changed_ids if cid in self._row_by_id), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        # Names kept alongside the rows for bisect (its key= argument needs Python 3.10).
+        names = [company.name for company in self._rows]
+        for company in companies:
+            row = bisect_left(names, company.name)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.insert(row, company)
+            names.insert(row, company.name)
+            self.endInsertRows()
+        self._reindex()
+        self._checked.difference_update(removed_ids)
+        if len(self._checked) != checked_before:
+            self.checkedCountChanged.emit(len(self._checked))
+
+    def _reindex(self):
+        self._row_by_id = {company.id: row for row, company in enumerate(self._rows)}
+
+    def index_of(self, company_id):
+        row = self._row_by_id.get(company_id)
+        return self.index(row) if row is not None else QModelIndex()
+
+    def checked_ids(self):
+        return list(self._checked)
+
+    def checked_count(self):
+        return len(self._checked)
+
+    def set_checked(self, company_ids, checked):
+        """Checks or unchecks many companies at once with a single change notification."""
+        if checked:
+            self._checked.update(cid for cid in company_ids if cid in self._row_by_id)
+        else:
+            self._checked.difference_update(company_ids)
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.ItemDataRole.CheckStateRole])
+        self.checkedCountChanged.emit(len(self._checked))
+
+
+class CompanyFilterModel(QSortFilterProxyModel):
+    """Case-insensitive name search over a CompanyListModel."""
+    def __init__(self, source_model, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source_model)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setFilterRole(Qt.ItemDataRole.DisplayRole)
+
+    def visible_ids(self):
+        return [self.index(row, 0).data(Qt.ItemDataRole.UserRole) for row in range(self.rowCount())]
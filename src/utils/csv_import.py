@@ -0,0 +1,553 @@
+# src/utils/csv_import.py
+# Streaming CSV imports, sized for supplier catalogues of hundreds of thousands
+# of rows and for years of legacy invoices:
+#
+#     python -m src.utils.csv_import catalogue supplier_products.csv
+#     python -m src.utils.csv_import invoices invoices_2015-2024.csv
+#
+# Rows are read a chunk at a time and each chunk is written with Core
+# executemany inserts and committed on its own, together with a checkpoint of
+# how many rows are done. Names are resolved against maps loaded once at the
+# start instead of a query per row. If an import stops part-way (an error, a
+# crash, or cancelled), importing the same, unchanged file again carries on
+# after the last committed chunk.
+import argparse
+import csv
+import datetime
+import itertools
+import logging
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from contextlib import closing
+from sqlalchemy import delete, insert, select
+from src.models import CustomerCompany, ImportCheckpoint, Inventory, Invoice, InvoiceItem, Product
+from src.utils import sales_summary
+from src.utils.event_bus import record_change, CREATED
+from src.utils.helpers import log_action
+from src.utils.invoice_number_service import reserve_imported_numbers
+from src.utils.session_scope import read_scope, write_scope
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE = "catalogue"
+INVOICES = "invoices"
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+# Rows with errors are all counted, but only this many are kept in memory.
+MAX_REPORTED_ERRORS = 200
+
+INVOICE_COLUMNS = ["InvoiceNumber", "CustomerName", "Date", "VehicleNumber", "TotalAmount", "PaymentStatus",
+                   "ProductName", "Quantity", "PricePerUnit"]
+INVOICE_STATUSES = ("Pending", "Paid", "Overdue")
+# The first is ISO, as exported; the others are tried for legacy files.
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+# `rows` were read in this run (after `resumed_from` rows an earlier run
+# committed); `errors` holds (line number, message) for rows that were skipped,
+# and `error_report` is the CSV file listing all of them (after those earlier
+# runs rejected), if this run wrote one.
+CatalogueResult = namedtuple("CatalogueResult", [
+    "rows", "companies", "products", "skipped", "errors", "error_count", "error_report", "resumed_from",
+    "elapsed", "cancelled",
+])
+# `duplicates` counts invoices skipped because their number already exists.
+InvoiceImportResult = namedtuple("InvoiceImportResult", [
+    "rows", "invoices", "items", "duplicates", "errors", "error_count", "error_report", "resumed_from",
+    "elapsed", "cancelled",
+])
+
+
+class CsvImportError(Exception):
+    pass
+
+
+def parse_state(state_raw):
+    """('Maharashtra', '27') from 'Maharashtra (Code: 27)', as exported; (text, '') otherwise."""
+    match = re.search(r"(.+?)\s*\(Code:\s*(\d+)\)", state_raw)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return state_raw, ""
+
+
+def count_rows(file_name):
+    """Data rows in a CSV file, counted as lines (quoted line breaks make it an estimate)."""
+    lines = 0
+    last = b"\n"
+    with open(file_name, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def rows_per_second(rows, elapsed):
+    return rows / elapsed if elapsed > 0 else 0.0
+
+
+def _fingerprint(file_name):
+    stat = os.stat(file_name)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _start(kind, source, fingerprint, session_factory):
+    """Rows an earlier run of this import committed, or 0 for a new or changed file."""
+    with write_scope(session_factory) as session:
+        checkpoint = session.get(ImportCheckpoint, (kind, source))
+        if checkpoint and (checkpoint.file_size, checkpoint.file_mtime_ns) == fingerprint:
+            return checkpoint.rows_done
+        if checkpoint:
+            logger.info("%s changed since %d rows of it were imported; starting over", source, checkpoint.rows_done)
+            session.delete(checkpoint)
+        return 0
+
+
+def _save_checkpoint(session, kind, source, fingerprint, rows_done):
+    session.merge(ImportCheckpoint(kind=kind, source=source, file_size=fingerprint[0],
+                                   file_mtime_ns=fingerprint[1], rows_done=rows_done))
+
+
+class ErrorReport:
+    """Rows that could not be imported.
+
+    All are counted and the first MAX_REPORTED_ERRORS kept in `errors` as
+    (line number, message). Given a `path`, every one is also written there as
+    CSV by flush(), once the chunk it came from is committed; the file is only
+    created once there is something to report. With `append` (a resumed
+    import) the rows earlier runs rejected are kept and new ones added after.
+    """
+    def __init__(self, path=None, append=False):
+        self.path = path
+        self.errors = []
+        self.count = 0
+        self._pending = []
+        self._append = bool(append and path and os.path.isfile(path) and os.path.getsize(path))
+        self._file = None
+        self._writer = None
+
+    def add(self, line, message):
+        self.count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+        if self.path:
+            self._pending.append((line, message))
+
+    def flush(self):
+        if not self._pending:
+            return
+        if self._writer is None:
+            self._file = open(self.path, "a" if self._append else "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            if not self._append:
+                self._writer.writerow(["Line", "Error"])
+        self._writer.writerows(self._pending)
+        self._pending.clear()
+
+    @property
+    def written(self):
+        return self.path if self._file else None
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class _ImportRun:
+    """What every import does around its chunks: resuming from the checkpoint,
+    committing each chunk with the new checkpoint, reporting progress and
+    clearing the checkpoint at the end."""
+    def __init__(self, kind, file_name, progress, session_factory):
+        self.started = time.monotonic()
+        self.kind = kind
+        self.source = os.path.abspath(file_name)
+        self.fingerprint = _fingerprint(self.source)
+        self.total = count_rows(self.source)
+        self.progress = progress
+        self.session_factory = session_factory
+        self.resumed_from = _start(kind, self.source, self.fingerprint, session_factory)
+        self.done = self.resumed_from
+        self.rows = 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def reader(self, infile, required_columns):
+        """A DictReader positioned after the rows an earlier run committed."""
+        reader = csv.DictReader(infile)
+        missing = [column for column in required_columns if column not in (reader.fieldnames or ())]
+        if missing:
+            raise CsvImportError(f"{os.path.basename(self.source)} has no {', '.join(missing)} column.")
+        for _ in itertools.islice(reader, self.resumed_from):
+            pass
+        self.report_progress()
+        return reader
+
+    def report_progress(self):
+        if self.progress:
+            self.progress(self.done, max(self.total, self.done))
+
+    def commit(self, rows, write):
+        """Runs write(session) and records `rows` more rows as done, in one transaction."""
+        with write_scope(self.session_factory) as session:
+            write(session)
+            _save_checkpoint(session, self.kind, self.source, self.fingerprint, self.done + rows)
+        self.done += rows
+        self.rows += rows
+        logger.debug("%s: %d rows, %.0f rows/s", self.source, self.done, rows_per_second(self.rows, self.elapsed))
+        self.report_progress()
+
+    def finish(self, details):
+        with write_scope(self.session_factory) as session:
+            session.execute(delete(ImportCheckpoint).where(ImportCheckpoint.kind == self.kind,
+                                                           ImportCheckpoint.source == self.source))
+            log_action(session, "IMPORT", "System", None, details)
+
+
+def _chunks(reader, chunk_size):
+    """Lists of (line number, row) from a DictReader."""
+    while True:
+        chunk = [(reader.line_num, row) for row in itertools.islice(reader, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _field(row, name):
+    return (row.get(name) or "").strip()
+
+
+class _CatalogueChunk:
+    """Turns a chunk of catalogue rows into insert parameters."""
+    def __init__(self, companies, report):
+        self.companies = companies
+        self.report = report
+        self.new_companies = {}
+        self.products = []
+        self.skipped = 0
+
+    def add(self, line, row):
+        company_name = _field(row, "CompanyName")
+        if not company_name:
+            self.skipped += 1
+            return
+        if company_name not in self.companies and company_name not in self.new_companies:
+            state, state_code = parse_state(_field(row, "State"))
+            self.new_companies[company_name] = {
+                "name": company_name, "address": _field(row, "Address"), "state": state,
+                "state_code": state_code, "gstin": _field(row, "GSTIN"),
+            }
+        product_name = _field(row, "ProductName")
+        if not product_name:
+            return
+        price = _field(row, "Price")
+        try:
+            price = float(price) if price else 0.0
+        except ValueError:
+            self.report.add(line, f"Price {price!r} of '{product_name}' is not a number.")
+            return
+        self.products.append((company_name, product_name, price))
+
+    def write(self, session):
+        # Straight to the tables, as _InvoiceChunk.write does.
+        connection = session.connection()
+        if self.new_companies:
+            companies = CustomerCompany.__table__
+            created = connection.execute(insert(companies).returning(companies.c.name, companies.c.id),
+                                         list(self.new_companies.values()))
+            self.companies.update(created.all())
+            record_change(session, "Company", None, CREATED)
+        if self.products:
+            products = Product.__table__
+            product_ids = connection.execute(
+                insert(products).returning(products.c.id, sort_by_parameter_order=True),
+                [{"name": name, "price": price, "company_id": self.companies[company_name]}
+                 for company_name, name, price in self.products],
+            ).scalars().all()
+            connection.execute(insert(Inventory.__table__), [{"product_id": product_id, "stock_quantity": 0}
+                                                             for product_id in product_ids])
+            record_change(session, "Product", None, CREATED)
+
+
+def import_catalogue(file_name, chunk_size=DEFAULT_IMPORT_CHUNK_SIZE, progress=None, cancelled=None,
+                     session_factory=None, error_report=None):
+    """Imports companies and their products from a CSV file, as exported.
+
+    Columns: CompanyName, Address, State, GSTIN, ProductName, Price. A company
+    is created the first time its name appears and every product gets an
+    empty inventory record. Rows without a company name are skipped, rows with
+    a bad price are skipped and reported (also to the CSV file `error_report`,
+    if given). Each chunk is committed on its own; progress(done, total) is
+    called after each and `cancelled` is checked between them. Returns a
+    CatalogueResult.
+    """
+    run = _ImportRun(CATALOGUE, file_name, progress, session_factory)
+    with read_scope(session_factory) as session:
+        companies = dict(session.execute(select(CustomerCompany.name, CustomerCompany.id)).all())
+
+    report = ErrorReport(error_report, append=run.resumed_from > 0)
+    new_companies = products = skipped = 0
+
+    def result(cancelled):
+        return CatalogueResult(run.rows, new_companies, products, skipped, report.errors, report.count,
+                               report.written, run.resumed_from, run.elapsed, cancelled)
+
+    with open(run.source, mode="r", encoding="utf-8-sig", newline="") as infile, closing(report):
+        reader = run.reader(infile, ["CompanyName"])
+        for chunk_rows in _chunks(reader, chunk_size):
+            if cancelled and cancelled.is_set():
+                return result(True)
+            chunk = _CatalogueChunk(companies, report)
+            for line, row in chunk_rows:
+                chunk.add(line, row)
+            run.commit(len(chunk_rows), chunk.write)
+            report.flush()
+            new_companies += len(chunk.new_companies)
+            products += len(chunk.products)
+            skipped += chunk.skipped
+
+    run.finish(f"Imported data from CSV file: {os.path.basename(run.source)} ({run.done} rows, "
+               f"{new_companies} companies and {products} products added).")
+    return result(False)
+
+
+def _parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS[1:]:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Date {value!r} is not a date (YYYY-MM-DD or DD/MM/YYYY).")
+
+
+def _parse_amount(value, column):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{column} {value!r} is not a number.") from None
+
+
+def _parse_quantity(value):
+    try:
+        quantity = float(value)
+    except ValueError:
+        quantity = None
+    if quantity is None or not quantity.is_integer():
+        raise ValueError(f"Quantity {value!r} is not a whole number.")
+    return int(quantity)
+
+
+class _ProductLookup:
+    """Product ids by the invoiced company and name, falling back to the name
+    alone where only one product has it (as migration 3 linked old lines)."""
+    def __init__(self, session):
+        self.by_company = {}
+        self.by_name = {}
+        for product_id, name, company_id in session.execute(
+                select(Product.id, Product.name, Product.company_id).order_by(Product.id)):
+            self.by_company.setdefault((company_id, name), product_id)
+            self.by_name[name] = None if name in self.by_name else product_id
+
+    def get(self, company_id, name):
+        product_id = self.by_company.get((company_id, name))
+        return product_id if product_id is not None else self.by_name.get(name)
+
+
+def _invoice_chunks(reader, chunk_size):
+    """Lists of (invoice number, [(line number, row)]) holding at least
+    `chunk_size` rows, or the rest of the file. An invoice is never split."""
+    lines = ((reader.line_num, row) for row in reader)
+    chunk = []
+    rows = 0
+    for number, invoice_lines in itertools.groupby(lines, key=lambda line: _field(line[1], "InvoiceNumber")):
+        invoice_lines = list(invoice_lines)
+        chunk.append((number, invoice_lines))
+        rows += len(invoice_lines)
+        if rows >= chunk_size:
+            yield chunk
+            chunk = []
+            rows = 0
+    if chunk:
+        yield chunk
+
+
+class _InvoiceChunk:
+    """Turns a chunk of invoices into insert parameters; an invoice with any
+    bad row is skipped as a whole."""
+    def __init__(self, customers, products, numbers, report):
+        self.customers = customers
+        self.products = products
+        self.numbers = numbers
+        self.report = report
+        self.invoices = []
+        self.items = 0
+        self.duplicates = 0
+
+    def add(self, number, lines):
+        first_line, first = lines[0]
+        if not number:
+            for line, _ in lines:
+                self.report.add(line, "InvoiceNumber is empty.")
+            return
+        if number in self.numbers:
+            self.duplicates += 1
+            self.report.add(first_line, f"Invoice {number} already exists; its {len(lines)} rows were skipped.")
+            return
+
+        errors = []
+        customer_name = _field(first, "CustomerName")
+        customer_id = self.customers.get(customer_name)
+        if customer_id is None:
+            errors.append((first_line, f"No customer named {customer_name!r}."))
+        status = _field(first, "PaymentStatus") or "Pending"
+        if status not in INVOICE_STATUSES:
+            errors.append((first_line, f"PaymentStatus {status!r} is not one of {', '.join(INVOICE_STATUSES)}."))
+        day = total_amount = None
+        try:
+            day = _parse_date(_field(first, "Date"))
+            total = _field(first, "TotalAmount")
+            total_amount = _parse_amount(total, "TotalAmount") if total else None
+        except ValueError as exc:
+            errors.append((first_line, str(exc)))
+
+        items = []
+        for line, row in lines:
+            product_name = _field(row, "ProductName")
+            if not product_name:
+                continue
+            try:
+                quantity = _parse_quantity(_field(row, "Quantity"))
+                price_per_unit = _parse_amount(_field(row, "PricePerUnit"), "PricePerUnit")
+            except ValueError as exc:
+                errors.append((line, str(exc)))
+                continue
+            items.append({"product_id": self.products.get(customer_id, product_name), "product_name": product_name,
+                          "quantity": quantity, "price_per_unit": price_per_unit})
+        if errors:
+            for line, message in errors:
+                self.report.add(line, f"Invoice {number}: {message}")
+            return
+
+        if total_amount is None:
+            total_amount = sum(item["quantity"] * item["price_per_unit"] for item in items)
+        self.numbers.add(number)
+        self.items += len(items)
+        self.invoices.append(({
+            "invoice_number": number, "customer_id": customer_id, "vehicle_number": _field(first, "VehicleNumber"),
+            "date": day, "total_amount": total_amount, "payment_status": status,
+        }, items))
+
+    def write(self, session):
+        if not self.invoices:
+            return
+        # Straight to the tables: the ORM's bulk insert path costs more per row than sqlite3 itself.
+        connection = session.connection()
+        invoice_ids = connection.execute(
+            insert(Invoice.__table__).returning(Invoice.__table__.c.id, sort_by_parameter_order=True),
+            [invoice for invoice, _ in self.invoices],
+        ).scalars().all()
+        item_rows = [dict(item, invoice_id=invoice_id)
+                     for invoice_id, (_, items) in zip(invoice_ids, self.invoices) for item in items]
+        if item_rows:
+            connection.execute(insert(InvoiceItem.__table__), item_rows)
+        sales_summary.record_invoices(session, [
+            (invoice["date"], invoice["customer_id"], invoice["total_amount"], invoice["payment_status"],
+             [(item["product_name"], item["quantity"], item["price_per_unit"]) for item in items])
+            for invoice, items in self.invoices
+        ])
+        reserve_imported_numbers(session, [invoice["invoice_number"] for invoice, _ in self.invoices])
+        record_change(session, "Invoice", None, CREATED)
+
+
+def import_invoices(file_name, chunk_size=DEFAULT_IMPORT_CHUNK_SIZE, progress=None, cancelled=None,
+                    session_factory=None, error_report=None):
+    """Imports invoices with their line items from one CSV file, as exported.
+
+    One row per line item, with the invoice's columns repeated on each (see
+    INVOICE_COLUMNS); an invoice's rows must follow one another. Only the first
+    row's invoice columns are read, TotalAmount defaults to the sum of the
+    lines and PaymentStatus to Pending; a row without ProductName adds no line.
+    Customers must already exist (by exact name). Lines are linked to the
+    customer's product of that name, or to the only product with that name.
+    Stock is left alone: these are past sales.
+
+    Invoices whose number already exists, or with any row that cannot be
+    parsed, are skipped and reported (also to the CSV file `error_report`, if
+    given). Chunks, checkpoints, progress and `cancelled` work as for
+    import_catalogue(). Returns an InvoiceImportResult.
+    """
+    run = _ImportRun(INVOICES, file_name, progress, session_factory)
+    with read_scope(session_factory) as session:
+        customers = dict(session.execute(select(CustomerCompany.name, CustomerCompany.id)).all())
+        products = _ProductLookup(session)
+        numbers = set(session.execute(select(Invoice.invoice_number)).scalars())
+
+    report = ErrorReport(error_report, append=run.resumed_from > 0)
+    invoices = items = duplicates = 0
+
+    def result(cancelled):
+        return InvoiceImportResult(run.rows, invoices, items, duplicates, report.errors, report.count,
+                                   report.written, run.resumed_from, run.elapsed, cancelled)
+
+    with open(run.source, mode="r", encoding="utf-8-sig", newline="") as infile, closing(report):
+        reader = run.reader(infile, ["InvoiceNumber", "CustomerName", "Date"])
+        for chunk_invoices in _invoice_chunks(reader, chunk_size):
+            if cancelled and cancelled.is_set():
+                return result(True)
+            chunk = _InvoiceChunk(customers, products, numbers, report)
+            for number, lines in chunk_invoices:
+                chunk.add(number, lines)
+            run.commit(sum(len(lines) for _, lines in chunk_invoices), chunk.write)
+            report.flush()
+            invoices += len(chunk.invoices)
+            items += chunk.items
+            duplicates += chunk.duplicates
+
+    run.finish(f"Imported invoices from CSV file: {os.path.basename(run.source)} ({run.done} rows, "
+               f"{invoices} invoices with {items} items added).")
+    return result(False)
+
+
+def error_report_path(file_name):
+    """Where the rows an import skipped are listed: next to the file, e.g. invoices_errors.csv."""
+    return f"{os.path.splitext(file_name)[0]}_errors.csv"
+
+
+def main(argv=None):
+    from src.utils.migrations import run_migrations
+    from src.utils.database import engine
+
+    parser = argparse.ArgumentParser(description="Import a CSV file in chunks, resuming an interrupted import.")
+    parser.add_argument("kind", choices=[CATALOGUE, INVOICES], help="what the file holds")
+    parser.add_argument("file", help="the CSV file to import")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    run_migrations(engine)
+    import_file = import_catalogue if args.kind == CATALOGUE else import_invoices
+    try:
+        result = import_file(args.file, args.chunk_size, error_report=error_report_path(args.file))
+    except (CsvImportError, OSError) as exc:
+        parser.exit(1, f"{exc}\n")
+    if result.resumed_from:
+        print(f"Resumed after row {result.resumed_from}.")
+    if args.kind == CATALOGUE:
+        added = f"{result.companies} companies and {result.products} products added"
+    else:
+        added = f"{result.invoices} invoices with {result.items} items added"
+    print(f"Imported {result.rows} rows in {result.elapsed:.1f} s "
+          f"({rows_per_second(result.rows, result.elapsed):.0f} rows/s): {added}.")
+    if result.error_report:
+        print(f"{result.error_count} rows could not be imported; see {result.error_report}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,20 @@
 # src/utils/csv_manager.py
 import csv
 import os
-import re
-from .database import SessionLocal
+from . import csv_import
+from .session_scope import write_scope
 from .helpers import log_action
-from src.models import CustomerCompany, Product, Inventory
-
-from src.models import Invoice, InvoiceItem
+from sqlalchemy import select
+from src.models import CustomerCompany, Invoice, InvoiceItem
 
+# Imports go through src/utils/csv_import.py; open tabs pick up the imported
+# rows from the change events recorded there.
 class CsvManager:
-    def __init__(self, companies_tab, inventory_tab, audit_log_tab, invoice_history_tab):
-        self.companies_tab = companies_tab
-        self.inventory_tab = inventory_tab
-        self.audit_log_tab = audit_log_tab
-        self.invoice_history_tab = invoice_history_tab
-
-    def handle_import_csv(self, file_name, import_type):
+    def handle_import_csv(self, file_name, import_type, progress=None, cancelled=None):
         if import_type == "companies_and_products":
-            return self.import_companies_and_products(file_name)
+            return self.import_companies_and_products(file_name, progress, cancelled)
         elif import_type == "invoices":
-            return self.import_invoices(file_name)
+            return self.import_invoices(file_name, progress, cancelled)
 
     def handle_export_csv(self, file_name, export_type):
         if export_type == "companies_and_products":
@@ -27,54 +22,33 @@ class CsvManager:
         elif export_type == "invoices":
             return self.export_invoices(file_name)
 
-    def import_companies_and_products(self, file_name):
-        try:
-            with SessionLocal() as db_session:
-                companies_cache = {c.name: c for c in db_session.query(CustomerCompany).all()}
-
-                with open(file_name, mode='r', encoding='utf-8-sig') as infile:
-                    reader = csv.DictReader(infile)
-                    for row in reader:
-                        company_name = row.get('CompanyName', '').strip()
-                        if not company_name:
-                            continue
-
-                        company = companies_cache.get(company_name)
-                        if not company:
-                            state_raw = row.get('State', '').strip()
-                            state_name, state_code = self._parse_state(state_raw)
+    def import_companies_and_products(self, file_name, progress=None, cancelled=None):
+        return self._run_import(csv_import.import_catalogue, file_name, progress, cancelled,
+                                lambda result: f"{result.companies} companies and {result.products} products added.")
 
-                            company = CustomerCompany(
-                                name=company_name, address=row.get('Address', '').strip(),
-                                state=state_name, state_code=state_code,
-                                gstin=row.get('GSTIN', '').strip()
-                            )
-                            db_session.add(company)
-                            db_session.flush()
-                            companies_cache[company_name] = company
-
-                        product_name = row.get('ProductName', '').strip()
-                        if product_name:
-                            price_str = row.get('Price', '0').strip()
-                            price = float(price_str) if price_str else 0.0
-                            new_product = Product(name=product_name, price=price, company_id=company.id)
-                            new_inventory = Inventory(stock_quantity=0, product=new_product)
-                            db_session.add(new_product)
-                            db_session.add(new_inventory)
-
-                log_action(db_session, "IMPORT", "System", None, f"Imported data from CSV file: {os.path.basename(file_name)}.")
-                db_session.commit()
-
-            self.companies_tab.load_companies()
-            self.inventory_tab.load_inventory_data()
-            self.audit_log_tab.load_logs()
-            return True, "Data imported successfully!"
+    def _run_import(self, import_file, file_name, progress, cancelled, describe):
+        try:
+            result = import_file(file_name, progress=progress, cancelled=cancelled,
+                                 error_report=csv_import.error_report_path(file_name))
+        except csv_import.CsvImportError as e:
+            return False, str(e)
         except Exception as e:
-            return False, f"An error occurred during import:\n{e}"
-
-    def handle_export_csv(self, file_name):
+            return False, f"An error occurred during import:\n{e}\n\nImporting the same file again continues after the last saved chunk."
+
+        rate = csv_import.rows_per_second(result.rows, result.elapsed)
+        message = f"{result.rows} rows in {result.elapsed:.1f} s ({rate:.0f} rows/s): {describe(result)}"
+        if result.resumed_from:
+            message = f"Continued after row {result.resumed_from}.\n{message}"
+        if result.error_count:
+            lines = "\n".join(f"Line {line}: {error}" for line, error in result.errors[:10])
+            message += f"\n\n{result.error_count} rows could not be imported (all listed in {result.error_report}):\n{lines}"
+        if result.cancelled:
+            return False, f"Import cancelled after {result.resumed_from + result.rows} rows. {message}\n\nImporting the same file again continues from there."
+        return True, f"Data imported successfully!\n{message}"
+
+    def export_companies_and_products(self, file_name):
         try:
-            with SessionLocal() as db_session:
+            with write_scope() as db_session:
                 companies = db_session.query(CustomerCompany).order_by(CustomerCompany.name).all()
                 with open(file_name, mode='w', newline='', encoding='utf-8') as outfile:
                     writer = csv.writer(outfile)
@@ -89,72 +63,35 @@ class CsvManager:
                                 writer.writerow([company.name, company.id, company.address, state_formatted, company.gstin, product.id, product.name, product.price])
 
                 log_action(db_session, "EXPORT", "System", None, f"Exported data to CSV file: {os.path.basename(file_name)}.")
-                db_session.commit()
 
-            self.audit_log_tab.load_logs()
             return True, "Data exported successfully!"
         except Exception as e:
             return False, f"An error occurred during export:\n{e}"
 
-    def import_invoices(self, file_name):
-        try:
-            with SessionLocal() as db_session:
-                with open(file_name, mode='r', encoding='utf-8-sig') as infile:
-                    reader = csv.DictReader(infile)
-                    for row in reader:
-                        # This is a simplified import process. A real-world application
-                        # would need more robust error handling and data validation.
-                        customer = db_session.query(CustomerCompany).filter(CustomerCompany.name == row['CustomerName']).first()
-                        if customer:
-                            invoice = Invoice(
-                                invoice_number=row['InvoiceNumber'],
-                                customer_id=customer.id,
-                                vehicle_number=row['VehicleNumber'],
-                                date=row['Date'],
-                                total_amount=row['TotalAmount']
-                            )
-                            db_session.add(invoice)
-                            db_session.flush()
-
-                            # Assuming items are in a separate file or a more complex format
-                            # For simplicity, we are not importing items here.
-
-                log_action(db_session, "IMPORT", "System", None, f"Imported invoices from CSV file: {os.path.basename(file_name)}.")
-                db_session.commit()
-
-            self.invoice_history_tab.load_invoices()
-            self.audit_log_tab.load_logs()
-            return True, "Invoices imported successfully!"
-        except Exception as e:
-            return False, f"An error occurred during invoice import:\n{e}"
+    def import_invoices(self, file_name, progress=None, cancelled=None):
+        return self._run_import(csv_import.import_invoices, file_name, progress, cancelled,
+                                lambda result: f"{result.invoices} invoices with {result.items} items added.")
 
     def export_invoices(self, file_name):
+        # One row per line item, in the format import_invoices() reads back.
         try:
-            with SessionLocal() as db_session:
-                invoices = db_session.query(Invoice).order_by(Invoice.date.desc()).all()
+            with write_scope() as db_session:
+                rows = db_session.execute(
+                    select(Invoice.invoice_number, CustomerCompany.name, Invoice.date, Invoice.vehicle_number,
+                           Invoice.total_amount, Invoice.payment_status, InvoiceItem.product_name,
+                           InvoiceItem.quantity, InvoiceItem.price_per_unit)
+                    .outerjoin(CustomerCompany, Invoice.customer_id == CustomerCompany.id)
+                    .outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+                    .order_by(Invoice.date.desc(), Invoice.id, InvoiceItem.id)
+                    .execution_options(yield_per=1000)
+                )
                 with open(file_name, mode='w', newline='', encoding='utf-8') as outfile:
                     writer = csv.writer(outfile)
-                    writer.writerow(['InvoiceNumber', 'CustomerName', 'Date', 'VehicleNumber', 'TotalAmount'])
-
-                    for invoice in invoices:
-                        writer.writerow([
-                            invoice.invoice_number,
-                            invoice.customer.name,
-                            invoice.date,
-                            invoice.vehicle_number,
-                            invoice.total_amount
-                        ])
+                    writer.writerow(csv_import.INVOICE_COLUMNS)
+                    writer.writerows(rows)
 
                 log_action(db_session, "EXPORT", "System", None, f"Exported invoices to CSV file: {os.path.basename(file_name)}.")
-                db_session.commit()
 
-            self.audit_log_tab.load_logs()
             return True, "Invoices exported successfully!"
         except Exception as e:
             return False, f"An error occurred during invoice export:\n{e}"
-
-    def _parse_state(self, state_raw):
-        match = re.search(r"(.+?)\s*\(Code:\s*(\d+)\)", state_raw)
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
-        return state_raw, ""
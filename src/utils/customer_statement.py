@@ -0,0 +1,226 @@
+# src/utils/customer_statement.py
+# The data behind a customer statement: opening and closing balances for a
+# date range, and every invoice and payment in it in date order. Invoice
+# amounts are item subtotals (as printed on the invoice before tax); the PDF
+# template adds the tax. Lines and invoices are read in keyset-paginated
+# chunks, so a statement over years of invoices holds one chunk at a time.
+#
+#     python -m src.utils.customer_statement statements/acme-q2.pdf 12 --from-date 2024-04-01 --to-date 2024-06-30
+import argparse
+import datetime
+import heapq
+import os
+import sys
+import tempfile
+from collections import namedtuple
+from sqlalchemy import and_, func, or_, select
+from src.models import CustomerCompany, Invoice, InvoiceItem, Payment
+from src.utils.invoice_documents import DEFAULT_CHUNK_SIZE, iter_invoice_chunks, load_pdf_settings
+from src.utils.lazy_imports import lazy_import
+from src.utils.session_scope import read_scope
+
+pdf = lazy_import("src.utils.pdf_service")
+
+INVOICE = "invoice"
+PAYMENT = "payment"
+
+# `opening_invoiced` and `invoiced` are subtotals, `opening_received` and `received` payments.
+StatementSummary = namedtuple("StatementSummary", [
+    "customer", "date_from", "date_to", "opening_invoiced", "opening_received", "invoiced", "received",
+    "invoice_count", "payment_count",
+])
+# `amount` is the invoice subtotal or the amount paid.
+StatementLine = namedtuple("StatementLine", ["date", "kind", "reference", "details", "amount"])
+
+
+class StatementError(Exception):
+    pass
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _subtotals():
+    return (select(InvoiceItem.invoice_id, func.sum(InvoiceItem.quantity * InvoiceItem.price_per_unit).label("subtotal"))
+            .group_by(InvoiceItem.invoice_id).subquery())
+
+
+def _invoice_conditions(customer_id, date_from=None, date_to=None):
+    conditions = [Invoice.customer_id == customer_id]
+    if date_from:
+        conditions.append(Invoice.date >= date_from)
+    if date_to:
+        conditions.append(Invoice.date <= date_to)
+    return conditions
+
+
+def _payment_conditions(customer_id, date_from=None, date_to=None):
+    conditions = [Invoice.customer_id == customer_id]
+    if date_from:
+        conditions.append(Payment.payment_date >= date_from)
+    if date_to:
+        conditions.append(Payment.payment_date <= date_to)
+    return conditions
+
+
+def _invoice_totals(session, conditions):
+    subtotals = _subtotals()
+    return session.execute(
+        select(func.count(Invoice.id), func.coalesce(func.sum(subtotals.c.subtotal), 0.0))
+        .select_from(Invoice).outerjoin(subtotals, subtotals.c.invoice_id == Invoice.id)
+        .where(*conditions)
+    ).one()
+
+
+def _payment_totals(session, conditions):
+    return session.execute(
+        select(func.count(Payment.id), func.coalesce(func.sum(Payment.amount_paid), 0.0))
+        .select_from(Payment).join(Invoice, Payment.invoice_id == Invoice.id)
+        .where(*conditions)
+    ).one()
+
+
+def statement_summary(session, customer_id, date_from, date_to):
+    """StatementSummary for one customer; raises ValueError for an unknown customer."""
+    customer = session.get(CustomerCompany, customer_id)
+    if customer is None:
+        raise ValueError(f"No customer with id {customer_id}.")
+    before = date_from - datetime.timedelta(days=1)
+    _, opening_invoiced = _invoice_totals(session, _invoice_conditions(customer_id, date_to=before))
+    _, opening_received = _payment_totals(session, _payment_conditions(customer_id, date_to=before))
+    invoice_count, invoiced = _invoice_totals(session, _invoice_conditions(customer_id, date_from, date_to))
+    payment_count, received = _payment_totals(session, _payment_conditions(customer_id, date_from, date_to))
+    return StatementSummary(
+        {"name": customer.name, "address": customer.address or "", "gstin": customer.gstin or "",
+         "state_code": customer.state_code},
+        date_from, date_to, opening_invoiced, opening_received, invoiced, received, invoice_count, payment_count,
+    )
+
+
+def _keyset_rows(session, statement, date_column, id_column, chunk_size):
+    """Rows of `statement` ordered by (date, id), read `chunk_size` at a time."""
+    last = None
+    while True:
+        query = statement
+        if last:
+            query = query.where(or_(date_column > last[0], and_(date_column == last[0], id_column > last[1])))
+        rows = session.execute(query.order_by(date_column, id_column).limit(chunk_size)).all()
+        if not rows:
+            return
+        yield from rows
+        last = (rows[-1][0], rows[-1][1])
+
+
+def _invoice_lines(session, customer_id, date_from, date_to, chunk_size):
+    subtotals = _subtotals()
+    statement = (select(Invoice.date, Invoice.id, Invoice.invoice_number, func.coalesce(subtotals.c.subtotal, 0.0))
+                 .outerjoin(subtotals, subtotals.c.invoice_id == Invoice.id)
+                 .where(*_invoice_conditions(customer_id, date_from, date_to)))
+    for day, _, number, subtotal in _keyset_rows(session, statement, Invoice.date, Invoice.id, chunk_size):
+        yield StatementLine(day, INVOICE, number, "Invoice", subtotal)
+
+
+def _payment_lines(session, customer_id, date_from, date_to, chunk_size):
+    statement = (select(Payment.payment_date, Payment.id, Invoice.invoice_number, Payment.payment_method,
+                        func.coalesce(Payment.amount_paid, 0.0))
+                 .join(Invoice, Payment.invoice_id == Invoice.id)
+                 .where(*_payment_conditions(customer_id, date_from, date_to)))
+    for day, _, number, method, amount in _keyset_rows(session, statement, Payment.payment_date, Payment.id,
+                                                        chunk_size):
+        yield StatementLine(day, PAYMENT, number, f"Payment ({method})" if method else "Payment", amount)
+
+
+def iter_statement_lines(session, customer_id, date_from, date_to, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Invoices and payments in the range as StatementLines, by date (invoices first on a day)."""
+    return heapq.merge(
+        _invoice_lines(session, customer_id, date_from, date_to, chunk_size),
+        _payment_lines(session, customer_id, date_from, date_to, chunk_size),
+        key=lambda line: (line.date, line.kind != INVOICE),
+    )
+
+
+def iter_statement_invoices(session, customer_id, date_from, date_to, chunk_size=DEFAULT_CHUNK_SIZE):
+    """invoice_data dicts for the range, in date order, a chunk at a time."""
+    conditions = _invoice_conditions(customer_id, date_from, date_to)
+    for chunk in iter_invoice_chunks(session, conditions, chunk_size, by_date=True):
+        yield from chunk
+
+
+def statement_file_name(customer_name, date_from, date_to):
+    name = "".join(ch if ch.isalnum() else "_" for ch in customer_name).strip("_") or "customer"
+    return f"statement_{name}_{date_from:%Y%m%d}-{date_to:%Y%m%d}.pdf"
+
+
+def write_statement(output, customer_id, date_from, date_to, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+                    cancelled=None, session_factory=None):
+    """Renders a customer's statement for the range into the file `output`.
+
+    The ledger comes first, then every invoice in the range in full.
+    progress(done, total) is called after each invoice; `cancelled` is checked
+    between invoices and, if set, nothing is written and None is returned.
+    Otherwise returns the StatementSummary.
+    """
+    if date_from > date_to:
+        raise StatementError("The start date is after the end date.")
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    # Built next to the target and renamed at the end, like every other PDF write.
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f, read_scope(session_factory) as session:
+            settings = load_pdf_settings(session)
+            if settings is None:
+                raise StatementError("Please configure your company settings first.")
+            summary = statement_summary(session, customer_id, date_from, date_to)
+
+            def invoices():
+                if progress:
+                    progress(0, summary.invoice_count)
+                for done, invoice in enumerate(iter_statement_invoices(session, customer_id, date_from, date_to,
+                                                                       chunk_size), 1):
+                    if cancelled and cancelled.is_set():
+                        raise _Cancelled()
+                    yield invoice
+                    if progress:
+                        progress(done, summary.invoice_count)
+
+            lines = iter_statement_lines(session, customer_id, date_from, date_to, chunk_size)
+            pdf.PdfService(settings).write_statement(summary, lines, invoices(), f)
+        os.replace(tmp_path, output)
+    except _Cancelled:
+        os.remove(tmp_path)
+        return None
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return summary
+
+
+def _date(value):
+    return datetime.date.fromisoformat(value)
+
+
+def main(argv=None):
+    from src.utils.migrations import run_migrations
+    from src.utils.database import engine
+
+    parser = argparse.ArgumentParser(description="Render a customer's statement of account as one PDF.")
+    parser.add_argument("output", help="the PDF file to write")
+    parser.add_argument("customer_id", type=int)
+    parser.add_argument("--from-date", type=_date, required=True)
+    parser.add_argument("--to-date", type=_date, required=True)
+    args = parser.parse_args(argv)
+
+    run_migrations(engine)
+    try:
+        summary = write_statement(args.output, args.customer_id, args.from_date, args.to_date)
+    except (StatementError, ValueError) as exc:
+        parser.exit(1, f"{exc}\n")
+    print(f"Wrote a statement of {summary.invoice_count} invoices and {summary.payment_count} payments "
+          f"to {args.output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
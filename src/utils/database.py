@@ -1,16 +1,104 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
 # This file is now self-contained. It prepares the database tools.
 
 # Correctly locate the project's root directory
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-DATABASE_PATH = os.path.join(PROJECT_ROOT, "billing_app.db")
+DATABASE_PATH = os.environ.get("BILLING_DB_PATH", os.path.join(PROJECT_ROOT, "billing_app.db"))
+
+# Storage profiles: the pragmas applied to every pooled SQLite connection plus the pool sizing.
+# "desktop" is the default for the GUI, where several tabs read while one of them writes.
+STORAGE_PROFILES = {
+    "desktop": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,       # negative = KiB, i.e. ~16 MB page cache
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,       # ms
+        },
+        "pool_size": 5,
+        "max_overflow": 5,
+        "read_only": False,
+    },
+    "bulk-import": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -128000,
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 30000,
+        },
+        "pool_size": 1,
+        "max_overflow": 0,
+        "read_only": False,
+    },
+    "read-only-reporting": {
+        "pragmas": {
+            "cache_size": -64000,
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 10000,
+            "query_only": "ON",
+        },
+        "pool_size": 8,
+        "max_overflow": 4,
+        "read_only": True,
+    },
+}
+DEFAULT_PROFILE = os.environ.get("BILLING_DB_PROFILE", "desktop")
+
+
+def get_storage_profile(name=None):
+    name = name or DEFAULT_PROFILE
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile '{name}'. Choose one of: {', '.join(STORAGE_PROFILES)}")
+    return STORAGE_PROFILES[name]
+
+
+def _apply_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def create_db_engine(database_path=None, profile=None, echo=False):
+    """Creates a SQLite engine tuned with the given storage profile."""
+    database_path = database_path or DATABASE_PATH
+    settings = get_storage_profile(profile)
+
+    if settings["read_only"]:
+        url = f"sqlite:///file:{database_path}?mode=ro&uri=true"
+    else:
+        url = f"sqlite:///{database_path}"
+
+    busy_timeout = settings["pragmas"].get("busy_timeout", 5000)
+    new_engine = create_engine(
+        url,
+        echo=echo,
+        poolclass=QueuePool,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        # Connections are handed between the GUI and worker threads, never used concurrently.
+        connect_args={"check_same_thread": False, "timeout": busy_timeout / 1000},
+    )
+    event.listen(new_engine, "connect", _apply_pragmas(settings["pragmas"]))
+    return new_engine
+
 
 # Setup the database engine
-engine = create_engine(f'sqlite:///{DATABASE_PATH}')
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create the Base class that all models will inherit from
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
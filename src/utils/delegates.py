@@ -0,0 +1,122 @@
+# src/utils/delegates.py
+# Paint-only item delegates. Cells draw their buttons / combo boxes with the
+# current style instead of owning live widgets, so a row costs nothing beyond
+# its data. A real editor widget only exists while the user is editing a cell.
+from PyQt6.QtWidgets import (QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionComboBox,
+                             QComboBox, QApplication)
+from PyQt6.QtCore import Qt, QEvent, QRect, QSize
+
+
+def _style(option):
+    return option.widget.style() if option.widget else QApplication.style()
+
+
+class ButtonsDelegate(QStyledItemDelegate):
+    """Draws one or more push buttons in a cell and calls `callback(index)` when one is clicked.
+
+    `buttons` is a list of (text, callback) pairs, laid out left to right, or packed
+    against the right edge with `align_right` (e.g. a menu button after the item's text).
+    Clicks outside the buttons get the default handling, so check boxes still toggle.
+    """
+    MARGIN = 4
+    SPACING = 6
+
+    def __init__(self, buttons, parent=None, align_right=False):
+        super().__init__(parent)
+        self.buttons = buttons
+        self.align_right = align_right
+        self._pressed = None  # (row, column, button number) while the mouse is held down
+
+    def _button_rects(self, option):
+        metrics = option.fontMetrics
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        widths = [metrics.horizontalAdvance(text) + 24 for text, _ in self.buttons]
+        x = rect.left()
+        if self.align_right:
+            x = rect.right() + 1 - sum(widths) - self.SPACING * (len(widths) - 1)
+        rects = []
+        for width in widths:
+            rects.append(QRect(x, rect.top(), width, rect.height()))
+            x += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        style = _style(option)
+        for number, (rect, (text, _)) in enumerate(zip(self._button_rects(option), self.buttons)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = text
+            button.fontMetrics = option.fontMetrics
+            button.state = QStyle.StateFlag.State_Enabled
+            if self._pressed == (index.row(), index.column(), number):
+                button.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button.state |= QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        buttons_width = sum(option.fontMetrics.horizontalAdvance(text) + 24 for text, _ in self.buttons)
+        width = size.width() + buttons_width + self.SPACING * (len(self.buttons) - 1) + 2 * self.MARGIN
+        return QSize(width, max(size.height(), option.fontMetrics.height() + 2 * self.MARGIN + 10))
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease)
+                and event.button() == Qt.MouseButton.LeftButton):
+            position = event.position().toPoint()
+            hit = next((n for n, rect in enumerate(self._button_rects(option)) if rect.contains(position)), None)
+            if event.type() == QEvent.Type.MouseButtonPress:
+                self._pressed = (index.row(), index.column(), hit) if hit is not None else None
+                if hit is not None:
+                    return True
+            else:
+                was_pressed = self._pressed
+                self._pressed = None
+                if hit is not None:
+                    if was_pressed == (index.row(), index.column(), hit):
+                        self.buttons[hit][1](index)
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ComboBoxDelegate(QStyledItemDelegate):
+    """Paints the cell's text as a combo box; a QComboBox editor is created only while editing.
+
+    The chosen text is written back with model.setData(index, text, EditRole).
+    """
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self.items = items
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        style = _style(option)
+        combo = QStyleOptionComboBox()
+        combo.rect = option.rect.adjusted(4, 4, -4, -4)
+        combo.currentText = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        combo.fontMetrics = option.fontMetrics
+        combo.state = QStyle.StateFlag.State_Enabled
+        style.drawComplexControl(QStyle.ComplexControl.CC_ComboBox, combo, painter, option.widget)
+        style.drawControl(QStyle.ControlElement.CE_ComboBoxLabel, combo, painter, option.widget)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.items)
+        # Commit as soon as an entry is picked rather than when focus leaves the cell.
+        editor.activated.connect(lambda _: self._commit_and_close(editor))
+        return editor
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.ItemDataRole.DisplayRole) or "")
+
+    def setModelData(self, editor, model, index):
+        if editor.currentText() != index.data(Qt.ItemDataRole.DisplayRole):
+            model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
@@ -1,6 +1,8 @@
 # src/utils/dialogs.py
 from PyQt6.QtWidgets import (QDialog, QGridLayout, QLabel, QLineEdit,
-                             QComboBox, QDialogButtonBox, QDoubleSpinBox, QSpinBox)
+                             QComboBox, QDialogButtonBox, QDoubleSpinBox, QSpinBox,
+                             QDateEdit, QRadioButton, QCheckBox)
+from PyQt6.QtCore import QDate
 from src.utils.theme import DARK_THEME
 from src.utils.constants import INDIAN_STATES
 
@@ -11,11 +13,11 @@ class BaseDialog(QDialog):
         self.setStyleSheet(f"""
             QDialog {{ background-color: {DARK_THEME['bg_surface']}; border: 1px solid {DARK_THEME['border_main']}; font-family: Roboto; }}
             QLabel {{ color: {DARK_THEME['text_secondary']}; font-size: 13px; }}
-            QLineEdit, QComboBox, QDoubleSpinBox, QSpinBox {{
+            QLineEdit, QComboBox, QDoubleSpinBox, QSpinBox, QDateEdit {{
                 background-color: {DARK_THEME['bg_input']}; color: {DARK_THEME['text_primary']};
                 border: 1px solid {DARK_THEME['border_main']}; border-radius: 4px; padding: 8px;
             }}
-            QLineEdit:focus, QComboBox:focus, QDoubleSpinBox:focus, QSpinBox:focus {{ border: 1px solid {DARK_THEME['border_focus']}; }}
+            QLineEdit:focus, QComboBox:focus, QDoubleSpinBox:focus, QSpinBox:focus, QDateEdit:focus {{ border: 1px solid {DARK_THEME['border_focus']}; }}
         """)
 
 class CompanyDialog(BaseDialog):
@@ -95,4 +97,77 @@ class StockAdjustmentDialog(BaseDialog):
         ok_button.setStyleSheet(f"background-color: {DARK_THEME['accent_primary']}; color: {DARK_THEME['text_on_accent']}; border: none; border-radius: 4px; padding: 8px 16px; font-weight: 600;")
         layout.addWidget(buttons, 3, 0, 1, 2)
     def get_data(self):
-        return {"adjustment": self.adjustment_input.value(), "reason": self.reason_input.text().strip()}
\ No newline at end of file
+        return {"adjustment": self.adjustment_input.value(), "reason": self.reason_input.text().strip()}
+
+class InvoiceExportDialog(BaseDialog):
+    """Picks the invoices for a bulk PDF export: a date range or an invoice-number range."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export Invoice PDFs")
+        self.setMinimumWidth(420)
+        layout = QGridLayout(self)
+        layout.setSpacing(15)
+        today = QDate.currentDate()
+        self.by_date = QRadioButton("By date"); self.by_date.setChecked(True)
+        self.by_number = QRadioButton("By invoice number")
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1)); self.date_from.setCalendarPopup(True)
+        self.date_to = QDateEdit(today); self.date_to.setCalendarPopup(True)
+        self.number_from = QLineEdit(); self.number_from.setPlaceholderText("e.g. INV-2425-00001")
+        self.number_to = QLineEdit()
+        layout.addWidget(self.by_date, 0, 0, 1, 2)
+        layout.addWidget(QLabel("From:"), 1, 0); layout.addWidget(self.date_from, 1, 1)
+        layout.addWidget(QLabel("To:"), 2, 0); layout.addWidget(self.date_to, 2, 1)
+        layout.addWidget(self.by_number, 3, 0, 1, 2)
+        layout.addWidget(QLabel("From:"), 4, 0); layout.addWidget(self.number_from, 4, 1)
+        layout.addWidget(QLabel("To:"), 5, 0); layout.addWidget(self.number_to, 5, 1)
+        self.as_zip = QCheckBox("Save as one ZIP file")
+        layout.addWidget(self.as_zip, 6, 0, 1, 2)
+        self.by_date.toggled.connect(self.update_enabled)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        self.ok_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        self.ok_button.setStyleSheet(f"background-color: {DARK_THEME['accent_primary']}; color: {DARK_THEME['text_on_accent']}; border: none; border-radius: 4px; padding: 8px 16px; font-weight: 600;")
+        self.as_zip.toggled.connect(self.update_enabled)
+        self.update_enabled()
+        layout.addWidget(buttons, 7, 0, 1, 2)
+    def update_enabled(self):
+        for widget in (self.date_from, self.date_to):
+            widget.setEnabled(self.by_date.isChecked())
+        for widget in (self.number_from, self.number_to):
+            widget.setEnabled(not self.by_date.isChecked())
+        self.ok_button.setText("Choose File && Export" if self.as_zip.isChecked() else "Choose Folder && Export")
+    def get_data(self):
+        """Keyword arguments for bulk_pdf_export.export_invoices."""
+        if self.by_date.isChecked():
+            return {"date_from": self.date_from.date().toPyDate(), "date_to": self.date_to.date().toPyDate()}
+        return {"number_from": self.number_from.text().strip() or None, "number_to": self.number_to.text().strip() or None}
+
+class StatementDialog(BaseDialog):
+    """Picks the customer and date range (the current quarter by default) for a statement of account."""
+    def __init__(self, customers, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Customer Statement")
+        self.setMinimumWidth(420)
+        layout = QGridLayout(self)
+        layout.setSpacing(15)
+        today = QDate.currentDate()
+        self.customer = QComboBox()
+        for customer_id, name in customers:
+            self.customer.addItem(name, customer_id)
+        quarter_start = QDate(today.year(), 3 * ((today.month() - 1) // 3) + 1, 1)
+        self.date_from = QDateEdit(quarter_start); self.date_from.setCalendarPopup(True)
+        self.date_to = QDateEdit(quarter_start.addMonths(3).addDays(-1)); self.date_to.setCalendarPopup(True)
+        layout.addWidget(QLabel("Customer:"), 0, 0); layout.addWidget(self.customer, 0, 1)
+        layout.addWidget(QLabel("From:"), 1, 0); layout.addWidget(self.date_from, 1, 1)
+        layout.addWidget(QLabel("To:"), 2, 0); layout.addWidget(self.date_to, 2, 1)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        ok_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        ok_button.setText("Choose File && Create")
+        ok_button.setStyleSheet(f"background-color: {DARK_THEME['accent_primary']}; color: {DARK_THEME['text_on_accent']}; border: none; border-radius: 4px; padding: 8px 16px; font-weight: 600;")
+        ok_button.setEnabled(self.customer.count() > 0)
+        layout.addWidget(buttons, 3, 0, 1, 2)
+    def get_data(self):
+        """Keyword arguments for customer_statement.write_statement."""
+        return {"customer_id": self.customer.currentData(), "date_from": self.date_from.date().toPyDate(),
+                "date_to": self.date_to.date().toPyDate()}
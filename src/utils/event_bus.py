@@ -0,0 +1,122 @@
+# src/utils/event_bus.py
+# Domain change events. Writers call record_change() inside their write scope;
+# the events are published only after that session commits (and dropped on
+# rollback), then delivered to the tabs in one coalesced ChangeBatch per burst,
+# so an import that touches 50,000 rows still causes a single refresh.
+from collections import namedtuple
+from PyQt6.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal, pyqtSlot
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# entity_type uses the audit log names ("Company", "Product", "Inventory", "Invoice", "AuditLog").
+# entity_id is None when the change cannot be pinned to single rows.
+ChangeEvent = namedtuple("ChangeEvent", ["entity_type", "entity_id", "kind"])
+
+_PENDING_KEY = "pending_change_events"
+
+
+class ChangeBatch:
+    """The coalesced changes of one burst, at most one kind per entity."""
+    def __init__(self, events=()):
+        self._kinds = {}
+        for change in events:
+            self.add(change)
+
+    def add(self, change):
+        key = (change.entity_type, change.entity_id)
+        previous = self._kinds.get(key)
+        if change.kind == DELETED or previous is None:
+            self._kinds[key] = change.kind
+        elif previous == CREATED:
+            pass  # created then updated is still a new row
+
+    def __bool__(self):
+        return bool(self._kinds)
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def __iter__(self):
+        return (ChangeEvent(entity_type, entity_id, kind) for (entity_type, entity_id), kind in self._kinds.items())
+
+    def affects(self, *entity_types):
+        return any(entity_type in entity_types for entity_type, _ in self._kinds)
+
+    def ids(self, *entity_types, kinds=None):
+        """Ids changed for the given types, optionally only for some kinds. Unknown (None) ids are left out."""
+        return {entity_id for (entity_type, entity_id), kind in self._kinds.items()
+                if entity_type in entity_types and entity_id is not None and (kinds is None or kind in kinds)}
+
+    def has_unknown(self, *entity_types):
+        """True if some change of these types could not be pinned to ids, so a reload is needed."""
+        return any(entity_type in entity_types and entity_id is None for entity_type, entity_id in self._kinds)
+
+
+class EventBus(QObject):
+    """Publishes ChangeBatches on the thread the bus lives in (the GUI thread)."""
+    changed = pyqtSignal(object)
+    _posted = pyqtSignal(object)
+
+    def __init__(self, coalesce_ms=0, parent=None):
+        super().__init__(parent)
+        self._batch = ChangeBatch()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(coalesce_ms)
+        self._timer.timeout.connect(self.flush)
+        # Queued when published from a worker thread.
+        self._posted.connect(self._enqueue)
+
+    def publish(self, events):
+        events = list(events)
+        # Without an application there is no one listening and no event loop to deliver on.
+        if events and QCoreApplication.instance() is not None:
+            self._posted.emit(events)
+
+    @pyqtSlot(object)
+    def _enqueue(self, events):
+        for change in events:
+            self._batch.add(change)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        batch, self._batch = self._batch, ChangeBatch()
+        self._timer.stop()
+        if batch:
+            self.changed.emit(batch)
+
+
+event_bus = EventBus()
+
+
+def record_change(session, entity_type, entity, kind):
+    """Queues a change to publish once `session` commits.
+
+    `entity` is an id or a mapped object; objects are resolved to their primary
+    key at commit time, so new rows do not need a flush first.
+    """
+    session.info.setdefault(_PENDING_KEY, []).append((entity_type, entity, kind))
+
+
+def _entity_id(entity):
+    if entity is None or isinstance(entity, int):
+        return entity
+    identity = inspect(entity).identity
+    return identity[0] if identity else None
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        event_bus.publish(ChangeEvent(entity_type, _entity_id(entity), kind) for entity_type, entity, kind in pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
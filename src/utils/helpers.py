@@ -1,5 +1,6 @@
 # src/utils/helpers.py
 from src.models import AuditLog
+from src.utils.event_bus import record_change, CREATED
 
 def log_action(db_session, action, entity_type, entity_id, details):
     """A centralized function to create an audit log entry. Note: does not commit."""
@@ -9,4 +10,5 @@ def log_action(db_session, action, entity_type, entity_id, details):
         entity_id=entity_id,
         details=details
     )
-    db_session.add(log_entry)
\ No newline at end of file
+    db_session.add(log_entry)
+    record_change(db_session, "AuditLog", log_entry, CREATED)
\ No newline at end of file
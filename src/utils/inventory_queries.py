@@ -0,0 +1,46 @@
+# src/utils/inventory_queries.py
+# Set-based queries behind the Inventory tab. Counts and stock filters are
+# evaluated by SQLite in one pass instead of loading every product in Python.
+from sqlalchemy import func, case, and_
+from src.models import CustomerCompany, Product, Inventory
+
+DEFAULT_LOW_STOCK_THRESHOLD = 10
+
+# Products without an inventory row count as zero stock with the default threshold.
+stock_quantity = func.coalesce(Inventory.stock_quantity, 0)
+low_stock_threshold = func.coalesce(Inventory.low_stock_threshold, DEFAULT_LOW_STOCK_THRESHOLD)
+is_low_stock = and_(stock_quantity > 0, stock_quantity <= low_stock_threshold)
+is_out_of_stock = stock_quantity == 0
+
+STOCK_FILTERS = {
+    "All Stock": None,
+    "Low Stock": is_low_stock,
+    "Out of Stock": is_out_of_stock,
+}
+
+
+def inventory_stats(session):
+    """Returns (total_products, low_stock_count, out_of_stock_count) from a single aggregate query."""
+    total, low, out = session.query(
+        func.count(Product.id),
+        func.coalesce(func.sum(case((is_low_stock, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((is_out_of_stock, 1), else_=0)), 0),
+    ).select_from(Product).outerjoin(Product.inventory).one()
+    return total, low, out
+
+
+def inventory_rows_query(session, search_text="", stock_filter="All Stock"):
+    """Query yielding InventoryRow-shaped tuples for the given search text and stock filter."""
+    query = session.query(
+        Product.id, Product.name, CustomerCompany.name, stock_quantity, low_stock_threshold, Product.price
+    ).select_from(Product).outerjoin(Product.company).outerjoin(Product.inventory)
+
+    if search_text:
+        pattern = f"%{search_text}%"
+        query = query.filter(Product.name.ilike(pattern) | CustomerCompany.name.ilike(pattern))
+
+    condition = STOCK_FILTERS.get(stock_filter)
+    if condition is not None:
+        query = query.filter(condition)
+
+    return query.order_by(Product.name)
@@ -0,0 +1,109 @@
+# src/utils/invoice_documents.py
+# Plain-data views of invoices and settings for the PDF code. Everything here
+# is built from dicts, tuples and strings, so it can be handed to worker
+# processes and hashed, and it imports neither Qt nor reportlab.
+from collections import namedtuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+from src.models import Invoice, UserSettings
+
+# The UserSettings fields that appear on a PDF. None becomes "" so templates can draw them as-is.
+PdfSettings = namedtuple("PdfSettings", [
+    "company_name", "address", "state_code", "gstin", "pan_number", "mobile_number",
+    "email", "upi_id", "tagline", "logo_filepath", "chosen_template",
+])
+
+DEFAULT_CHUNK_SIZE = 200
+# Names of the layouts in src.utils.invoice_template, listed here so the settings
+# screen can offer them without importing reportlab (a test checks they match).
+TEMPLATE_NAMES = ("Modern", "Classic")
+DEFAULT_TEMPLATE = "Modern"
+
+
+def pdf_settings(settings):
+    """PdfSettings from a UserSettings row (or anything with the same attributes)."""
+    if isinstance(settings, PdfSettings):
+        return settings
+    values = {field: getattr(settings, field, None) or "" for field in PdfSettings._fields}
+    values["chosen_template"] = values["chosen_template"] or DEFAULT_TEMPLATE
+    return PdfSettings(**values)
+
+
+def pdf_file_name(invoice_data):
+    # Invoice numbers are generated, but imported ones may contain path separators.
+    number = str(invoice_data['invoice_number']).replace("/", "-").replace("\\", "-")
+    return f"invoice_{number}.pdf"
+
+
+def load_pdf_settings(session):
+    settings = session.query(UserSettings).first()
+    return pdf_settings(settings) if settings else None
+
+
+def invoice_data(invoice):
+    """The dict InvoiceTemplate draws, from an Invoice with its customer and items."""
+    customer = invoice.customer
+    return {
+        "invoice_number": invoice.invoice_number,
+        "date": invoice.date.strftime("%Y-%m-%d"),
+        "vehicle_number": invoice.vehicle_number or "",
+        "customer": {
+            "name": customer.name if customer else "",
+            "address": (customer.address if customer else "") or "",
+            "gstin": (customer.gstin if customer else "") or "",
+            "state_code": customer.state_code if customer else None,
+        },
+        "items": [
+            {"product_name": item.product_name, "quantity": item.quantity, "price_per_unit": item.price_per_unit}
+            for item in invoice.items
+        ],
+    }
+
+
+def invoice_filter(session, date_from=None, date_to=None, number_from=None, number_to=None):
+    """Conditions selecting invoices by date range and/or invoice-number range.
+
+    Invoice numbers are matched by position in the invoice sequence (their ids),
+    so 'INV-2425-00009' to 'INV-2425-00012' includes everything saved in between.
+    Raises ValueError for an unknown invoice number.
+    """
+    conditions = []
+    if date_from:
+        conditions.append(Invoice.date >= date_from)
+    if date_to:
+        conditions.append(Invoice.date <= date_to)
+    for number, compare in ((number_from, Invoice.id.__ge__), (number_to, Invoice.id.__le__)):
+        if number:
+            invoice_id = session.query(Invoice.id).filter(Invoice.invoice_number == number).scalar()
+            if invoice_id is None:
+                raise ValueError(f"No invoice numbered '{number}'.")
+            conditions.append(compare(invoice_id))
+    return conditions
+
+
+def iter_invoice_chunks(session, conditions=(), chunk_size=DEFAULT_CHUNK_SIZE, by_date=False):
+    """Yields lists of invoice_data dicts in id order (or date, then id), `chunk_size` invoices per query.
+
+    Customers and items are loaded with each chunk (two extra queries, not one per
+    invoice), and the session is cleared between chunks so memory stays flat.
+    """
+    last = None
+    while True:
+        query = (session.query(Invoice)
+                 .options(joinedload(Invoice.customer), selectinload(Invoice.items))
+                 .filter(*conditions))
+        if by_date:
+            if last:
+                query = query.filter(or_(Invoice.date > last.date, and_(Invoice.date == last.date, Invoice.id > last.id)))
+            query = query.order_by(Invoice.date, Invoice.id)
+        else:
+            if last:
+                query = query.filter(Invoice.id > last.id)
+            query = query.order_by(Invoice.id)
+        invoices = query.limit(chunk_size).all()
+        if not invoices:
+            return
+        last = invoices[-1]
+        chunk = [invoice_data(invoice) for invoice in invoices]
+        session.expunge_all()
+        yield chunk
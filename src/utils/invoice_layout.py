@@ -0,0 +1,109 @@
+# src/utils/invoice_layout.py
+# Line-item tables that run over as many pages as needed. Rows have a fixed
+# height, so how many fit on a page is plain arithmetic: paginate() plans the
+# pages from the row count alone (which is what makes "page x of y" possible
+# before anything is drawn), and each page then builds an ItemRows flowable for
+# its own rows only.
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable
+from src.utils import pdf_fonts
+
+ROW_HEIGHT = 18
+FONT_SIZE = 10
+CELL_PADDING = 6
+
+
+def paginate(count, first_capacity, capacity, reserved_rows):
+    """Plans `count` rows over pages; returns [(start, end)] per page.
+
+    first_capacity/capacity are the rows that fit under the column header on
+    the first/later pages. Later pages give one row to "brought forward", all
+    but the last give one to "carried forward", and the last keeps
+    `reserved_rows` free (for the totals).
+    """
+    pages, start, page_capacity = [], 0, first_capacity
+    while True:
+        remaining = count - start
+        if remaining <= page_capacity - reserved_rows:
+            pages.append((start, count))
+            return pages
+        # Leave at least one row for the last page, so the totals never stand alone.
+        take = max(1, min(page_capacity - 1, remaining - 1))
+        pages.append((start, start + take))
+        start += take
+        page_capacity = capacity - 1
+
+
+def fit_text(text, font, size, width):
+    """`text`, shortened with an ellipsis if it is wider than `width`."""
+    full_width = stringWidth(text, font, size)
+    if full_width <= width:
+        return text
+    # Start from a proportional guess so long names take a few measurements, not one per character.
+    text = text[:int(len(text) * width / full_width)]
+    while text and stringWidth(text + "…", font, size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+class ItemRows(Flowable):
+    """A column header and a page's rows, in the invoice table style.
+
+    `columns` is [(title, width)]; `rows` holds tuples of strings, and the rows
+    whose index is in `bold_rows` (brought/carried forward) are set in bold.
+    All text goes into one text object rather than one per cell. The fonts
+    must already be registered (see pdf_fonts).
+    """
+    body_font = pdf_fonts.REGULAR
+    header_font = pdf_fonts.BOLD
+
+    def __init__(self, columns, rows, bold_rows=(), body_font=None, header_font=None):
+        super().__init__()
+        self.columns = columns
+        self.rows = rows
+        self.bold_rows = set(bold_rows)
+        self.body_font = body_font or self.body_font
+        self.header_font = header_font or self.header_font
+        self.width = sum(width for _, width in columns)
+        self.height = ROW_HEIGHT * (len(rows) + 1)
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        c = self.canv
+        header_y = self.height - ROW_HEIGHT
+        c.setFillColor(colors.grey)
+        c.rect(0, header_y, self.width, ROW_HEIGHT, stroke=0, fill=1)
+        c.setFillColor(colors.beige)
+        c.rect(0, 0, self.width, header_y, stroke=0, fill=1)
+
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1)
+        xs = [0]
+        for _, width in self.columns:
+            xs.append(xs[-1] + width)
+        c.grid(xs, [self.height - ROW_HEIGHT * i for i in range(len(self.rows) + 2)])
+
+        text = c.beginText()
+        text.setFillColor(colors.whitesmoke)
+        self._draw_row(text, [title for title, _ in self.columns], header_y, self.header_font)
+        text.setFillColor(colors.black)
+        for index, row in enumerate(self.rows):
+            font = self.header_font if index in self.bold_rows else self.body_font
+            self._draw_row(text, row, header_y - ROW_HEIGHT * (index + 1), font)
+        c.drawText(text)
+
+    def _draw_row(self, text, cells, y, font):
+        text.setFont(font, FONT_SIZE)
+        x = 0
+        for (_, width), cell in zip(self.columns, cells):
+            if cell:
+                cell_width = stringWidth(cell, font, FONT_SIZE)
+                if cell_width > width - 2 * CELL_PADDING:
+                    cell = fit_text(cell, font, FONT_SIZE, width - 2 * CELL_PADDING)
+                    cell_width = stringWidth(cell, font, FONT_SIZE)
+                text.setTextOrigin(x + (width - cell_width) / 2, y + 5)
+                text.textOut(cell)
+            x += width
@@ -1,24 +1,86 @@
 # src/utils/invoice_number_service.py
-import os
-import json
+import datetime
+from sqlalchemy import update, func, select, cast, Integer, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import Invoice, InvoiceSequence
 
 class InvoiceNumberService:
-    def __init__(self, storage_file="invoice_counter.json"):
-        self.storage_file = storage_file
-        self.counter = self._load_counter()
-
-    def _load_counter(self):
-        if os.path.exists(self.storage_file):
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"counter": 0}
-
-    def _save_counter(self):
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.counter, f)
-
-    def get_next_invoice_number(self):
-        self.counter['counter'] += 1
-        self._save_counter()
-        return f"INV-{self.counter['counter']:05d}"
+    """Allocates invoice numbers from the invoice_sequences table.
+
+    Numbers are taken inside the caller's transaction, so they commit or roll
+    back together with the invoice that uses them. The counter UPDATE takes the
+    SQLite write lock, which serialises concurrent allocators (other windows or
+    processes) without duplicates.
+    """
+    def __init__(self, prefix="INV", width=5, per_fiscal_year=False):
+        self.prefix = prefix
+        self.width = width
+        self.per_fiscal_year = per_fiscal_year
+
+    def series_for(self, date=None):
+        if not self.per_fiscal_year:
+            return self.prefix
+        date = date or datetime.date.today()
+        # Indian fiscal year: April to March, e.g. 2024-04-01 .. 2025-03-31 -> 'INV-2425'.
+        start_year = date.year if date.month >= 4 else date.year - 1
+        return f"{self.prefix}-{start_year % 100:02d}{(start_year + 1) % 100:02d}"
+
+    def format_number(self, series, value):
+        return f"{series}-{value:0{self.width}d}"
+
+    def _increment(self, session, series, count):
+        return session.execute(
+            update(InvoiceSequence)
+            .where(InvoiceSequence.series == series)
+            .values(last_value=InvoiceSequence.last_value + count)
+            .returning(InvoiceSequence.last_value)
+        ).scalar()
+
+    def _create_series(self, session, series):
+        # Start after the highest number already issued in this series, e.g. by the
+        # old invoice_counter.json allocator or an invoice import.
+        # Only the prefix followed by digits: 'INV-2425-00042' is not in the 'INV' series.
+        prefix = f"{series}-"
+        value = func.substr(Invoice.invoice_number, len(prefix) + 1)
+        highest = select(func.coalesce(func.max(cast(value, Integer)), 0)).where(
+            func.substr(Invoice.invoice_number, 1, len(prefix)) == prefix,
+            value != "",
+            ~value.op("GLOB")("*[^0-9]*"),
+        ).scalar_subquery()
+        session.execute(
+            sqlite_insert(InvoiceSequence)
+            .values(series=series, last_value=highest)
+            .on_conflict_do_nothing(index_elements=["series"])
+        )
+
+    def allocate_block(self, session, count, date=None):
+        """Reserves `count` consecutive numbers with a single UPDATE and returns them formatted."""
+        series = self.series_for(date)
+        last = self._increment(session, series, count)
+        if last is None:
+            self._create_series(session, series)
+            last = self._increment(session, series, count)
+        return [self.format_number(series, value) for value in range(last - count + 1, last + 1)]
+
+    def get_next_invoice_number(self, session, date=None):
+        return self.allocate_block(session, 1, date)[0]
+
+
+def reserve_imported_numbers(session, invoice_numbers):
+    """Moves each existing counter past the imported numbers of its series.
+
+    A series created later starts after the highest number on record anyway,
+    but one already in use would otherwise hand the imported numbers out again.
+    """
+    highest = {}
+    for number in invoice_numbers:
+        series, _, value = number.rpartition("-")
+        if series and value.isdigit():
+            highest[series] = max(highest.get(series, 0), int(value))
+    if highest:
+        session.connection().execute(
+            update(InvoiceSequence)
+            .where(InvoiceSequence.series == bindparam("series_name"))
+            .values(last_value=func.max(InvoiceSequence.last_value, bindparam("highest"))),
+            [{"series_name": series, "highest": value} for series, value in highest.items()],
+        )
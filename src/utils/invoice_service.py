@@ -0,0 +1,79 @@
+# src/utils/invoice_service.py
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from src.models import Invoice, InvoiceItem, Product, InventoryHistory
+from src.utils import sales_summary
+from src.utils.event_bus import record_change, CREATED, UPDATED
+
+
+class InsufficientStockError(Exception):
+    pass
+
+
+class InvoiceService:
+    def __init__(self, invoice_number_service):
+        self.invoice_number_service = invoice_number_service
+
+    def save_invoice(self, session, invoice_data):
+        """Adds the invoice, its items and the stock movements to the session. Does not commit.
+
+        Products are resolved by id in a single IN query and all lines are written
+        with executemany, so the number of round trips does not grow with the number of lines.
+        """
+        invoice_number = self.invoice_number_service.get_next_invoice_number(session, invoice_data['date'])
+        new_invoice = Invoice(
+            invoice_number=invoice_number,
+            customer_id=invoice_data['customer_id'],
+            vehicle_number=invoice_data['vehicle_number'],
+            date=invoice_data['date'],
+            total_amount=invoice_data['total_amount']
+        )
+        session.add(new_invoice)
+        session.flush()
+
+        product_ids = {item['product_id'] for item in invoice_data['items'] if item.get('product_id')}
+        products = {
+            p.id: p for p in session.query(Product)
+            .options(joinedload(Product.inventory))
+            .filter(Product.id.in_(product_ids))
+        } if product_ids else {}
+
+        item_rows = []
+        history_rows = []
+        for item in invoice_data['items']:
+            product = products.get(item.get('product_id'))
+            if product and product.inventory:
+                if product.inventory.stock_quantity < item['quantity']:
+                    raise InsufficientStockError(product.name)
+                product.inventory.stock_quantity -= item['quantity']
+                history_rows.append({
+                    "product_id": product.id,
+                    "change_quantity": -item['quantity'],
+                    "reason": f"Invoice {invoice_number}",
+                    "new_quantity": product.inventory.stock_quantity
+                })
+
+            item_rows.append({
+                "invoice_id": new_invoice.id,
+                "product_id": product.id if product else None,
+                "product_name": item['product_name'],
+                "quantity": item['quantity'],
+                "price_per_unit": item['price_per_unit']
+            })
+
+        # Plain executemany inserts; the ORM would insert row by row to fetch primary keys.
+        if item_rows:
+            session.execute(insert(InvoiceItem), item_rows)
+        if history_rows:
+            session.execute(insert(InventoryHistory), history_rows)
+        sales_summary.record_invoice(
+            session, new_invoice.date, new_invoice.customer_id, new_invoice.total_amount,
+            new_invoice.payment_status or "Pending",
+            [(row["product_name"], row["quantity"], row["price_per_unit"]) for row in item_rows]
+        )
+        record_change(session, "Invoice", new_invoice, CREATED)
+        for row in history_rows:
+            record_change(session, "Inventory", row["product_id"], UPDATED)
+        # Writes every touched inventory row in one batched UPDATE.
+        session.flush()
+        return new_invoice
@@ -1,71 +1,195 @@
 # src/utils/invoice_template.py
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, Table, TableStyle
-from reportlab.lib import colors
+# Invoice layouts, looked up by UserSettings.chosen_template.
+#
+# Everything that depends only on the settings (seller block, tagline, field
+# labels) is in a template's static layers: "static" for the first page and
+# "continued" for the pages after it. Each layer is drawn into a form XObject
+# the first time a document needs it and placed with doForm on every page
+# after that; only the invoice's own values are drawn per invoice.
+#
+# All text is set in the bundled Roboto fonts (see pdf_fonts), which have
+# the rupee sign: most of it, settings included, is typed in by the user.
+#
+# Line items run over as many pages as they need (see invoice_layout); the
+# totals follow the last row.
+#
+# A template also draws customer statements (see customer_statement): a ledger
+# on the "continued" letterhead, followed by the statement's invoices in full.
+from functools import lru_cache
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from src.utils import pdf_fonts
+from src.utils.invoice_documents import DEFAULT_TEMPLATE
+from src.utils.invoice_layout import ROW_HEIGHT, ItemRows, paginate
 
+TEMPLATES = {}
+
+
+def register_template(cls):
+    TEMPLATES[cls.name] = cls
+    return cls
+
+
+def template_for(name):
+    """The template class registered as `name`, or the default one."""
+    return TEMPLATES.get(name) or TEMPLATES[DEFAULT_TEMPLATE]
+
+
+@lru_cache(maxsize=32)
+def value_positions(template_cls):
+    """Where the value after each of a template's static labels starts: {label: (x, y)}."""
+    return {text: (x + stringWidth(text, font, 12), y) for x, y, text, font in template_cls.labels}
+
+
+@register_template
 class InvoiceTemplate:
+    name = "Modern"
+    regular_font = pdf_fonts.REGULAR
+    bold_font = pdf_fonts.BOLD
+    columns = (("#", 30), ("Product", 250), ("Quantity", 70), ("Price", 70), ("Total", 80))
+    table_x = 50
+    # Where the item table starts on the first and on later pages, and where it must end.
+    table_top = 585
+    continued_top = 635
+    table_bottom = 120
+    # Room kept under the last row for the totals: a gap and four 20pt lines.
+    summary_height = 100
+    # (x, y, text, font) of the static labels; per-invoice values are drawn after them.
+    statement_columns = (("Date", 65), ("Reference", 115), ("Details", 120), ("Debit", 65), ("Credit", 65),
+                         ("Balance", 70))
+    # Room the statement title, customer and balance summary take above the ledger.
+    statement_heading_height = 105
+    labels = (
+        (350, 750, "Bill To:", pdf_fonts.BOLD),
+        (350, 700, "GSTIN: ", pdf_fonts.REGULAR),
+        (50, 630, "Invoice Number: ", pdf_fonts.BOLD),
+        (50, 615, "Invoice Date: ", pdf_fonts.BOLD),
+        (50, 600, "Vehicle Number: ", pdf_fonts.BOLD),
+    )
+
     def __init__(self, canvas, width, height, settings):
         self.c = canvas
         self.width = width
         self.height = height
         self.settings = settings
 
+    def form_name(self, layer):
+        return f"Invoice{layer.title()}{self.name}"
+
     def draw_invoice(self, invoice_data):
-        self.draw_header()
+        self.register_fonts()
+        self.place_static()
         self.draw_customer_info(invoice_data)
         self.draw_invoice_details(invoice_data)
-        self.draw_items_table(invoice_data)
-        self.draw_summary(invoice_data)
+        subtotal, table_end = self.draw_items(invoice_data)
+        self.draw_summary(invoice_data, subtotal, table_end - 32)
+
+    def register_fonts(self):
+        pdf_fonts.register_fonts()
+
+    def place_static(self, layer="static"):
+        """Draws a static layer, defining its form on first use in this document."""
+        name = self.form_name(layer)
+        if not self.c.hasForm(name):
+            self.c.beginForm(name)
+            getattr(self, f"draw_{layer}")()
+            self.c.endForm()
+        self.c.doForm(name)
+
+    def draw_static(self):
+        self.draw_header()
+        self.draw_labels()
+        self.draw_footer()
+
+    def draw_continued(self):
+        self.draw_header()
         self.draw_footer()
 
     def draw_header(self):
-        self.c.setFont("Helvetica-Bold", 24)
+        self.c.setFont(self.bold_font, 24)
         self.c.drawString(50, 750, self.settings.company_name)
-        self.c.setFont("Helvetica", 12)
+        self.c.setFont(self.regular_font, 12)
         self.c.drawString(50, 730, self.settings.address)
         self.c.drawString(50, 715, f"GSTIN: {self.settings.gstin}")
         self.c.drawString(50, 700, f"PAN: {self.settings.pan_number}")
         self.c.drawString(50, 685, f"Email: {self.settings.email}")
         self.c.drawString(50, 670, f"UPI ID: {self.settings.upi_id}")
 
+    def draw_labels(self):
+        current = None
+        for x, y, text, font in self.labels:
+            if font != current:
+                self.c.setFont(font, 12)
+                current = font
+            self.c.drawString(x, y, text)
+
+    def label(self, text):
+        return next(entry for entry in self.labels if entry[2] == text)
+
+    def draw_value(self, label, value, font=None, size=12):
+        """Draws `value` right after one of the static labels."""
+        x, y = value_positions(type(self))[label]
+        self.c.setFont(font or self.regular_font, size)
+        self.c.drawString(x, y, str(value))
+
     def draw_customer_info(self, invoice_data):
-        self.c.setFont("Helvetica-Bold", 12)
-        self.c.drawString(350, 750, "Bill To:")
-        self.c.setFont("Helvetica", 12)
-        self.c.drawString(350, 730, invoice_data['customer']['name'])
-        self.c.drawString(350, 715, invoice_data['customer']['address'])
-        self.c.drawString(350, 700, f"GSTIN: {invoice_data['customer']['gstin']}")
+        x, y = self.label("Bill To:")[:2]
+        self.c.setFont(self.regular_font, 12)
+        self.c.drawString(x, y - 20, invoice_data['customer']['name'])
+        self.c.drawString(x, y - 35, invoice_data['customer']['address'])
+        self.draw_value("GSTIN: ", invoice_data['customer']['gstin'])
 
     def draw_invoice_details(self, invoice_data):
-        self.c.setFont("Helvetica-Bold", 12)
-        self.c.drawString(50, 630, f"Invoice Number: {invoice_data['invoice_number']}")
-        self.c.drawString(50, 615, f"Invoice Date: {invoice_data['date']}")
-        self.c.drawString(50, 600, f"Vehicle Number: {invoice_data['vehicle_number']}")
-
-    def draw_items_table(self, invoice_data):
-        table_data = [["#", "Product", "Quantity", "Price", "Total"]]
-        for i, item in enumerate(invoice_data['items']):
-            table_data.append([
-                str(i + 1),
-                item['product_name'],
-                str(item['quantity']),
-                f"₹{item['price_per_unit']:.2f}",
-                f"₹{item['quantity'] * item['price_per_unit']:.2f}"
-            ])
-
-        table = Table(table_data, colWidths=[30, 250, 70, 70, 80])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        table.wrapOn(self.c, self.width, self.height)
-        table.drawOn(self.c, 50, 450)
+        self.draw_value("Invoice Number: ", invoice_data['invoice_number'], self.bold_font)
+        self.draw_value("Invoice Date: ", invoice_data['date'], self.bold_font)
+        self.draw_value("Vehicle Number: ", invoice_data['vehicle_number'], self.bold_font)
+
+    def rows_fitting(self, top):
+        # Rows below the column header between `top` and table_bottom.
+        return int((top - self.table_bottom) // ROW_HEIGHT) - 1
+
+    def draw_items(self, invoice_data):
+        """Draws the line items over as many pages as needed.
+
+        Returns (subtotal, y) with y the bottom of the last page's table.
+        """
+        items = invoice_data['items']
+        reserved = -(-self.summary_height // ROW_HEIGHT)
+        pages = paginate(len(items), self.rows_fitting(self.table_top), self.rows_fitting(self.continued_top), reserved)
+        subtotal = 0.0
+        for number, (start, end) in enumerate(pages, 1):
+            top = self.table_top
+            rows, bold_rows = [], []
+            if number > 1:
+                self.c.showPage()
+                self.place_static("continued")
+                self.draw_continued_heading(invoice_data)
+                top = self.continued_top
+                bold_rows.append(len(rows))
+                rows.append(("", "Brought forward", "", "", f"₹{subtotal:.2f}"))
+            for i in range(start, end):
+                item = items[i]
+                line_total = item['quantity'] * item['price_per_unit']
+                subtotal += line_total
+                rows.append((str(i + 1), item['product_name'], str(item['quantity']),
+                             f"₹{item['price_per_unit']:.2f}", f"₹{line_total:.2f}"))
+            if number < len(pages):
+                bold_rows.append(len(rows))
+                rows.append(("", "Carried forward", "", "", f"₹{subtotal:.2f}"))
+
+            table = ItemRows(self.columns, rows, bold_rows, self.regular_font, self.bold_font)
+            _, table_height = table.wrap(self.width, self.height)
+            table.drawOn(self.c, self.table_x, top - table_height)
+            self.draw_page_number(number, len(pages))
+        return subtotal, top - table_height
+
+    def draw_continued_heading(self, invoice_data):
+        self.c.setFont(self.bold_font, 12)
+        self.c.drawString(self.table_x, self.continued_top + 12,
+                          f"Invoice Number: {invoice_data['invoice_number']} (continued)")
+
+    def draw_page_number(self, number, count):
+        self.c.setFont(self.regular_font, 9)
+        self.c.drawRightString(self.width - 50, 80, f"Page {number} of {count}")
 
     def get_tax_info(self, subtotal, customer_state_code):
         if customer_state_code == self.settings.state_code:
@@ -85,29 +209,150 @@ class InvoiceTemplate:
                 "total_tax": igst,
             }
 
-    def draw_summary(self, invoice_data):
-        subtotal = sum(item['quantity'] * item['price_per_unit'] for item in invoice_data['items'])
+    def draw_summary(self, invoice_data, subtotal, y):
+        """Subtotal, tax and total lines, the first at `y`."""
         tax_info = self.get_tax_info(subtotal, invoice_data['customer']['state_code'])
         total = subtotal + tax_info['total_tax']
-
-        self.c.setFont("Helvetica-Bold", 12)
-        self.c.drawString(400, 400, "Subtotal:")
         if tax_info['tax_type'] == 'IGST':
-            self.c.drawString(400, 380, "IGST (18%):")
+            lines = [("Subtotal:", subtotal), ("IGST (18%):", tax_info['igst']), ("Total:", total)]
         else:
-            self.c.drawString(400, 380, "CGST (9%):")
-            self.c.drawString(400, 360, "SGST (9%):")
-        self.c.drawString(400, 340, "Total:")
+            lines = [("Subtotal:", subtotal), ("CGST (9%):", tax_info['cgst']), ("SGST (9%):", tax_info['sgst']),
+                     ("Total:", total)]
 
-        self.c.setFont("Helvetica", 12)
-        self.c.drawString(500, 400, f"₹{subtotal:.2f}")
-        if tax_info['tax_type'] == 'IGST':
-            self.c.drawString(500, 380, f"₹{tax_info['igst']:.2f}")
-        else:
-            self.c.drawString(500, 380, f"₹{tax_info['cgst']:.2f}")
-            self.c.drawString(500, 360, f"₹{tax_info['sgst']:.2f}")
-        self.c.drawString(500, 340, f"₹{total:.2f}")
+        for i, (label, amount) in enumerate(lines):
+            self.c.setFont(self.bold_font, 12)
+            self.c.drawString(400, y - 20 * i, label)
+            self.c.setFont(self.regular_font, 12)
+            self.c.drawString(500, y - 20 * i, f"₹{amount:.2f}")
 
     def draw_footer(self):
-        self.c.setFont("Helvetica-Oblique", 10)
+        self.c.setFont(self.regular_font, 10)
         self.c.drawString(50, 100, self.settings.tagline)
+
+    def with_tax(self, subtotal, customer_state_code):
+        return subtotal + self.get_tax_info(subtotal, customer_state_code)['total_tax']
+
+    @staticmethod
+    def amount(value):
+        return f"-₹{-value:.2f}" if value < 0 else f"₹{value:.2f}"
+
+    def draw_statement(self, summary, lines, invoices=()):
+        """A statement of account: the balance summary and a ledger of `lines`
+        (StatementLines in date order), then each of `invoices` in full.
+
+        Both are iterated once, page by page, so they can be streams; the
+        ledger is planned from the counts in `summary`.
+        """
+        self.register_fonts()
+        state_code = summary.customer['state_code']
+        opening = self.with_tax(summary.opening_invoiced, state_code) - summary.opening_received
+        closing = opening + self.with_tax(summary.invoiced, state_code) - summary.received
+        self.place_static("continued")
+        self.draw_statement_heading(summary, opening, closing)
+
+        top = self.continued_top - self.statement_heading_height
+        # Every line plus the opening and closing balance rows.
+        count = summary.invoice_count + summary.payment_count + 2
+        pages = paginate(count, self.rows_fitting(top), self.rows_fitting(self.continued_top), 0)
+        entries = self.ledger_entries(summary, lines, opening)
+        balance = opening
+        for number, (start, end) in enumerate(pages, 1):
+            rows, bold_rows = [], []
+            if number > 1:
+                self.c.showPage()
+                self.place_static("continued")
+                self.draw_statement_continued_heading(summary)
+                top = self.continued_top
+                bold_rows.append(len(rows))
+                rows.append(("", "", "Brought forward", "", "", self.amount(balance)))
+            for _ in range(start, end):
+                row, balance, bold = next(entries)
+                if bold:
+                    bold_rows.append(len(rows))
+                rows.append(row)
+            if number < len(pages):
+                bold_rows.append(len(rows))
+                rows.append(("", "", "Carried forward", "", "", self.amount(balance)))
+
+            table = ItemRows(self.statement_columns, rows, bold_rows, self.regular_font, self.bold_font)
+            _, table_height = table.wrap(self.width, self.height)
+            table.drawOn(self.c, self.table_x, top - table_height)
+            self.draw_page_number(number, len(pages))
+
+        for invoice_data in invoices:
+            self.c.showPage()
+            self.draw_invoice(invoice_data)
+
+    def ledger_entries(self, summary, lines, opening):
+        """(row, balance after it, bold) for the opening balance, each line and the closing balance."""
+        state_code = summary.customer['state_code']
+        balance = opening
+        yield (summary.date_from.isoformat(), "", "Opening balance", "", "", self.amount(balance)), balance, True
+        for line in lines:
+            if line.kind == "payment":
+                debit, credit = "", self.amount(line.amount)
+                balance -= line.amount
+            else:
+                amount = self.with_tax(line.amount, state_code)
+                debit, credit = self.amount(amount), ""
+                balance += amount
+            day = line.date.isoformat() if line.date else ""
+            yield (day, line.reference, line.details, debit, credit, self.amount(balance)), balance, False
+        yield (summary.date_to.isoformat(), "", "Closing balance", "", "", self.amount(balance)), balance, True
+
+    def draw_statement_heading(self, summary, opening, closing):
+        top = self.continued_top
+        customer = summary.customer
+        self.c.setFont(self.bold_font, 16)
+        self.c.drawString(self.table_x, top, "Statement of Account")
+        self.c.setFont(self.bold_font, 12)
+        self.c.drawString(self.table_x, top - 25, customer['name'])
+        self.c.setFont(self.regular_font, 11)
+        self.c.drawString(self.table_x, top - 40, customer['address'])
+        self.c.drawString(self.table_x, top - 55, f"GSTIN: {customer['gstin']}")
+        self.c.drawString(self.table_x, top - 70,
+                          f"Period: {summary.date_from.isoformat()} to {summary.date_to.isoformat()}")
+        invoiced = self.with_tax(summary.invoiced, customer['state_code'])
+        for i, (label, value) in enumerate([("Opening balance:", opening), ("Invoiced:", invoiced),
+                                            ("Received:", summary.received), ("Closing balance:", closing)]):
+            self.c.setFont(self.bold_font, 11)
+            self.c.drawString(350, top - 25 - 15 * i, label)
+            self.c.setFont(self.regular_font, 11)
+            self.c.drawRightString(self.width - 50, top - 25 - 15 * i, self.amount(value))
+
+    def draw_statement_continued_heading(self, summary):
+        self.c.setFont(self.bold_font, 12)
+        self.c.drawString(self.table_x, self.continued_top + 12,
+                          f"Statement of Account: {summary.customer['name']} (continued)")
+
+
+@register_template
+class ClassicTemplate(InvoiceTemplate):
+    name = "Classic"
+    # The centred letterhead takes the top of the page; customer left, invoice details right.
+    labels = (
+        (50, 690, "Bill To:", pdf_fonts.BOLD),
+        (50, 640, "GSTIN: ", pdf_fonts.REGULAR),
+        (350, 690, "Invoice Number: ", pdf_fonts.BOLD),
+        (350, 675, "Invoice Date: ", pdf_fonts.BOLD),
+        (350, 660, "Vehicle Number: ", pdf_fonts.BOLD),
+    )
+    table_top = 615
+    continued_top = 680
+
+    def draw_header(self):
+        center = self.width / 2
+        self.c.setFont(self.bold_font, 22)
+        self.c.drawCentredString(center, 760, self.settings.company_name)
+        self.c.setFont(self.regular_font, 10)
+        self.c.drawCentredString(center, 746, self.settings.address)
+        self.c.drawCentredString(center, 734, f"GSTIN: {self.settings.gstin}   PAN: {self.settings.pan_number}")
+        self.c.drawCentredString(center, 722, f"Email: {self.settings.email}   UPI ID: {self.settings.upi_id}")
+        self.c.setLineWidth(1)
+        self.c.line(50, 712, self.width - 50, 712)
+
+    def draw_footer(self):
+        self.c.setLineWidth(0.5)
+        self.c.line(50, 115, self.width - 50, 115)
+        self.c.setFont(self.regular_font, 10)
+        self.c.drawCentredString(self.width / 2, 100, self.settings.tagline)
@@ -0,0 +1,61 @@
+# src/utils/lazy_imports.py
+# reportlab takes longer to import than the rest of the app put together, and
+# it is not needed to show the first window. Modules that use it are reached
+# through lazy_import() so they load on first use, and warm_up() can import
+# them in a background thread once the window is up.
+import importlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Modules that pull in reportlab.
+HEAVY_MODULES = ("src.utils.pdf_service",)
+
+WARM_UP_ENABLED = os.environ.get("BILLING_WARM_UP", "1") != "0"
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access."""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def _import_all(names):
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The foreground import will raise the same error where it can be shown.
+            logger.exception("Warm-up import of %s failed", name)
+
+
+def warm_up(names=HEAVY_MODULES):
+    """Imports `names` in a daemon thread so the first PDF doesn't pay for them.
+
+    Python's import lock makes a foreground import of the same module simply wait
+    for the background one. Returns the thread, or None when BILLING_WARM_UP=0.
+    """
+    if not WARM_UP_ENABLED:
+        return None
+    thread = threading.Thread(target=_import_all, args=(tuple(names),), name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
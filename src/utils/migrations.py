@@ -0,0 +1,131 @@
+# src/utils/migrations.py
+# Ordered schema migrations. Every migration runs in its own transaction and is
+# recorded in the schema_version table, so existing databases pick up new
+# columns and indexes on startup while current ones skip all of this work.
+from sqlalchemy import text
+
+from src.utils.database import Base
+import src.models  # noqa: F401 -- registers every table on Base.metadata
+from src.utils import sales_summary
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+def _table_exists(conn, table):
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table}
+    ).first() is not None
+
+
+def _add_column(conn, table, column, ddl):
+    existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _create_index(conn, table, column):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+
+
+def _create_table(conn, table):
+    Base.metadata.tables[table].create(bind=conn, checkfirst=True)
+
+
+def _add_missing_columns(conn):
+    _add_column(conn, "invoices", "payment_status", "VARCHAR DEFAULT 'Pending' NOT NULL")
+    _add_column(conn, "inventory_history", "new_quantity", "INTEGER")
+    _add_column(conn, "user_settings", "address", "VARCHAR")
+    _add_column(conn, "user_settings", "state_code", "VARCHAR")
+
+
+def _add_hot_path_indexes(conn):
+    _create_index(conn, "invoices", "date")
+    _create_index(conn, "invoices", "customer_id")
+    _create_index(conn, "invoice_items", "invoice_id")
+    _create_index(conn, "invoice_items", "product_name")
+    _create_index(conn, "inventory_history", "product_id")
+    _create_index(conn, "audit_logs", "timestamp")
+    _create_index(conn, "products", "company_id")
+    # Give the query planner statistics for the new indexes.
+    conn.execute(text("ANALYZE"))
+
+
+def _add_invoice_item_product_id(conn):
+    _add_column(conn, "invoice_items", "product_id", "INTEGER REFERENCES products (id) ON DELETE SET NULL")
+    _create_index(conn, "invoice_items", "product_id")
+    # Backfill: prefer the product of the invoiced company with that name ...
+    conn.execute(text(
+        "UPDATE invoice_items SET product_id = ("
+        " SELECT MIN(p.id) FROM products p JOIN invoices i ON i.id = invoice_items.invoice_id"
+        " WHERE p.name = invoice_items.product_name AND p.company_id = i.customer_id)"
+        " WHERE product_id IS NULL"
+    ))
+    # ... otherwise any product with that name, as long as the name is unambiguous.
+    conn.execute(text(
+        "UPDATE invoice_items SET product_id = ("
+        " SELECT MIN(p.id) FROM products p WHERE p.name = invoice_items.product_name"
+        " GROUP BY p.name HAVING COUNT(*) = 1)"
+        " WHERE product_id IS NULL"
+    ))
+
+
+def _add_invoice_sequences(conn):
+    _create_table(conn, "invoice_sequences")
+
+
+def _add_sales_summary(conn):
+    for table in ("daily_customer_sales", "daily_product_sales", "invoice_status_summary"):
+        _create_table(conn, table)
+    sales_summary.rebuild(conn)
+
+
+def _add_import_checkpoints(conn):
+    _create_table(conn, "import_checkpoints")
+
+
+# (version, description, callable). Append only; never renumber a released migration.
+MIGRATIONS = [
+    (1, "Add payment_status, new_quantity and settings address/state_code columns", _add_missing_columns),
+    (2, "Add secondary indexes for invoice, inventory and audit log queries", _add_hot_path_indexes),
+    (3, "Link invoice items to products by id and backfill existing rows", _add_invoice_item_product_id),
+    (4, "Add invoice_sequences table for database-backed invoice numbers", _add_invoice_sequences),
+    (5, "Add dashboard sales summary tables and fill them from existing invoices", _add_sales_summary),
+    (6, "Add import_checkpoints table for resumable CSV imports", _add_import_checkpoints),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    if not _table_exists(conn, SCHEMA_VERSION_TABLE):
+        return 0
+    return conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+
+
+def run_migrations(engine):
+    """Brings the database up to LATEST_VERSION. Returns the versions that were applied."""
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return []
+
+    with engine.begin() as conn:
+        # Creates tables that do not exist yet; existing tables are left to the migrations below.
+        Base.metadata.create_all(bind=conn)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, description VARCHAR, "
+            "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (:v, :d)"),
+                {"v": version, "d": description},
+            )
+        applied.append(version)
+    return applied
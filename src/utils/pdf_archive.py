@@ -0,0 +1,55 @@
+# src/utils/pdf_archive.py
+# Where invoice PDFs are kept once rendered: <archive>/<year>/<month>/invoice_<number>.pdf,
+# by invoice date. The archive sits next to the database unless
+# BILLING_PDF_ARCHIVE_DIR says otherwise. PDFs are rendered in memory
+# (PdfService.render) and only written here, atomically.
+import datetime
+import os
+import tempfile
+from src.utils.database import DATABASE_PATH
+from src.utils.invoice_documents import pdf_file_name
+
+ARCHIVE_DIR = os.environ.get("BILLING_PDF_ARCHIVE_DIR",
+                             os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), "invoices"))
+
+
+def archive_path(invoice_data, root=None):
+    day = invoice_data['date']
+    if isinstance(day, str):
+        day = datetime.date.fromisoformat(day)
+    return os.path.join(root or ARCHIVE_DIR, f"{day.year:04d}", f"{day.month:02d}", pdf_file_name(invoice_data))
+
+
+def write_atomic(path, data):
+    """Writes `data` through a temporary file in the same directory and a rename,
+    so nobody ever sees a half-written file at `path`."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def has_content(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def save_invoice_pdf(invoice_data, data, root=None):
+    """Archives an invoice's PDF bytes and returns the path. A file that already
+    holds the same bytes is left as it is."""
+    path = archive_path(invoice_data, root)
+    if not has_content(path, data):
+        write_atomic(path, data)
+    return path
@@ -0,0 +1,160 @@
+# src/utils/pdf_cache.py
+# Saved invoices never change, so their PDFs are rendered once and kept in a
+# cache directory. An entry's name is a hash of everything that ends up on the
+# page: the invoice data, the PDF fields of UserSettings (template included) and
+# the logo file's size and mtime. Entries live in one sub-directory per settings
+# hash; the first render after a settings change drops the other sub-directories.
+# Total size is capped, evicting the least recently used files (by mtime, which
+# is bumped on every hit). The total is kept as a running count, so the
+# directory is only scanned on first use and when something has to be evicted;
+# eviction then goes down to EVICT_TO of the cap, so a full cache is not
+# rescanned on every put.
+import hashlib
+import json
+import os
+import shutil
+import threading
+from src.utils.database import DATABASE_PATH
+from src.utils.invoice_documents import pdf_settings
+from src.utils.pdf_archive import write_atomic
+from src.utils.lazy_imports import lazy_import
+
+# reportlab is only loaded on the first cache miss.
+pdf = lazy_import("src.utils.pdf_service")
+
+CACHE_DIR = os.environ.get("BILLING_PDF_CACHE_DIR",
+                           os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), "pdf_cache"))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_TO = 0.9
+# Bump when the templates change, so PDFs drawn by the old code are not served.
+RENDER_VERSION = 4
+
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def settings_key(settings):
+    settings = pdf_settings(settings)
+    logo = None
+    if settings.logo_filepath:
+        try:
+            stat = os.stat(settings.logo_filepath)
+            logo = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+    return _digest({"version": RENDER_VERSION, "settings": settings._asdict(), "logo": logo})[:16]
+
+
+def invoice_key(invoice_data):
+    return _digest(invoice_data)
+
+
+class PdfCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes in the cache; None until the directory has been scanned.
+        self._total = None
+
+    def path_for(self, settings, invoice_data):
+        return os.path.join(self.directory, settings_key(settings), invoice_key(invoice_data) + ".pdf")
+
+    def get(self, settings, invoice_data):
+        """The cached PDF bytes, or None."""
+        path = self.path_for(settings, invoice_data)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, settings, invoice_data, data):
+        """Stores PDF bytes and returns the cached path."""
+        path = self.path_for(settings, invoice_data)
+        entry_dir = os.path.dirname(path)
+        with self._lock:
+            if not os.path.isdir(entry_dir):
+                self._drop_other_settings(entry_dir)
+            if self._total is None:
+                self._total = self.size()
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+        write_atomic(path, data)
+        with self._lock:
+            self._total += len(data) - replaced
+            if self._total > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def invoice_pdf(self, settings, invoice_data):
+        """The invoice's PDF bytes, rendered only on a cache miss."""
+        settings = pdf_settings(settings)
+        data = self.get(settings, invoice_data)
+        if data is None:
+            data = pdf.PdfService(settings).render(invoice_data)
+            self.put(settings, invoice_data, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._total = 0
+
+    def size(self):
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for settings_dir in os.scandir(self.directory):
+            if not settings_dir.is_dir():
+                continue
+            for entry in os.scandir(settings_dir.path):
+                if entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+        return entries
+
+    def _drop_other_settings(self, entry_dir):
+        if not os.path.isdir(self.directory):
+            return
+        for settings_dir in os.scandir(self.directory):
+            if settings_dir.is_dir() and settings_dir.path != entry_dir:
+                shutil.rmtree(settings_dir.path, ignore_errors=True)
+        # Only `entry_dir` can be left, and it does not exist yet.
+        self._total = 0
+
+    def _evict(self, keep):
+        # Rescanning also corrects the running total for files changed by anyone else.
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, path, size in sorted(entries):
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total = total
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PdfCache()
+    return _default_cache
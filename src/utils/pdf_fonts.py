@@ -0,0 +1,30 @@
+# src/utils/pdf_fonts.py
+# The TrueType fonts invoice PDFs are set in. The built-in PDF fonts only
+# cover Latin-1, so "₹" came out as a missing-glyph box; the Roboto fonts in
+# resources/ (the ones the app window uses) have it. Each font file is parsed
+# and registered with reportlab once per process, on first use (so once per
+# bulk-export worker too), and every document embeds only a subset of glyphs.
+import os
+import threading
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "resources")
+REGULAR = "Roboto"
+BOLD = "Roboto-Medium"
+FONT_FILES = {REGULAR: "Roboto-Regular.ttf", BOLD: "Roboto-Medium.ttf"}
+
+_lock = threading.Lock()
+_registered = False
+
+
+def register_fonts():
+    """Registers the bundled fonts with reportlab; cheap after the first call."""
+    global _registered
+    if _registered:
+        return
+    with _lock:
+        if not _registered:
+            for name, file_name in FONT_FILES.items():
+                pdfmetrics.registerFont(TTFont(name, os.path.join(FONT_DIR, file_name)))
+            _registered = True
@@ -1,20 +1,73 @@
 # src/utils/pdf_service.py
+import io
+import os
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from .invoice_template import InvoiceTemplate
+from .invoice_template import template_for
+from .invoice_documents import pdf_file_name, pdf_settings
+from .pdf_archive import write_atomic
 
 class PdfService:
     def __init__(self, settings):
-        self.settings = settings
+        self.settings = pdf_settings(settings)
 
-    def generate_invoice(self, invoice_data):
-        file_name = f"invoice_{invoice_data['invoice_number']}.pdf"
-        c = canvas.Canvas(file_name, pagesize=letter)
+    def render(self, invoice_data):
+        """Renders the invoice in memory and returns the PDF as a memoryview."""
+        buffer = io.BytesIO()
+        self.write_pdf(invoice_data, buffer)
+        return buffer.getbuffer()
+
+    def write_pdf(self, invoice_data, file):
+        """Draws the invoice into `file`, a path or a binary file object."""
+        c = canvas.Canvas(file, pagesize=letter)
         width, height = letter
 
-        template = InvoiceTemplate(c, width, height, self.settings)
+        template = template_for(self.settings.chosen_template)(c, width, height, self.settings)
         template.draw_invoice(invoice_data)
 
         c.save()
-        return file_name
+        return file
+
+    def write_statement(self, summary, lines, invoices, file):
+        """Draws a customer statement (see customer_statement) into `file`."""
+        c = canvas.Canvas(file, pagesize=letter)
+        width, height = letter
+
+        template = template_for(self.settings.chosen_template)(c, width, height, self.settings)
+        template.draw_statement(summary, lines, invoices)
+
+        c.save()
+        return file
+
+
+def render_invoices(settings, invoices):
+    """Renders a chunk of invoice_data dicts in memory.
+
+    Runs in bulk-export worker processes, so it takes and returns plain data:
+    [(invoice_number, file_name, pdf_bytes, error)] with exactly one of pdf_bytes/error set.
+    """
+    service = PdfService(settings)
+    results = []
+    for invoice_data in invoices:
+        try:
+            data = bytes(service.render(invoice_data))
+        except Exception as exc:
+            results.append((invoice_data['invoice_number'], pdf_file_name(invoice_data), None, str(exc)))
+        else:
+            results.append((invoice_data['invoice_number'], pdf_file_name(invoice_data), data, None))
+    return results
+
+
+def render_invoice_files(settings, invoices, output_dir):
+    """Like render_invoices, but writes each PDF into `output_dir`: [(invoice_number, path, error)]."""
+    results = []
+    for number, file_name, data, error in render_invoices(settings, invoices):
+        path = None
+        if data is not None:
+            try:
+                path = write_atomic(os.path.join(output_dir, file_name), data)
+            except OSError as exc:
+                error = str(exc)
+        results.append((number, path, error))
+    return results
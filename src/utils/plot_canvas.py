@@ -1,26 +1,284 @@
 # src/utils/plot_canvas.py
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+# Dashboard charts drawn with QPainter. A chart keeps two cached pixmaps: the
+# frame (card, title, axis labels, legend), rebuilt only on resize or when the
+# titles or series names change, and the plot (grid, bars, lines, slices), rebuilt only when the data
+# changes. paintEvent just copies them to the screen, and plotting the same
+# data again does nothing at all.
+import math
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPointF, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen, QPixmap
+from src.utils.theme import DARK_THEME
 
-class PlotCanvas(FigureCanvas):
+SERIES_COLORS = ["#8ab4f8", "#81c995", "#fdd663", "#f28b82", "#c58af9", "#78d9ec"]
+
+TITLE_HEIGHT = 36
+AXIS_LEFT = 64
+AXIS_BOTTOM = 52
+PADDING = 16
+LEGEND_HEIGHT = 22
+
+
+def nice_ticks(max_value, count=5):
+    """Evenly spaced tick values from 0 to at least `max_value`, on 1/2/2.5/5 x 10^n steps."""
+    if max_value <= 0:
+        return [0, 1]
+    raw_step = max_value / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    ticks = [0]
+    while ticks[-1] < max_value:
+        ticks.append(ticks[-1] + step)
+    return ticks
+
+
+def format_value(value):
+    """Short axis label: 950, 12.5k, 3.2M."""
+    for limit, suffix in ((1e7, "Cr"), (1e5, "L"), (1e3, "k")):
+        if abs(value) >= limit:
+            return f"{value / limit:.3g}{suffix}"
+    return f"{value:.3g}"
+
+
+class PlotCanvas(QWidget):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = fig.add_subplot(111)
-        super().__init__(fig)
-        self.setParent(parent)
+        super().__init__(parent)
+        self._size_hint = QSize(int(width * dpi), int(height * dpi))
+        self.setMinimumSize(240, 200)
+        self._kind = None
+        self._data = None
+        self._titles = ("", "", "")  # title, xlabel, ylabel
+        self._frame = None
+        self._plot = None
+        self._layer_size = None
+
+    def sizeHint(self):
+        return self._size_hint
 
+    # --- plotting ---
     def plot_bar(self, x, y, title, xlabel, ylabel):
-        self.axes.cla()
-        self.axes.bar(x, y)
-        self.axes.set_title(title)
-        self.axes.set_xlabel(xlabel)
-        self.axes.set_ylabel(ylabel)
-        self.draw()
+        self._set_chart("bar", (tuple(map(str, x)), tuple(y)), (title, xlabel, ylabel))
 
     def plot_pie(self, sizes, labels, title):
-        self.axes.cla()
-        self.axes.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-        self.axes.axis('equal')
-        self.axes.set_title(title)
-        self.draw()
+        self._set_chart("pie", (tuple(sizes), tuple(labels)), (title, "", ""))
+
+    def plot_line(self, x, series, title, xlabel, ylabel):
+        """`series` is a list of (name, values) with one value per x label."""
+        series = tuple((name, tuple(values)) for name, values in series)
+        self._set_chart("line", (tuple(map(str, x)), series), (title, xlabel, ylabel))
+
+    def _set_chart(self, kind, data, titles):
+        if (kind, data, titles) == (self._kind, self._data, self._titles):
+            return
+        frame_key = (self._kind, self._titles, self._legend())
+        self._kind, self._data, self._titles = kind, data, titles
+        if frame_key != (kind, titles, self._legend()):
+            self._frame = None
+        self._plot = None
+        self.update()
+
+    def _legend(self):
+        if self._kind == "pie":
+            return self._data[1]
+        if self._kind == "line" and len(self._data[1]) > 1:
+            return tuple(name for name, _ in self._data[1])
+        return ()
+
+    # --- painting ---
+    def paintEvent(self, event):
+        if self._layer_size != (self.size(), self.devicePixelRatioF()):
+            self._layer_size = (self.size(), self.devicePixelRatioF())
+            self._frame = self._plot = None
+        if self._frame is None:
+            self._frame = self._render(self._paint_frame)
+        if self._plot is None:
+            self._plot = self._render(self._paint_plot)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._frame)
+        painter.drawPixmap(0, 0, self._plot)
+        painter.end()
+
+    def _render(self, paint):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        paint(painter)
+        painter.end()
+        return pixmap
+
+    def _plot_rect(self):
+        if self._kind == "pie":
+            return QRectF(PADDING, TITLE_HEIGHT, self.width() - 2 * PADDING, self.height() - TITLE_HEIGHT - PADDING)
+        top = TITLE_HEIGHT + 8 + (LEGEND_HEIGHT if self._legend() else 0)
+        return QRectF(AXIS_LEFT, top, self.width() - AXIS_LEFT - PADDING, self.height() - top - AXIS_BOTTOM)
+
+    def _pie_rect(self):
+        plot = self._plot_rect()
+        diameter = min(plot.height(), plot.width() * 0.6) - 8
+        return QRectF(plot.left() + 8, plot.center().y() - diameter / 2, diameter, diameter)
+
+    def _paint_frame(self, painter):
+        title, xlabel, ylabel = self._titles
+        painter.setPen(QPen(QColor(DARK_THEME["border_main"]), 1))
+        painter.setBrush(QColor(DARK_THEME["bg_surface"]))
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+
+        painter.setFont(_font(11, QFont.Weight.Medium))
+        painter.setPen(QColor(DARK_THEME["text_primary"]))
+        painter.drawText(QRectF(0, 0, self.width(), TITLE_HEIGHT), Qt.AlignmentFlag.AlignCenter, title)
+        legend = self._legend()
+        if self._kind == "pie":
+            pie = self._pie_rect()
+            self._paint_legend(painter, QPointF(pie.right() + 24, pie.center().y() - 11 * len(legend)), legend)
+            return
+        if legend:
+            # On its own row under the title, so it never covers the data.
+            self._paint_legend(painter, QPointF((self.width() - self._legend_width(legend)) / 2, TITLE_HEIGHT - 4),
+                               legend, horizontal=True)
+
+        plot = self._plot_rect()
+        painter.setFont(_font(9))
+        painter.setPen(QColor(DARK_THEME["text_secondary"]))
+        painter.drawText(QRectF(plot.left(), self.height() - 22, plot.width(), 18), Qt.AlignmentFlag.AlignCenter, xlabel)
+        painter.save()
+        painter.translate(14, plot.center().y())
+        painter.rotate(-90)
+        painter.drawText(QRectF(-plot.height() / 2, -9, plot.height(), 18), Qt.AlignmentFlag.AlignCenter, ylabel)
+        painter.restore()
+        painter.setPen(QPen(QColor(DARK_THEME["text_secondary"]), 1))
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+
+    def _paint_plot(self, painter):
+        if self._kind is None:
+            return
+        if not self._has_data():
+            painter.setFont(_font(10))
+            painter.setPen(QColor(DARK_THEME["text_secondary"]))
+            painter.drawText(self._plot_rect(), Qt.AlignmentFlag.AlignCenter, "No data yet")
+            return
+        getattr(self, f"_paint_{self._kind}")(painter, self._plot_rect())
+
+    def _has_data(self):
+        if self._kind == "pie":
+            return any(self._data[0])
+        if self._kind == "line":
+            return bool(self._data[0]) and any(any(values) for _, values in self._data[1])
+        return bool(self._data[0])
+
+    def _paint_value_axis(self, painter, plot, max_value):
+        """Draws grid lines and value labels; returns a function mapping values to y."""
+        ticks = nice_ticks(max_value)
+        top = ticks[-1]
+        to_y = lambda value: plot.bottom() - plot.height() * value / top
+        painter.setFont(_font(8))
+        for tick in ticks:
+            y = to_y(tick)
+            if tick:
+                painter.setPen(QPen(QColor(DARK_THEME["border_main"]), 1, Qt.PenStyle.DotLine))
+                painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(QColor(DARK_THEME["text_secondary"]))
+            painter.drawText(QRectF(0, y - 8, plot.left() - 6, 16),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, format_value(tick))
+        return to_y
+
+    def _paint_category_labels(self, painter, plot, labels, slot):
+        painter.setFont(_font(8))
+        painter.setPen(QColor(DARK_THEME["text_secondary"]))
+        metrics = QFontMetrics(painter.font())
+        # Long labels are elided; when even short ones would overlap, only every n-th is drawn.
+        wanted = min(max(metrics.horizontalAdvance(label) for label in labels) + 8, 64)
+        every = max(1, math.ceil(wanted / max(slot, 1)))
+        for i, label in enumerate(labels):
+            if i % every:
+                continue
+            width = slot * every
+            text = metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(width) - 4)
+            painter.drawText(QRectF(plot.left() + slot * (i + 0.5) - width / 2, plot.bottom() + 4, width, 18),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, text)
+
+    def _paint_bar(self, painter, plot):
+        labels, values = self._data
+        to_y = self._paint_value_axis(painter, plot, max(values))
+        slot = plot.width() / len(values)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(SERIES_COLORS[0]))
+        for i, value in enumerate(values):
+            y = to_y(max(value, 0))
+            painter.drawRect(QRectF(plot.left() + slot * (i + 0.15), y, slot * 0.7, plot.bottom() - y))
+        self._paint_category_labels(painter, plot, labels, slot)
+
+    def _paint_line(self, painter, plot):
+        labels, series = self._data
+        to_y = self._paint_value_axis(painter, plot, max(max(values, default=0) for _, values in series))
+        slot = plot.width() / len(labels)
+        for color, (name, values) in zip(_colors(), series):
+            path = QPainterPath()
+            points = [QPointF(plot.left() + slot * (i + 0.5), to_y(value)) for i, value in enumerate(values)]
+            path.moveTo(points[0])
+            for point in points[1:]:
+                path.lineTo(point)
+            painter.setPen(QPen(QColor(color), 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(path)
+            if slot >= 12:
+                painter.setBrush(QColor(color))
+                for point in points:
+                    painter.drawEllipse(point, 2.5, 2.5)
+        self._paint_category_labels(painter, plot, labels, slot)
+
+    def _paint_pie(self, painter, plot):
+        sizes = self._data[0]
+        total = sum(sizes)
+        pie = self._pie_rect()
+        diameter = pie.width()
+        angle = 90 * 16  # start at twelve o'clock, like the old chart
+        painter.setPen(QPen(QColor(DARK_THEME["bg_surface"]), 2))
+        painter.setFont(_font(9, QFont.Weight.Medium))
+        for color, size in zip(_colors(), sizes):
+            span = round(360 * 16 * size / total)
+            painter.setBrush(QColor(color))
+            painter.drawPie(pie, angle, span)
+            if size:
+                middle = math.radians((angle + span / 2) / 16)
+                center = pie.center() + QPointF(math.cos(middle), -math.sin(middle)) * diameter * 0.3
+                painter.save()
+                painter.setPen(QColor(DARK_THEME["bg_main"]))
+                painter.drawText(QRectF(center.x() - 30, center.y() - 9, 60, 18), Qt.AlignmentFlag.AlignCenter,
+                                 f"{100 * size / total:.1f}%")
+                painter.restore()
+            angle += span
+
+    def _paint_legend(self, painter, origin, names, horizontal=False):
+        painter.setFont(_font(9))
+        metrics = QFontMetrics(painter.font())
+        x, y = origin.x(), origin.y()
+        for color, name in zip(_colors(), names):
+            name = str(name)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(QRectF(x, y + 4, 12, 12), 2, 2)
+            painter.setPen(QColor(DARK_THEME["text_primary"]))
+            painter.drawText(QRectF(x + 18, y, 200, 20), Qt.AlignmentFlag.AlignVCenter, name)
+            if horizontal:
+                x += 18 + metrics.horizontalAdvance(name) + 16
+            else:
+                y += 22
+
+    def _legend_width(self, names):
+        metrics = QFontMetrics(_font(9))
+        return sum(18 + metrics.horizontalAdvance(str(name)) + 16 for name in names) - 16
+
+
+def _colors():
+    while True:
+        yield from SERIES_COLORS
+
+
+def _font(point_size, weight=QFont.Weight.Normal):
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setWeight(weight)
+    return font
@@ -0,0 +1,161 @@
+# src/utils/revenue_series.py
+# Revenue over time for the dashboard. The invoice columns that matter (date,
+# total, customer) are read once into NumPy arrays and every figure is a grouped
+# reduction over them, so years of invoices cost a few milliseconds.
+# The columns and series are cached against the highest invoice id plus the
+# number of invoices and of invoices with a customer. Most changes only add
+# invoices, and then only the new ones are read. Deleting a company clears the
+# customer of its invoices, and deleting invoices lowers the count; either
+# makes the counts disagree and everything is read again.
+import datetime
+import threading
+from collections import namedtuple
+from sqlalchemy import Integer, cast, func, select
+from src.models import Invoice
+from src.utils.lazy_imports import lazy_import
+
+# Keeps numpy off the startup path; the series are computed on a worker thread.
+np = lazy_import("numpy")
+
+MONTHLY = "month"
+WEEKLY = "week"
+PERIODS_PER_YEAR = {MONTHLY: 12, WEEKLY: 52}
+
+# One entry per period in each array. `first` is the number of the first period:
+# months since January 1970, or weeks since Monday 1969-12-29.
+RevenueSeries = namedtuple("RevenueSeries", ["period", "first", "revenue", "invoice_count", "average_ticket", "customers"])
+PeriodChange = namedtuple("PeriodChange", ["current", "previous", "change_pct"])
+
+_EPOCH = datetime.date(1970, 1, 1)
+# julianday('1970-01-01')
+_JULIAN_EPOCH = 2440587.5
+
+_cache_lock = threading.Lock()
+_cache = {"url": None, "key": None, "columns": None, "series": {}}
+
+
+def _column_dtype():
+    return np.dtype([("day", np.int64), ("total", np.float64), ("customer", np.int64)])
+
+
+def invoice_columns(session, after_id=0):
+    """Structured array with the day (days since 1970-01-01), total and customer id of
+    every invoice with an id above `after_id`."""
+    day = func.julianday(Invoice.date)
+    statement = select(
+        cast(day - _JULIAN_EPOCH, Integer),
+        func.coalesce(Invoice.total_amount, 0.0),
+        func.coalesce(Invoice.customer_id, 0),
+    ).where(day.is_not(None), Invoice.id > after_id)
+    sql = str(statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True}))
+    # Reading the DB-API cursor straight into NumPy skips building a Row per invoice,
+    # which is most of the cost for large tables.
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute(sql)
+        return np.fromiter(cursor, dtype=_column_dtype())
+    finally:
+        cursor.close()
+
+
+def period_number(days, period):
+    """Maps day numbers (days since 1970-01-01) to month or Monday-based week numbers."""
+    if period == MONTHLY:
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    # 1970-01-01 was a Thursday, so weeks counted from Monday 1969-12-29 are (days + 3) // 7.
+    return (days + 3) // 7
+
+
+def current_period(period, today=None):
+    days = ((today or datetime.date.today()) - _EPOCH).days
+    return int(period_number(np.array([days]), period)[0])
+
+
+def period_start(number, period):
+    if period == MONTHLY:
+        return datetime.date(1970 + number // 12, number % 12 + 1, 1)
+    return _EPOCH + datetime.timedelta(days=number * 7 - 3)
+
+
+def compute_series(columns, period=MONTHLY):
+    """Groups the invoice columns per period; periods without invoices get zeros."""
+    if not len(columns):
+        return RevenueSeries(period, 0, np.zeros(0), np.zeros(0, np.int64), np.zeros(0), np.zeros(0, np.int64))
+    number = period_number(columns["day"], period)
+    first = int(number.min())
+    slot = number - first
+    count = int(slot.max()) + 1
+
+    revenue = np.bincount(slot, weights=columns["total"], minlength=count)
+    invoice_count = np.bincount(slot, minlength=count)
+    average_ticket = np.divide(revenue, invoice_count, out=np.zeros(count), where=invoice_count > 0)
+    # Distinct (period, customer) pairs, counted per period.
+    stride = int(columns["customer"].max()) + 1
+    pairs = np.unique(slot * stride + columns["customer"])
+    customer_count = np.bincount(pairs // stride, minlength=count)
+    return RevenueSeries(period, first, revenue, invoice_count, average_ticket, customer_count)
+
+
+def _cache_key(session):
+    """(highest id, invoices, invoices with a customer); cheap counts over the indexes."""
+    return tuple(session.execute(select(
+        func.coalesce(func.max(Invoice.id), 0), func.count(Invoice.id), func.count(Invoice.customer_id),
+    )).one())
+
+
+def _counts(columns):
+    return len(columns), int(np.count_nonzero(columns["customer"]))
+
+
+def revenue_series(session, period=MONTHLY):
+    """RevenueSeries for all invoices. Unchanged invoices are served from the cache;
+    new ones are read on their own and appended to the cached columns."""
+    url = str(session.get_bind().url)
+    key = _cache_key(session)
+    with _cache_lock:
+        if (_cache["url"], _cache["key"]) != (url, key):
+            columns = None
+            old_key = _cache["key"]
+            if _cache["url"] == url and old_key is not None and key[0] > old_key[0]:
+                added = invoice_columns(session, after_id=old_key[0])
+                added_count, added_customers = _counts(added)
+                # Nothing but new invoices since the cached read.
+                if (old_key[1] + added_count, old_key[2] + added_customers) == key[1:]:
+                    columns = np.concatenate([_cache["columns"], added])
+            if columns is None:
+                columns = invoice_columns(session)
+            _cache.update(url=url, key=key, columns=columns, series={})
+        series = _cache["series"].get(period)
+        if series is None:
+            series = _cache["series"][period] = compute_series(_cache["columns"], period=period)
+        return series
+
+
+def window(series, last, periods):
+    """The `periods` periods ending with period number `last`, zero-padded outside the data."""
+    wanted = np.arange(last - periods + 1, last + 1) - series.first
+    inside = (wanted >= 0) & (wanted < len(series.revenue))
+
+    def take(values):
+        result = np.zeros(periods, dtype=values.dtype)
+        result[inside] = values[wanted[inside]]
+        return result
+
+    return RevenueSeries(series.period, last - periods + 1, take(series.revenue), take(series.invoice_count),
+                         take(series.average_ticket), take(series.customers))
+
+
+def period_labels(series):
+    """'Jan 24' for months, '05 Feb' for weeks (the Monday)."""
+    pattern = "%b %y" if series.period == MONTHLY else "%d %b"
+    return [period_start(series.first + i, series.period).strftime(pattern) for i in range(len(series.revenue))]
+
+
+def change(current, previous):
+    current, previous = float(current), float(previous)
+    return PeriodChange(current, previous, (current - previous) / previous * 100 if previous else None)
+
+
+def compare(values, offset=1):
+    """Latest value against the one `offset` periods before it."""
+    return change(values[-1] if len(values) else 0, values[-1 - offset] if len(values) > offset else 0)
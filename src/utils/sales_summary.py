@@ -0,0 +1,159 @@
+# src/utils/sales_summary.py
+# Maintains the dashboard's summary tables (src/models/sales_summary.py).
+# record_invoice(s) / record_status_change run inside the caller's transaction, so
+# the aggregates commit or roll back together with the invoice itself. rebuild()
+# recomputes everything from the invoices:
+#
+#     python -m src.utils.sales_summary rebuild
+import argparse
+from collections import defaultdict
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import (Invoice, InvoiceItem, CustomerCompany,
+                        DailyCustomerSales, DailyProductSales, InvoiceStatusSummary)
+
+NO_CUSTOMER = 0
+
+
+def _add_to(model, keys, amounts):
+    """INSERT ... ON CONFLICT DO UPDATE that adds `amounts` to an existing row."""
+    statement = sqlite_insert(model)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: getattr(model, column) + getattr(statement.excluded, column) for column in amounts},
+    )
+
+
+def record_invoice(session, day, customer_id, total_amount, status, items):
+    """Adds one new invoice to the aggregates.
+
+    `items` are (product_name, quantity, price_per_unit) tuples. Lines are summed
+    per product first, so this costs three statements however long the invoice is.
+    """
+    record_invoices(session, [(day, customer_id, total_amount, status, items)])
+
+
+def record_invoices(session, invoices):
+    """Adds many new invoices, e.g. an imported chunk, still in three statements.
+
+    `invoices` are (day, customer_id, total_amount, status, items) tuples.
+    """
+    per_customer = defaultdict(lambda: [0, 0.0])
+    per_product = defaultdict(lambda: [0, 0.0])
+    per_status = defaultdict(lambda: [0, 0.0])
+    for day, customer_id, total_amount, status, items in invoices:
+        total_amount = total_amount or 0
+        per_customer[day, customer_id or NO_CUSTOMER][0] += 1
+        per_customer[day, customer_id or NO_CUSTOMER][1] += total_amount
+        per_status[status][0] += 1
+        per_status[status][1] += total_amount
+        for product_name, quantity, price_per_unit in items:
+            per_product[day, product_name][0] += quantity or 0
+            per_product[day, product_name][1] += (quantity or 0) * (price_per_unit or 0)
+
+    if per_customer:
+        session.execute(_add_to(DailyCustomerSales, ["day", "customer_id"], ["invoice_count", "revenue"]), [
+            {"day": day, "customer_id": customer_id, "invoice_count": count, "revenue": revenue}
+            for (day, customer_id), (count, revenue) in per_customer.items()
+        ])
+    if per_product:
+        session.execute(_add_to(DailyProductSales, ["day", "product_name"], ["quantity", "revenue"]), [
+            {"day": day, "product_name": name, "quantity": quantity, "revenue": revenue}
+            for (day, name), (quantity, revenue) in per_product.items()
+        ])
+    if per_status:
+        session.execute(_add_to(InvoiceStatusSummary, ["status"], ["invoice_count", "total_amount"]), [
+            {"status": status, "invoice_count": count, "total_amount": amount}
+            for status, (count, amount) in per_status.items()
+        ])
+
+
+def record_status_change(session, old_status, new_status, total_amount):
+    """Moves one invoice between status buckets, e.g. when it is marked as paid."""
+    if old_status == new_status:
+        return
+    total_amount = total_amount or 0
+    session.execute(_add_to(InvoiceStatusSummary, ["status"], ["invoice_count", "total_amount"]), [
+        {"status": old_status, "invoice_count": -1, "total_amount": -total_amount},
+        {"status": new_status, "invoice_count": 1, "total_amount": total_amount},
+    ])
+
+
+def rebuild(connection):
+    """Recomputes every summary table from invoices and invoice_items.
+
+    Takes a Session or a Connection and runs in its transaction.
+    """
+    for model in (DailyCustomerSales, DailyProductSales, InvoiceStatusSummary):
+        connection.execute(delete(model))
+
+    connection.execute(insert(DailyCustomerSales).from_select(
+        ["day", "customer_id", "invoice_count", "revenue"],
+        select(Invoice.date, func.coalesce(Invoice.customer_id, NO_CUSTOMER), func.count(),
+               func.coalesce(func.sum(Invoice.total_amount), 0))
+        .group_by(Invoice.date, func.coalesce(Invoice.customer_id, NO_CUSTOMER))
+    ))
+    connection.execute(insert(DailyProductSales).from_select(
+        ["day", "product_name", "quantity", "revenue"],
+        select(Invoice.date, InvoiceItem.product_name, func.coalesce(func.sum(InvoiceItem.quantity), 0),
+               func.coalesce(func.sum(InvoiceItem.quantity * InvoiceItem.price_per_unit), 0))
+        .join(Invoice, InvoiceItem.invoice_id == Invoice.id)
+        .where(InvoiceItem.product_name.is_not(None))
+        .group_by(Invoice.date, InvoiceItem.product_name)
+    ))
+    connection.execute(insert(InvoiceStatusSummary).from_select(
+        ["status", "invoice_count", "total_amount"],
+        select(Invoice.payment_status, func.count(), func.coalesce(func.sum(Invoice.total_amount), 0))
+        .group_by(Invoice.payment_status)
+    ))
+
+
+def status_totals(session):
+    """Returns (total_invoices, paid_invoices, total_revenue)."""
+    total_invoices = paid_invoices = 0
+    total_revenue = 0.0
+    for status, count, amount in session.execute(select(
+        InvoiceStatusSummary.status, InvoiceStatusSummary.invoice_count, InvoiceStatusSummary.total_amount
+    )):
+        total_invoices += count
+        total_revenue += amount
+        if status == "Paid":
+            paid_invoices += count
+    return total_invoices, paid_invoices, total_revenue
+
+
+def top_products(session, limit=5):
+    """[(product_name, quantity)] by quantity sold."""
+    quantity = func.sum(DailyProductSales.quantity)
+    return [tuple(row) for row in session.execute(
+        select(DailyProductSales.product_name, quantity)
+        .group_by(DailyProductSales.product_name).order_by(quantity.desc()).limit(limit)
+    )]
+
+
+def top_customers(session, limit=5):
+    """[(customer_name, revenue)] for customers that still exist."""
+    revenue = func.sum(DailyCustomerSales.revenue)
+    return [tuple(row) for row in session.execute(
+        select(CustomerCompany.name, revenue)
+        .join(CustomerCompany, CustomerCompany.id == DailyCustomerSales.customer_id)
+        .group_by(CustomerCompany.id).order_by(revenue.desc()).limit(limit)
+    )]
+
+
+def main(argv=None):
+    from src.utils.database import engine
+    from src.utils.migrations import run_migrations
+
+    parser = argparse.ArgumentParser(description="Maintain the dashboard sales summary tables.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+
+    run_migrations(engine)
+    with engine.begin() as connection:
+        rebuild(connection)
+    print("Sales summary rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
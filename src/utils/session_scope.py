@@ -0,0 +1,89 @@
+# src/utils/session_scope.py
+# Short-lived, per-action database sessions. Views open a scope, copy what they
+# need into plain row tuples (see src/models/rows.py) and close it again, so no
+# session outlives a single user action.
+import logging
+import threading
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+class SessionStats:
+    """Counts opened scopes and the identity-map size each one reached before closing."""
+    def __init__(self):
+        # Scopes are also opened on worker threads (see src/utils/workers.py).
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.opened = 0
+        self.active = 0
+        self.last_identity_map_size = 0
+        self.peak_identity_map_size = 0
+
+    def opening(self):
+        with self.lock:
+            self.opened += 1
+            self.active += 1
+
+    def record(self, kind, session):
+        size = len(session.identity_map)
+        with self.lock:
+            self.active -= 1
+            self.last_identity_map_size = size
+            self.peak_identity_map_size = max(self.peak_identity_map_size, size)
+        logger.debug("%s scope closed: %d objects in identity map (%d scopes active)", kind, size, self.active)
+
+    def as_dict(self):
+        return {
+            "opened": self.opened,
+            "active": self.active,
+            "last_identity_map_size": self.last_identity_map_size,
+            "peak_identity_map_size": self.peak_identity_map_size,
+        }
+
+
+session_stats = SessionStats()
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances):
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("Attempted to write inside a read-only session scope.")
+
+
+@contextmanager
+def _scope(kind, session_factory, read_only):
+    session = (session_factory or SessionLocal)()
+    session.info["read_only"] = read_only
+    session_stats.opening()
+    try:
+        yield session
+        if not read_only:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session_stats.record(kind, session)
+        # close() detaches loaded objects without expiring them, so values read
+        # inside a read scope stay usable afterwards.
+        session.close()
+
+
+def read_scope(session_factory=None):
+    """Session for queries only; any flush of pending changes raises ReadOnlySessionError."""
+    return _scope("read", session_factory, read_only=True)
+
+
+def write_scope(session_factory=None):
+    """Session that commits when the block exits cleanly and rolls back on error."""
+    return _scope("write", session_factory, read_only=False)
@@ -0,0 +1,281 @@
+# src/utils/sql_table_model.py
+# A table model that pages rows out of SQLite on demand. Views only
+# ask for more rows (canFetchMore/fetchMore) as the user scrolls, and sorting is
+# done by SQLite with keyset pagination, so opening a table of any size costs
+# one small query.
+from bisect import bisect_left
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from sqlalchemy import tuple_
+from src.utils.session_scope import read_scope
+
+
+class SqlColumn:
+    """One visible column: its header, the row field it shows (a name, a position or a
+    callable taking the row), the SQL expression it sorts by and how to display the value.
+    Columns without a field (e.g. actions) show nothing. A column with `on_edit` is
+    editable: `on_edit(row, value)` persists the change and returns False to reject it."""
+    def __init__(self, header, field=None, sort_expression=None, formatter=None, alignment=None, on_edit=None):
+        self.header = header
+        self.field = field
+        self.sort_expression = sort_expression
+        self.formatter = formatter or (lambda value: "" if value is None else str(value))
+        self.alignment = alignment
+        self.on_edit = on_edit
+
+
+def _bisect_descending(keys, key):
+    """bisect_left for a list sorted in descending order (bisect's key= needs Python 3.10)."""
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key < keys[mid]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _make_row(row_type, values):
+    return tuple(values) if row_type is tuple else row_type(*values)
+
+
+class SqlTableModel(QAbstractTableModel):
+    """Pages the rows of `query_factory(session)` in `page_size` chunks.
+
+    Each result row is wrapped in `row_type` (e.g. a namedtuple from
+    src/models/rows.py) and columns pick their value by field name or position.
+    Sort expressions must not be NULL (wrap them in coalesce) and `key_column`
+    must be unique, since both form the keyset cursor.
+
+    With a `loader` (src/utils/workers.DataLoader) pages are fetched on a worker
+    thread and appended when they arrive; `query_factory` then must not touch
+    widgets. Without one, fetchMore queries synchronously.
+    """
+    RowRole = Qt.ItemDataRole.UserRole
+    # refresh_rows() with more keys than this simply reloads the first page.
+    ROW_REFRESH_LIMIT = 100
+
+    def __init__(self, columns, query_factory, key_column, row_type=tuple, page_size=200,
+                 sort_column=0, sort_order=Qt.SortOrder.AscendingOrder, session_factory=None, loader=None,
+                 parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.query_factory = query_factory
+        self.key_column = key_column
+        self.row_type = row_type
+        self.page_size = page_size
+        self.sort_column = sort_column
+        self.sort_order = sort_order
+        self.session_factory = session_factory
+        self.loader = loader
+        self._rows = []
+        self._sort_keys = []  # (sort value, key) of each loaded row, in display order
+        self._cursor = None
+        self._has_more = True
+        self._fetching = False
+        self._pending_keys = set()
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section].header
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = self.columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column.field is None:
+                return None
+            if callable(column.field):
+                value = column.field(row)
+            elif isinstance(column.field, int):
+                value = row[column.field]
+            else:
+                value = getattr(row, column.field)
+            return column.formatter(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column.alignment is not None:
+            return column.alignment
+        if role == self.RowRole:
+            return row
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.columns[index.column()].on_edit is not None:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        column = self.columns[index.column()] if index.isValid() else None
+        if role != Qt.ItemDataRole.EditRole or column is None or column.on_edit is None:
+            return False
+        row = self._rows[index.row()]
+        if column.on_edit(row, value) is False:
+            return False
+        # Keep the loaded row in step with the database without refetching the page.
+        if isinstance(column.field, str) and hasattr(row, "_replace"):
+            self._rows[index.row()] = row._replace(**{column.field: value})
+        self.dataChanged.emit(index, index)
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more or self._fetching:
+            return
+        page_query = self._page_query()
+        if self.loader is None:
+            with read_scope(self.session_factory) as session:
+                self._append_page(page_query(session))
+        else:
+            self._fetching = True
+            # Keyed on the model, so a refresh supersedes a page still in flight.
+            self.loader.load(self, page_query, self._append_page, self._page_failed)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if self.columns[column].sort_expression is None:
+            return
+        self.sort_column = column
+        self.sort_order = order
+        self.refresh()
+
+    # --- public helpers ---
+    def row_at(self, row):
+        return self._rows[row]
+
+    def set_query_factory(self, query_factory):
+        self.query_factory = query_factory
+        self.refresh()
+
+    def refresh(self):
+        """Drops the loaded rows and fetches the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._sort_keys = []
+        self._cursor = None
+        self._has_more = True
+        self._fetching = False
+        self._pending_keys = set()
+        if self.loader is not None:
+            self.loader.cancel((self, "rows"))
+        self.endResetModel()
+        self.fetchMore()
+
+    def refresh_rows(self, keys):
+        """Re-reads only the rows with these key values.
+
+        Loaded rows are updated in place, or removed if they are gone or no longer
+        match the query; new rows are inserted if they sort into the loaded range
+        (later ones arrive with their page). Many keys fall back to refresh().
+        """
+        keys = set(keys) | self._pending_keys
+        if not keys:
+            return
+        if len(keys) > self.ROW_REFRESH_LIMIT:
+            self.refresh()
+            return
+        rows_query = self._rows_query(keys)
+        if self.loader is None:
+            with read_scope(self.session_factory) as session:
+                self._apply_rows(keys, rows_query(session))
+        else:
+            # Supersedes an earlier row refresh, so its keys are carried over.
+            self._pending_keys = keys
+            self.loader.load((self, "rows"), rows_query, lambda found: self._apply_rows(keys, found))
+
+    # --- paging ---
+    def _ordered_query(self, session, query_factory, sort_expression):
+        return query_factory(session).order_by(None).add_columns(sort_expression, self.key_column)
+
+    def _page_query(self):
+        """Captures the current sort and cursor in a query that can run on any thread."""
+        query_factory, key_column, cursor = self.query_factory, self.key_column, self._cursor
+        sort_expression = self.columns[self.sort_column].sort_expression
+        descending = self.sort_order == Qt.SortOrder.DescendingOrder
+        page_size, row_type = self.page_size, self.row_type
+
+        def page_query(session):
+            query = self._ordered_query(session, query_factory, sort_expression)
+            if cursor is not None:
+                position = tuple_(sort_expression, key_column)
+                query = query.filter(position < tuple_(*cursor) if descending else position > tuple_(*cursor))
+            if descending:
+                query = query.order_by(sort_expression.desc(), key_column.desc())
+            else:
+                query = query.order_by(sort_expression.asc(), key_column.asc())
+            # One extra row tells us whether another page exists.
+            result = query.limit(page_size + 1).all()
+            has_more = len(result) > page_size
+            result = result[:page_size]
+            sort_keys = [(row[-2], row[-1]) for row in result]
+            next_cursor = sort_keys[-1] if sort_keys else cursor
+            return [_make_row(row_type, row[:-2]) for row in result], sort_keys, has_more, next_cursor
+        return page_query
+
+    def _rows_query(self, keys):
+        query_factory, key_column, row_type = self.query_factory, self.key_column, self.row_type
+        sort_expression = self.columns[self.sort_column].sort_expression
+
+        def rows_query(session):
+            query = self._ordered_query(session, query_factory, sort_expression).filter(key_column.in_(list(keys)))
+            return [(_make_row(row_type, row[:-2]), (row[-2], row[-1])) for row in query]
+        return rows_query
+
+    def _append_page(self, page):
+        rows, sort_keys, self._has_more, self._cursor = page
+        self._fetching = False
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self._sort_keys.extend(sort_keys)
+            self.endInsertRows()
+
+    def _page_failed(self, message):
+        self._fetching = False
+        self._has_more = False
+
+    # --- targeted row updates ---
+    def _before(self, a, b):
+        return a > b if self.sort_order == Qt.SortOrder.DescendingOrder else a < b
+
+    def _apply_rows(self, keys, found):
+        self._pending_keys = self._pending_keys - keys
+        found = {sort_key[1]: (row, sort_key) for row, sort_key in found}
+        for key in keys:
+            position = next((i for i, sort_key in enumerate(self._sort_keys) if sort_key[1] == key), None)
+            match = found.get(key)
+            if position is not None:
+                if match and match[1] == self._sort_keys[position]:
+                    self._rows[position] = match[0]
+                    self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.columns) - 1))
+                    continue
+                self.beginRemoveRows(QModelIndex(), position, position)
+                del self._rows[position]
+                del self._sort_keys[position]
+                self.endRemoveRows()
+            if match:
+                self._insert_row(*match)
+
+    def _insert_row(self, row, sort_key):
+        # Rows past the cursor belong to a page that has not been fetched yet.
+        if self._has_more and (self._cursor is None or not self._before(sort_key, self._cursor)):
+            return
+        if self.sort_order == Qt.SortOrder.DescendingOrder:
+            position = _bisect_descending(self._sort_keys, sort_key)
+        else:
+            position = bisect_left(self._sort_keys, sort_key)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, row)
+        self._sort_keys.insert(position, sort_key)
+        self.endInsertRows()
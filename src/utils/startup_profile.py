@@ -0,0 +1,53 @@
+# src/utils/startup_profile.py
+# Startup timing report. Set BILLING_STARTUP_PROFILE=1 to print how long imports,
+# database initialisation, window construction and each tab took.
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ENABLED = bool(os.environ.get("BILLING_STARTUP_PROFILE"))
+
+
+class StartupProfile:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.timings = []  # (label, seconds, depth) in the order they finished
+        self.reported = False
+        self._depth = 0
+
+    def record(self, label, seconds, depth=0):
+        self.timings.append((label, seconds, depth))
+        if self.enabled and self.reported:
+            # Tabs built after startup are still worth knowing about.
+            print(f"{label}: {seconds * 1000:.1f} ms", file=sys.stderr)
+
+    @contextmanager
+    def measure(self, label):
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.record(label, time.perf_counter() - start, self._depth)
+
+    def format_report(self):
+        """Nested measurements are indented under their parent and left out of the total."""
+        width = max((len(label) + 2 * depth for label, _, depth in self.timings), default=0)
+        lines = ["Startup timings:"]
+        for label, seconds, depth in self.timings:
+            lines.append(f"  {'  ' * depth + label:<{width}}  {seconds * 1000:8.1f} ms")
+        total = sum(seconds for _, seconds, depth in self.timings if depth == 0)
+        lines.append(f"  {'total':<{width}}  {total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def report(self, stream=None):
+        """Prints the timings once, if profiling is enabled."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print(self.format_report(), file=stream or sys.stderr)
+
+
+startup_profile = StartupProfile()
@@ -0,0 +1,160 @@
+# src/utils/workers.py
+# Runs read queries on QThreadPool workers so the GUI thread never waits on
+# SQLite. Each task opens its own read scope inside the worker thread, so a
+# session never crosses threads, and hands back plain values (row tuples,
+# numbers) through a queued signal.
+import logging
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from src.utils.session_scope import read_scope
+
+logger = logging.getLogger(__name__)
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object, int, object)  # key, generation, result
+    failed = pyqtSignal(object, int, str)       # key, generation, message
+
+
+class QueryTask(QRunnable):
+    """Runs `query(session)` inside a read scope on a pool thread.
+
+    The query must return detached values only; ORM objects would be expired
+    as soon as the scope closes.
+    """
+    def __init__(self, key, generation, query, session_factory=None):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.query = query
+        self.session_factory = session_factory
+        self.cancelled = threading.Event()
+        self.signals = _TaskSignals()
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            with read_scope(self.session_factory) as session:
+                result = self.query(session)
+        except Exception as exc:
+            logger.exception("Background query %r failed", self.key)
+            self.signals.failed.emit(self.key, self.generation, str(exc))
+            return
+        self.signals.finished.emit(self.key, self.generation, result)
+
+
+class DataLoader(QObject):
+    """Schedules background queries for one view and delivers only the latest result per key.
+
+    load(key, query, on_result) supersedes any earlier request with the same key:
+    a queued one is taken off the pool, a running one has its result dropped.
+    loadingChanged(bool) flips when the first request starts and the last one ends.
+    """
+    loadingChanged = pyqtSignal(bool)
+    failed = pyqtSignal(object, str)  # key, message
+
+    def __init__(self, parent=None, session_factory=None, pool=None):
+        super().__init__(parent)
+        self.session_factory = session_factory
+        self.pool = pool or QThreadPool.globalInstance()
+        self._generations = {}
+        self._pending = {}  # key -> (task, on_result, on_error)
+
+    def load(self, key, query, on_result, on_error=None):
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        was_loading = self.is_loading()
+        self._cancel(key)
+
+        task = QueryTask(key, generation, query, self.session_factory)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._pending[key] = (task, on_result, on_error)
+        if not was_loading:
+            self.loadingChanged.emit(True)
+        self.pool.start(task)
+        return generation
+
+    def cancel(self, key):
+        """Drops the request for `key`, if any."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._cancel(key)
+        if key in self._pending:
+            del self._pending[key]
+            self._emit_if_idle()
+
+    def is_loading(self):
+        return bool(self._pending)
+
+    def _cancel(self, key):
+        pending = self._pending.get(key)
+        if pending:
+            task = pending[0]
+            task.cancelled.set()
+            self.pool.tryTake(task)
+
+    def _take(self, key, generation):
+        """Returns the callbacks for a result that is still current, else None."""
+        if self._generations.get(key) != generation or key not in self._pending:
+            return None
+        _, on_result, on_error = self._pending.pop(key)
+        return on_result, on_error
+
+    def _emit_if_idle(self):
+        if not self._pending:
+            self.loadingChanged.emit(False)
+
+    @pyqtSlot(object, int, object)
+    def _on_finished(self, key, generation, result):
+        callbacks = self._take(key, generation)
+        if callbacks is None:
+            return
+        try:
+            callbacks[0](result)
+        finally:
+            self._emit_if_idle()
+
+    @pyqtSlot(object, int, str)
+    def _on_failed(self, key, generation, message):
+        callbacks = self._take(key, generation)
+        if callbacks is None:
+            return
+        try:
+            if callbacks[1]:
+                callbacks[1](message)
+            self.failed.emit(key, message)
+        finally:
+            self._emit_if_idle()
+
+
+class _JobSignals(QObject):
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class JobTask(QRunnable):
+    """Runs a long job, e.g. a bulk export, on a pool thread.
+
+    The job is called as job(progress, cancelled): progress(done, total) reports
+    through the progress signal, and cancelled is a threading.Event the job
+    should check between steps; cancel() sets it.
+    """
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.cancelled = threading.Event()
+        self.signals = _JobSignals()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        try:
+            result = self.job(self.signals.progress.emit, self.cancelled)
+        except Exception as exc:
+            logger.exception("Background job failed")
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.finished.emit(result)
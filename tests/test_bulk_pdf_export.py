@@ -0,0 +1,104 @@
+# tests/test_bulk_pdf_export.py
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+import zipfile
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.bulk_pdf_export import export_invoices, BulkExportError
+from src.models import CustomerCompany, Invoice, InvoiceItem, UserSettings
+
+
+class TestBulkPdfExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp_dir.name, "pdfs")
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.add(UserSettings(company_name="Test Company", state_code="27"))
+            customer = CustomerCompany(name="Acme", address="1 Main St", state_code="27")
+            for i in range(12):
+                session.add(Invoice(
+                    invoice_number=f"INV/{i:03d}", customer=customer, date=datetime.date(2024, 1, 1 + i),
+                    total_amount=20.0,
+                    items=[InvoiceItem(product_name="Widget", quantity=2, price_per_unit=10.0)],
+                ))
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _export(self, **kwargs):
+        kwargs.setdefault("workers", 2)
+        return export_invoices(self.output_dir, session_factory=self.Session, **kwargs)
+
+    def test_exports_a_date_range(self):
+        progress = []
+        result = self._export(date_from=datetime.date(2024, 1, 3), date_to=datetime.date(2024, 1, 7),
+                              progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual(result.total, 5)
+        self.assertEqual(result.failed, [])
+        self.assertFalse(result.cancelled)
+        self.assertEqual(sorted(os.listdir(self.output_dir)),
+                         [f"invoice_INV-{i:03d}.pdf" for i in range(2, 7)])
+        self.assertEqual(progress[0], (0, 5))
+        self.assertEqual(progress[-1], (5, 5))
+
+    def test_exports_a_number_range_in_small_chunks(self):
+        result = self._export(number_from="INV/004", number_to="INV/010", chunk_size=2)
+        self.assertEqual(result.total, 7)
+        self.assertEqual(len(result.written), 7)
+        for path in result.written:
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(5), b"%PDF-")
+
+    def test_exports_into_a_zip(self):
+        output = os.path.join(self.tmp_dir.name, "out", "invoices.zip")
+        result = export_invoices(output, date_to=datetime.date(2024, 1, 3), workers=2, session_factory=self.Session)
+        self.assertEqual(sorted(result.written), [f"invoice_INV-{i:03d}.pdf" for i in range(3)])
+        with zipfile.ZipFile(output) as archive:
+            self.assertEqual(sorted(archive.namelist()), sorted(result.written))
+            self.assertEqual(archive.read(result.written[0])[:5], b"%PDF-")
+        self.assertEqual(os.listdir(os.path.dirname(output)), ["invoices.zip"])
+
+    def test_unknown_invoice_number(self):
+        with self.assertRaises(ValueError):
+            self._export(number_from="INV/999")
+
+    def test_cancelled_before_the_first_chunk(self):
+        cancelled = threading.Event()
+        cancelled.set()
+        result = self._export(cancelled=cancelled)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(result.total, 12)
+        self.assertEqual(result.written, [])
+
+    def test_cancelled_zip_export_keeps_the_existing_archive(self):
+        output = os.path.join(self.tmp_dir.name, "invoices.zip")
+        with open(output, "wb") as f:
+            f.write(b"complete archive")
+        cancelled = threading.Event()
+        result = export_invoices(output, workers=1, chunk_size=1, session_factory=self.Session,
+                                 progress=lambda done, total: done and cancelled.set(), cancelled=cancelled)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(result.written, [])
+        with open(output, "rb") as f:
+            self.assertEqual(f.read(), b"complete archive")
+        self.assertFalse([name for name in os.listdir(self.tmp_dir.name) if name.endswith(".tmp")])
+
+    def test_requires_settings(self):
+        with self.Session() as session:
+            session.query(UserSettings).delete()
+            session.commit()
+        with self.assertRaises(BulkExportError):
+            self._export()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_company_list_model.py
+import unittest
+from unittest import mock
+from PyQt6.QtCore import Qt
+from src.utils.company_list_model import CompanyListModel, CompanyFilterModel
+from src.models.rows import CompanyRow
+
+
+def make_companies(count):
+    return [CompanyRow(i, f"Company {i:05d}", None, None, None, None) for i in range(1, count + 1)]
+
+
+class TestCompanyListModel(unittest.TestCase):
+    def setUp(self):
+        self.model = CompanyListModel()
+        self.counts = []
+        self.model.checkedCountChanged.connect(self.counts.append)
+        self.model.set_companies(make_companies(20000))
+
+    def test_check_state_role_tracks_count(self):
+        index = self.model.index(5)
+        self.assertEqual(index.data(Qt.ItemDataRole.CheckStateRole), Qt.CheckState.Unchecked)
+        self.assertTrue(self.model.setData(index, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole))
+        self.model.setData(index, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+        self.assertEqual(index.data(Qt.ItemDataRole.CheckStateRole), Qt.CheckState.Checked)
+        self.assertEqual(self.model.checked_ids(), [6])
+        # Re-checking a checked row does not notify again.
+        self.assertEqual(self.counts, [0, 1])
+
+    def test_select_all_visible_rows_through_the_filter(self):
+        proxy = CompanyFilterModel(self.model)
+        proxy.setFilterFixedString("company 001")
+        self.assertEqual(proxy.rowCount(), 100)
+        self.model.set_checked(proxy.visible_ids(), True)
+        self.assertEqual(self.model.checked_count(), 100)
+        self.assertEqual(self.counts[-1], 100)
+
+    def test_reload_keeps_checks_of_remaining_companies(self):
+        self.model.set_checked([1, 2, 3], True)
+        self.model.set_companies(make_companies(2))
+        self.assertEqual(sorted(self.model.checked_ids()), [1, 2])
+        self.assertEqual(self.model.index_of(2).row(), 1)
+        self.assertFalse(self.model.index_of(3).isValid())
+
+    def test_apply_changes_renames_inserts_and_removes(self):
+        self.model.set_checked([3, 4], True)
+        self.model.apply_changes(
+            [CompanyRow(2, "Company 99999", None, None, None, None),
+             CompanyRow(20001, "Company 00005a", None, None, None, None)],
+            removed_ids=[4, 7],
+        )
+        names = [self.model.index(row).data() for row in range(self.model.rowCount())]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(self.model.rowCount(), 20000 - 2 + 1)
+        self.assertEqual(self.model.index_of(2).row(), self.model.rowCount() - 1)
+        self.assertEqual(self.model.index_of(20001).data(), "Company 00005a")
+        self.assertFalse(self.model.index_of(7).isValid())
+        self.assertEqual(self.model.checked_ids(), [3])
+
+
+    def test_apply_changes_reindexes_once_per_batch(self):
+        changes = [CompanyRow(i, f"Company {i:05d}b", None, None, None, None) for i in range(1, 50)]
+        with mock.patch.object(self.model, "_reindex", wraps=self.model._reindex) as reindex:
+            self.model.apply_changes(changes, removed_ids=range(100, 150))
+        self.assertEqual(reindex.call_count, 1)
+        self.assertEqual((self.model.index_of(49).row(), self.model.index_of(150).row()), (48, 99))
+
+if __name__ == '__main__':
+    unittest.main()
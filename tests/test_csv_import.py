@@ -0,0 +1,271 @@
+# tests/test_csv_import.py
+import csv
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from PyQt6.QtCore import QCoreApplication
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils import csv_import, sales_summary
+from src.utils.csv_manager import CsvManager
+from src.utils.invoice_number_service import InvoiceNumberService
+from src.utils.event_bus import event_bus
+from src.models import (AuditLog, CustomerCompany, DailyProductSales, ImportCheckpoint, Inventory, Invoice,
+                        InvoiceItem, InvoiceSequence, Product)
+
+HEADER = ["CompanyName", "Address", "State", "GSTIN", "ProductName", "Price"]
+
+
+class TestCatalogueImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.add(CustomerCompany(name="Existing", state="Maharashtra", state_code="27"))
+            session.commit()
+        self.file_name = os.path.join(self.tmp_dir.name, "products.csv")
+        rows = [["Existing", "", "", "", "Bolt", "2.5"]]
+        for i in range(20):
+            rows.append([f"Supplier {i % 3}", "1 Main St", "Karnataka (Code: 29)", "29ABC", f"Part {i}", str(i)])
+        rows.append(["", "", "", "", "Orphan", "1"])
+        rows.append(["Supplier 0", "", "", "", "Broken", "n/a"])
+        self.write_csv(rows)
+
+    def tearDown(self):
+        # Imports publish change events once an application exists; deliver them now, not to later tests.
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.processEvents()
+            event_bus.flush()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def write_csv(self, rows):
+        with open(self.file_name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+
+    def import_catalogue(self, **kwargs):
+        return csv_import.import_catalogue(self.file_name, chunk_size=4, session_factory=self.Session, **kwargs)
+
+    def test_import_across_chunks(self):
+        progress = []
+        result = self.import_catalogue(progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual((result.rows, result.companies, result.products, result.skipped), (23, 3, 21, 1))
+        self.assertEqual(result.errors, [(24, "Price 'n/a' of 'Broken' is not a number.")])
+        self.assertEqual(progress[0], (0, 23))
+        self.assertEqual(progress[-1], (23, 23))
+
+        with self.Session() as session:
+            self.assertEqual(session.query(CustomerCompany).count(), 4)
+            supplier = session.query(CustomerCompany).filter_by(name="Supplier 1").one()
+            self.assertEqual((supplier.state, supplier.state_code, supplier.gstin), ("Karnataka", "29", "29ABC"))
+            self.assertEqual(len(supplier.products), 7)
+            bolt = session.query(Product).filter_by(name="Bolt").one()
+            self.assertEqual((bolt.company.name, bolt.price), ("Existing", 2.5))
+            self.assertEqual(session.query(Inventory).filter_by(stock_quantity=0).count(), 21)
+            self.assertEqual(session.query(ImportCheckpoint).count(), 0)
+            self.assertEqual(session.query(AuditLog).filter_by(action="IMPORT").count(), 1)
+
+    def test_failed_import_resumes_after_the_last_committed_chunk(self):
+        write = csv_import._CatalogueChunk.write
+        calls = []
+
+        def fail_third_chunk(chunk, session):
+            calls.append(chunk)
+            if len(calls) == 3:
+                raise RuntimeError("disk full")
+            write(chunk, session)
+
+        with mock.patch.object(csv_import._CatalogueChunk, "write", fail_third_chunk):
+            with self.assertRaises(RuntimeError):
+                self.import_catalogue()
+        with self.Session() as session:
+            self.assertEqual(session.query(ImportCheckpoint).one().rows_done, 8)
+            self.assertEqual(session.query(Product).count(), 8)
+
+        result = self.import_catalogue()
+        self.assertEqual((result.resumed_from, result.rows), (8, 15))
+        with self.Session() as session:
+            self.assertEqual(session.query(Product).count(), 21)
+            self.assertEqual(session.query(CustomerCompany).count(), 4)
+
+    def test_resumed_import_keeps_the_rows_earlier_runs_rejected(self):
+        rows = [["Supplier 0", "", "", "", "Cracked", "?"]]
+        rows += [["Supplier 1", "", "", "", f"Part {i}", str(i)] for i in range(20)]
+        rows.insert(9, ["Supplier 1", "", "", "", "Bent", "-"])
+        rows.append(["Supplier 0", "", "", "", "Broken", "n/a"])
+        self.write_csv(rows)
+        report = os.path.join(self.tmp_dir.name, "products_errors.csv")
+        write = csv_import._CatalogueChunk.write
+        calls = []
+
+        def fail_third_chunk(chunk, session):
+            calls.append(chunk)
+            if len(calls) == 3:
+                raise RuntimeError("disk full")
+            write(chunk, session)
+
+        with mock.patch.object(csv_import._CatalogueChunk, "write", fail_third_chunk):
+            with self.assertRaises(RuntimeError):
+                self.import_catalogue(error_report=report)
+        result = self.import_catalogue(error_report=report)
+        self.assertEqual((result.resumed_from, result.error_count), (8, 2))
+
+        with open(report, newline="", encoding="utf-8") as f:
+            lines = list(csv.reader(f))
+        # The failed chunk's error is reported once, by the run that committed it.
+        self.assertEqual(lines[0], ["Line", "Error"])
+        self.assertEqual([line for line, _ in lines[1:]], ["2", "11", "24"])
+
+    def test_cancelled_import_resumes(self):
+        cancelled = threading.Event()
+        result = self.import_catalogue(progress=lambda done, total: done >= 4 and cancelled.set(),
+                                       cancelled=cancelled)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(result.rows, 4)
+        self.assertEqual(self.import_catalogue().resumed_from, 4)
+
+    def test_changed_file_starts_over(self):
+        with self.Session() as session:
+            session.add(ImportCheckpoint(kind=csv_import.CATALOGUE, source=os.path.abspath(self.file_name),
+                                         file_size=1, file_mtime_ns=1, rows_done=8))
+            session.commit()
+        result = self.import_catalogue()
+        self.assertEqual((result.resumed_from, result.products), (0, 21))
+
+    def test_missing_company_column(self):
+        with open(self.file_name, "w", encoding="utf-8") as f:
+            f.write("Name,Price\nBolt,1\n")
+        with self.assertRaises(csv_import.CsvImportError):
+            self.import_catalogue()
+
+
+
+class TestInvoiceImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            acme = CustomerCompany(name="Acme", state_code="27")
+            other = CustomerCompany(name="Other", state_code="27")
+            session.add_all([acme, other, Product(name="Bolt", price=1.0, company=other),
+                             Product(name="Bolt", price=2.0, company=acme), Product(name="Nut", price=1.0, company=other),
+                             InvoiceSequence(series="INV", last_value=3)])
+            session.add(Invoice(invoice_number="INV-00001", customer=acme, date=datetime.date(2020, 1, 1),
+                                total_amount=5.0))
+            session.commit()
+            self.bolt_id = session.query(Product.id).filter_by(name="Bolt", company_id=acme.id).scalar()
+            self.nut_id = session.query(Product.id).filter_by(name="Nut").scalar()
+        self.file_name = os.path.join(self.tmp_dir.name, "invoices.csv")
+        self.report = os.path.join(self.tmp_dir.name, "invoices_errors.csv")
+        rows = []
+        for i in range(10, 20):
+            rows.append([f"INV-{i:05d}", "Acme", f"{i}/03/2019", "MH12", "", "Paid", "Bolt", "2", "2.5"])
+            rows.append([f"INV-{i:05d}", "Acme", "", "", "", "", "Nut", "1", "4"])
+        rows += [
+            ["INV-00001", "Acme", "2019-01-01", "", "9", "", "Bolt", "1", "9"],  # already imported
+            ["LEGACY/7", "Acme", "2019-04-01", "", "100", "", "", "", ""],      # header only
+            ["LEGACY/8", "Nobody", "2019-04-02", "", "", "", "Bolt", "1", "1"],
+            ["LEGACY/9", "Acme", "2019-04-03", "", "", "", "Bolt", "1", "1"],
+            ["LEGACY/9", "Acme", "", "", "", "", "Bolt", "lots", "1"],
+            ["INV-00011", "Acme", "2019-04-04", "", "", "", "Bolt", "1", "1"],   # earlier in this file
+        ]
+        with open(self.file_name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(csv_import.INVOICE_COLUMNS)
+            writer.writerows(rows)
+
+    def tearDown(self):
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.processEvents()
+            event_bus.flush()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def import_invoices(self, **kwargs):
+        return csv_import.import_invoices(self.file_name, chunk_size=5, session_factory=self.Session,
+                                          error_report=self.report, **kwargs)
+
+    def test_import_with_items(self):
+        result = self.import_invoices()
+        self.assertEqual((result.rows, result.invoices, result.items, result.duplicates), (26, 11, 20, 2))
+        self.assertEqual(result.error_count, 4)
+        with open(self.report, newline="", encoding="utf-8") as f:
+            report = list(csv.reader(f))
+        self.assertEqual(report[0], ["Line", "Error"])
+        self.assertEqual([line for line, _ in report[1:]], ["22", "24", "26", "27"])
+        self.assertIn("LEGACY/9: Quantity 'lots'", report[3][1])
+
+        with self.Session() as session:
+            invoice = session.query(Invoice).filter_by(invoice_number="INV-00012").one()
+            self.assertEqual((invoice.date, invoice.total_amount, invoice.payment_status, invoice.vehicle_number),
+                             (datetime.date(2019, 3, 12), 9.0, "Paid", "MH12"))
+            # The customer's Bolt, and the only Nut there is.
+            self.assertEqual(sorted((item.product_id, item.quantity) for item in invoice.items),
+                             sorted([(self.bolt_id, 2), (self.nut_id, 1)]))
+            legacy = session.query(Invoice).filter_by(invoice_number="LEGACY/7").one()
+            self.assertEqual((legacy.total_amount, legacy.items), (100.0, []))
+            self.assertFalse(session.query(Invoice).filter(Invoice.invoice_number.in_(["LEGACY/8", "LEGACY/9"])).all())
+            self.assertEqual(session.query(InvoiceItem).count(), 20)
+
+            # Only the imported invoices; INV-00001 was added without the summary tables.
+            self.assertEqual(sales_summary.status_totals(session), (11, 10, 90.0 + 100.0))
+            self.assertEqual(session.query(DailyProductSales.quantity).filter_by(
+                day=datetime.date(2019, 3, 15), product_name="Bolt").scalar(), 2)
+            # New invoices are numbered after the imported ones.
+            self.assertEqual(InvoiceNumberService().get_next_invoice_number(session), "INV-00020")
+
+    def test_resume_skips_committed_invoices(self):
+        cancelled = threading.Event()
+        result = self.import_invoices(progress=lambda done, total: done >= 6 and cancelled.set(),
+                                      cancelled=cancelled)
+        # Chunks end after whole invoices.
+        self.assertEqual((result.cancelled, result.rows, result.invoices), (True, 6, 3))
+        result = self.import_invoices()
+        self.assertEqual((result.resumed_from, result.invoices, result.duplicates), (6, 8, 2))
+        with self.Session() as session:
+            self.assertEqual(session.query(Invoice).count(), 12)
+
+    def test_resumed_import_keeps_the_rows_earlier_runs_rejected(self):
+        cancelled = threading.Event()
+
+        def import_invoices(**kwargs):
+            # Two invoices a chunk, so the run is cancelled after the first rejected row.
+            return csv_import.import_invoices(self.file_name, chunk_size=2, session_factory=self.Session,
+                                              error_report=self.report, **kwargs)
+
+        result = import_invoices(progress=lambda done, total: done >= 22 and cancelled.set(), cancelled=cancelled)
+        self.assertEqual((result.cancelled, result.rows, result.error_count), (True, 22, 1))
+        result = import_invoices()
+        self.assertEqual((result.resumed_from, result.error_count), (22, 3))
+
+        with open(self.report, newline="", encoding="utf-8") as f:
+            report = list(csv.reader(f))
+        self.assertEqual(report[0], ["Line", "Error"])
+        self.assertEqual([line for line, _ in report[1:]], ["22", "24", "26", "27"])
+
+    def test_export_round_trip(self):
+        self.import_invoices()
+        export = os.path.join(self.tmp_dir.name, "export.csv")
+        with mock.patch("src.utils.csv_manager.write_scope",
+                        lambda: csv_import.write_scope(self.Session)):
+            self.assertTrue(CsvManager().export_invoices(export)[0])
+        with self.Session() as session:
+            session.query(InvoiceItem).delete()
+            session.query(Invoice).delete()
+            session.commit()
+        result = csv_import.import_invoices(export, session_factory=self.Session)
+        self.assertEqual((result.invoices, result.items, result.error_count), (12, 20, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
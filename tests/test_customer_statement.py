@@ -0,0 +1,131 @@
+# tests/test_customer_statement.py
+import datetime
+import io
+import os
+import re
+import tempfile
+import threading
+import unittest
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.invoice_documents import pdf_settings
+from src.utils.invoice_template import InvoiceTemplate
+from src.utils import customer_statement
+from src.utils.customer_statement import StatementLine, StatementSummary
+from src.models import CustomerCompany, Invoice, InvoiceItem, Payment, UserSettings
+
+
+class TestCustomerStatement(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.add(UserSettings(company_name="Test Company", state_code="27"))
+            customer = CustomerCompany(name="Acme Traders", address="1 Main St", state_code="27")
+            other = CustomerCompany(name="Other", state_code="27")
+            # Added out of date order, so id order and date order differ.
+            for i, day in enumerate([5, 1, 20, 10, 15, 3]):
+                invoice = Invoice(invoice_number=f"INV/{i:03d}", customer=customer, date=datetime.date(2024, 3, day),
+                                  total_amount=100.0,
+                                  items=[InvoiceItem(product_name="Widget", quantity=2, price_per_unit=50.0)])
+                session.add(invoice)
+                session.add(Payment(invoice=invoice, payment_date=datetime.date(2024, 3, day + 2),
+                                    amount_paid=50.0, payment_method="UPI"))
+            session.add(Invoice(invoice_number="OTHER/1", customer=other, date=datetime.date(2024, 3, 6),
+                                total_amount=999.0,
+                                items=[InvoiceItem(product_name="Widget", quantity=1, price_per_unit=999.0)]))
+            session.commit()
+            self.customer_id = customer.id
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_summary_splits_opening_balance_from_the_range(self):
+        with self.Session() as session:
+            summary = customer_statement.statement_summary(
+                session, self.customer_id, datetime.date(2024, 3, 4), datetime.date(2024, 3, 16))
+        # Invoices on the 1st and 3rd, payments on the 3rd, come before the range.
+        self.assertEqual((summary.opening_invoiced, summary.opening_received), (200.0, 50.0))
+        self.assertEqual((summary.invoice_count, summary.invoiced), (3, 300.0))
+        self.assertEqual((summary.payment_count, summary.received), (3, 150.0))
+        self.assertEqual(summary.customer["name"], "Acme Traders")
+
+    def test_lines_are_in_date_order_across_chunks(self):
+        with self.Session() as session:
+            lines = list(customer_statement.iter_statement_lines(
+                session, self.customer_id, datetime.date(2024, 3, 1), datetime.date(2024, 3, 31), chunk_size=2))
+            invoices = list(customer_statement.iter_statement_invoices(
+                session, self.customer_id, datetime.date(2024, 3, 1), datetime.date(2024, 3, 31), chunk_size=2))
+        self.assertEqual(len(lines), 12)
+        self.assertEqual([line.date for line in lines], sorted(line.date for line in lines))
+        # The 3rd has an invoice and a payment; the invoice comes first.
+        third = [line.kind for line in lines if line.date == datetime.date(2024, 3, 3)]
+        self.assertEqual(third, [customer_statement.INVOICE, customer_statement.PAYMENT])
+        self.assertEqual([invoice["date"] for invoice in invoices],
+                         ["2024-03-01", "2024-03-03", "2024-03-05", "2024-03-10", "2024-03-15", "2024-03-20"])
+
+    def test_write_statement(self):
+        output = os.path.join(self.tmp_dir.name, "out", "statement.pdf")
+        progress = []
+        summary = customer_statement.write_statement(
+            output, self.customer_id, datetime.date(2024, 3, 1), datetime.date(2024, 3, 31), chunk_size=2,
+            progress=lambda done, total: progress.append((done, total)), session_factory=self.Session)
+        self.assertEqual(summary.invoice_count, 6)
+        self.assertEqual(progress[-1], (6, 6))
+        with open(output, "rb") as f:
+            pdf = f.read()
+        # The ledger page and one page per invoice.
+        self.assertEqual(pdf.count(b"/Type /Page\n"), 7)
+        self.assertEqual(os.listdir(os.path.dirname(output)), ["statement.pdf"])
+
+    def test_cancelled_statement_writes_nothing(self):
+        cancelled = threading.Event()
+        cancelled.set()
+        output = os.path.join(self.tmp_dir.name, "statement.pdf")
+        result = customer_statement.write_statement(
+            output, self.customer_id, datetime.date(2024, 3, 1), datetime.date(2024, 3, 31),
+            cancelled=cancelled, session_factory=self.Session)
+        self.assertIsNone(result)
+        self.assertFalse([name for name in os.listdir(self.tmp_dir.name) if not name.startswith("test.db")])
+
+    def test_unknown_customer(self):
+        with self.assertRaises(ValueError):
+            customer_statement.write_statement(os.path.join(self.tmp_dir.name, "s.pdf"), 999,
+                                               datetime.date(2024, 3, 1), datetime.date(2024, 3, 31),
+                                               session_factory=self.Session)
+
+
+class TestStatementLedger(unittest.TestCase):
+    def test_long_ledger_carries_the_balance_over(self):
+        settings = pdf_settings(UserSettings(company_name="Test Company", state_code="27"))
+        summary = StatementSummary({"name": "Acme", "address": "", "gstin": "", "state_code": "27"},
+                                   datetime.date(2024, 1, 1), datetime.date(2024, 12, 31),
+                                   100.0, 18.0, 200 * 100.0, 200 * 50.0, 200, 200)
+        day = datetime.date(2024, 1, 1)
+        lines = (line for i in range(200) for line in (
+            StatementLine(day, customer_statement.INVOICE, f"INV/{i}", "Invoice", 100.0),
+            StatementLine(day, customer_statement.PAYMENT, f"INV/{i}", "Payment", 50.0)))
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter, pageCompression=0)
+        InvoiceTemplate(c, *letter, settings).draw_statement(summary, lines)
+        c.save()
+        pdf = buffer.getvalue().decode("latin-1")
+
+        carried = re.findall(r"\(Carried forward\) Tj.*?\((?:\\\d{3})?([\d.]+)\) Tj", pdf, re.S)
+        brought = re.findall(r"\(Brought forward\) Tj.*?\((?:\\\d{3})?([\d.]+)\) Tj", pdf, re.S)
+        self.assertGreater(len(carried), 5)
+        self.assertEqual(carried, brought)
+        pages = pdf.count("/Type /Page\n")
+        self.assertIn(f"(Page {pages} of {pages}) Tj", pdf)
+        # Opening 118 - 18; each invoice adds 118 and each payment takes 50.
+        self.assertEqual(re.findall(r"\(Closing balance\) Tj.*?\((?:\\\d{3})?([\d.]+)\) Tj", pdf, re.S), ["13700.00"])
+
+
+if __name__ == '__main__':
+    unittest.main()
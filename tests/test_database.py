@@ -0,0 +1,45 @@
+# tests/test_database.py
+import os
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.utils.database import create_db_engine, get_storage_profile
+
+
+class TestStorageProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "test.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_desktop_profile_applies_pragmas(self):
+        engine = create_db_engine(self.db_path, "desktop")
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+            self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+            self.assertEqual(conn.execute(text("PRAGMA temp_store")).scalar(), 2)  # MEMORY
+        engine.dispose()
+
+    def test_read_only_profile_rejects_writes(self):
+        writer = create_db_engine(self.db_path, "desktop")
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        reader = create_db_engine(self.db_path, "read-only-reporting")
+        with reader.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM t")).scalar(), 0)
+            with self.assertRaises(OperationalError):
+                conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+        reader.dispose()
+        writer.dispose()
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_storage_profile("turbo")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/test_delegates.py
+import os
+import unittest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtTest import QTest
+from src.utils.delegates import ButtonsDelegate
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestButtonsDelegate(unittest.TestCase):
+    def setUp(self):
+        self.clicks = []
+        self.table = QTableWidget(3, 2)
+        for row in range(3):
+            self.table.setItem(row, 0, QTableWidgetItem(f"row {row}"))
+        self.delegate = ButtonsDelegate([
+            ("Download", lambda index: self.clicks.append(("Download", index.row()))),
+            ("Share", lambda index: self.clicks.append(("Share", index.row()))),
+        ], self.table)
+        self.table.setItemDelegateForColumn(1, self.delegate)
+        self.table.setColumnWidth(1, 300)
+        self.table.resize(500, 300)
+        self.table.show()
+
+    def tearDown(self):
+        self.table.close()
+
+    def _click(self, row, x_offset):
+        rect = self.table.visualRect(self.table.model().index(row, 1))
+        QTest.mouseClick(self.table.viewport(), Qt.MouseButton.LeftButton, pos=QPoint(rect.left() + x_offset, rect.center().y()))
+
+    def test_clicks_dispatch_to_the_button_under_the_cursor(self):
+        share_left = self.table.fontMetrics().horizontalAdvance("Download") + 24 + ButtonsDelegate.MARGIN + ButtonsDelegate.SPACING
+        self._click(2, ButtonsDelegate.MARGIN + 5)
+        self._click(0, share_left + 5)
+        self.assertEqual(self.clicks, [("Download", 2), ("Share", 0)])
+
+    def test_rows_own_no_widgets(self):
+        for row in range(3):
+            self.assertIsNone(self.table.indexWidget(self.table.model().index(row, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
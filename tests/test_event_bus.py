@@ -0,0 +1,79 @@
+# tests/test_event_bus.py
+import os
+import tempfile
+import unittest
+from PyQt6.QtCore import QCoreApplication
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.event_bus import event_bus, record_change, ChangeBatch, ChangeEvent, CREATED, UPDATED, DELETED
+from src.models import CustomerCompany
+
+
+class TestChangeBatch(unittest.TestCase):
+    def test_coalesces_per_entity(self):
+        batch = ChangeBatch([
+            ChangeEvent("Company", 1, CREATED), ChangeEvent("Company", 1, UPDATED),
+            ChangeEvent("Company", 2, UPDATED), ChangeEvent("Company", 2, DELETED),
+            ChangeEvent("Product", None, UPDATED),
+        ])
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.ids("Company", kinds=(CREATED,)), {1})
+        self.assertEqual(batch.ids("Company", kinds=(DELETED,)), {2})
+        self.assertTrue(batch.has_unknown("Product"))
+        self.assertFalse(batch.has_unknown("Company"))
+        self.assertFalse(batch.affects("Invoice"))
+
+
+class TestEventBus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.batches = []
+        event_bus.changed.connect(self.batches.append)
+
+    def tearDown(self):
+        event_bus.changed.disconnect(self.batches.append)
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _deliver(self):
+        self.app.processEvents()
+        event_bus.flush()
+
+    def test_publishes_after_commit_in_one_batch(self):
+        with self.Session() as session:
+            companies = [CustomerCompany(name=f"Company {i}") for i in range(3)]
+            session.add_all(companies)
+            for company in companies:
+                record_change(session, "Company", company, CREATED)
+            self._deliver()
+            self.assertEqual(self.batches, [])
+            session.commit()
+            ids = {company.id for company in companies}
+        with self.Session() as session:
+            record_change(session, "Company", min(ids), UPDATED)
+            session.commit()
+        self._deliver()
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(self.batches[0].ids("Company"), ids)
+        self.assertEqual(self.batches[0].ids("Company", kinds=(UPDATED,)), set())
+
+    def test_rollback_discards_changes(self):
+        with self.Session() as session:
+            session.add(CustomerCompany(name="Gone"))
+            record_change(session, "Company", 1, CREATED)
+            session.rollback()
+            session.commit()
+        self._deliver()
+        self.assertEqual(self.batches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# tests/test_import_time.py
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from src.utils.lazy_imports import lazy_import
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Everything imported before the first window paints.
+STARTUP_MODULES = ["src.main", "src.tabs.dashboard_tab", "src.tabs.create_invoice_tab", "src.tabs.invoice_history_tab"]
+HEAVY_PACKAGES = ("matplotlib", "reportlab", "numpy")
+# Generous on purpose: this catches a heavy import creeping back, not machine noise.
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("BILLING_IMPORT_BUDGET_MS", 2500))
+
+
+def import_times(modules):
+    """Runs `python -X importtime` and returns {module: cumulative microseconds}."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, BILLING_DB_PATH=os.path.join(tmp_dir, "import.db"), QT_QPA_PLATFORM="offscreen")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+        )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartupImports(unittest.TestCase):
+    def test_heavy_libraries_stay_off_the_startup_path(self):
+        times = import_times(STARTUP_MODULES)
+        heavy = sorted(name for name in times if name.split(".")[0] in HEAVY_PACKAGES)
+        self.assertEqual(heavy, [], "imported at startup: " + ", ".join(heavy[:10]))
+        total_ms = sum(times[name] for name in STARTUP_MODULES if name in times) / 1000
+        self.assertLess(total_ms, STARTUP_IMPORT_BUDGET_MS)
+
+    def test_lazy_module_imports_on_first_use(self):
+        sys.modules.pop("colorsys", None)
+        module = lazy_import("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(module.rgb_to_hsv(1, 0, 0), (0.0, 1.0, 1))
+        self.assertIn("colorsys", sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
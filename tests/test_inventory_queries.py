@@ -0,0 +1,53 @@
+# tests/test_inventory_queries.py
+import os
+import tempfile
+import unittest
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.inventory_queries import inventory_stats, inventory_rows_query
+from src.models import CustomerCompany, Product, Inventory
+
+
+class TestInventoryQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            acme = CustomerCompany(name="Acme Traders")
+            globex = CustomerCompany(name="Globex")
+            session.add_all([
+                Inventory(stock_quantity=50, product=Product(name="Bolt", price=1, company=acme)),
+                Inventory(stock_quantity=5, product=Product(name="Nut", price=1, company=acme)),
+                Inventory(stock_quantity=0, product=Product(name="Washer", price=1, company=globex)),
+                Inventory(stock_quantity=3, low_stock_threshold=2, product=Product(name="Screw", price=1, company=globex)),
+                Product(name="Rivet", price=1, company=globex),  # no inventory row
+            ])
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _names(self, **kwargs):
+        with self.Session() as session:
+            return [row[1] for row in inventory_rows_query(session, **kwargs)]
+
+    def test_stats(self):
+        with self.Session() as session:
+            self.assertEqual(inventory_stats(session), (5, 1, 2))
+
+    def test_stock_filters(self):
+        self.assertEqual(self._names(stock_filter="Low Stock"), ["Nut"])
+        self.assertEqual(self._names(stock_filter="Out of Stock"), ["Rivet", "Washer"])
+
+    def test_search_matches_product_or_company(self):
+        self.assertEqual(self._names(search_text="acme"), ["Bolt", "Nut"])
+        self.assertEqual(self._names(search_text="wash"), ["Washer"])
+        self.assertEqual(self._names(search_text="globex", stock_filter="Out of Stock"), ["Rivet", "Washer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_invoice_layout.py
+import io
+import re
+import unittest
+from unittest import mock
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from src.models import UserSettings
+from src.utils import invoice_layout
+from src.utils.invoice_documents import pdf_settings
+from src.utils.invoice_layout import ROW_HEIGHT, paginate
+from src.utils.invoice_template import InvoiceTemplate, ClassicTemplate
+
+
+class TestPaginate(unittest.TestCase):
+    def test_short_invoice_is_one_page(self):
+        self.assertEqual(paginate(5, 20, 30, 6), [(0, 5)])
+        self.assertEqual(paginate(0, 20, 30, 6), [(0, 0)])
+
+    def test_rows_that_fit_only_without_totals_move_one_to_the_next_page(self):
+        # 18 rows fit on page one, but not with the totals under them.
+        self.assertEqual(paginate(18, 20, 30, 6), [(0, 17), (17, 18)])
+
+    def test_long_invoice_fills_pages(self):
+        pages = paginate(100, 20, 30, 6)
+        self.assertEqual(pages, [(0, 19), (19, 47), (47, 75), (75, 99), (99, 100)])
+        # First page: rows plus carried forward; middle pages also give a row to brought forward.
+        self.assertEqual(pages[0][1] - pages[0][0] + 1, 20)
+        self.assertEqual(pages[1][1] - pages[1][0] + 2, 30)
+
+
+class TestMultiPageInvoice(unittest.TestCase):
+    def setUp(self):
+        self.settings = pdf_settings(UserSettings(company_name="Test Company", state_code="27"))
+
+    def _render(self, template_cls, lines):
+        invoice_data = {
+            "invoice_number": "INV-1",
+            "date": "2024-01-01",
+            "vehicle_number": "",
+            "customer": {"name": "Acme", "address": "", "gstin": "", "state_code": "27"},
+            "items": [{"product_name": f"Widget {i}", "quantity": 1, "price_per_unit": 2.0} for i in range(lines)],
+        }
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter, pageCompression=0)
+        template_cls(c, *letter, self.settings).draw_invoice(invoice_data)
+        c.save()
+        return buffer.getvalue().decode("latin-1")
+
+    def test_five_thousand_lines(self):
+        created = []
+        real_item_rows = invoice_layout.ItemRows
+
+        def item_rows(columns, rows, *args):
+            created.append(len(rows))
+            return real_item_rows(columns, rows, *args)
+
+        with mock.patch("src.utils.invoice_template.ItemRows", side_effect=item_rows):
+            pdf = self._render(InvoiceTemplate, 5000)
+
+        page_count = len(created)
+        self.assertGreater(page_count, 100)
+        self.assertEqual(pdf.count("/Type /Page\n"), page_count)
+        self.assertIn(f"(Page 1 of {page_count}) Tj", pdf)
+        self.assertIn(f"(Page {page_count} of {page_count}) Tj", pdf)
+        # Each page builds only its own rows.
+        page_rows = (InvoiceTemplate.continued_top - InvoiceTemplate.table_bottom) // ROW_HEIGHT
+        self.assertLessEqual(max(created), page_rows)
+        self.assertIn("(Widget 4999) Tj", pdf)
+        self.assertIn("10000.00) Tj", pdf)
+
+    def test_carried_forward_matches_brought_forward(self):
+        for template_cls in (InvoiceTemplate, ClassicTemplate):
+            pdf = self._render(template_cls, 120)
+            carried = re.findall(r"\(Carried forward\) Tj.*?\((?:\\\d{3})?([\d.]+)\) Tj", pdf, re.S)
+            brought = re.findall(r"\(Brought forward\) Tj.*?\((?:\\\d{3})?([\d.]+)\) Tj", pdf, re.S)
+            self.assertTrue(carried)
+            self.assertEqual(carried, brought)
+            self.assertEqual(pdf.count(f"/FormXob.InvoiceContinued{template_cls.name} Do"), len(carried))
+
+
+if __name__ == '__main__':
+    unittest.main()
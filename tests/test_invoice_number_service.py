@@ -0,0 +1,90 @@
+# tests/test_invoice_number_service.py
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.invoice_number_service import InvoiceNumberService
+from src.models import Invoice
+
+
+class TestInvoiceNumberService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.service = InvoiceNumberService()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_sequential_numbers(self):
+        with self.Session() as session:
+            numbers = [self.service.get_next_invoice_number(session) for _ in range(3)]
+            session.commit()
+        self.assertEqual(numbers, ["INV-00001", "INV-00002", "INV-00003"])
+
+    def test_rollback_returns_the_number(self):
+        with self.Session() as session:
+            self.service.get_next_invoice_number(session)
+            session.commit()
+        with self.Session() as session:
+            self.service.get_next_invoice_number(session)
+            session.rollback()
+        with self.Session() as session:
+            self.assertEqual(self.service.get_next_invoice_number(session), "INV-00002")
+
+    def test_new_series_continues_after_existing_invoices(self):
+        with self.Session() as session:
+            session.add(Invoice(invoice_number="INV-00041", date=datetime.date(2024, 1, 1)))
+            session.commit()
+            self.assertEqual(self.service.get_next_invoice_number(session), "INV-00042")
+
+    def test_new_series_ignores_other_series_with_the_same_prefix(self):
+        with self.Session() as session:
+            session.add(Invoice(invoice_number="INV-00007", date=datetime.date(2024, 1, 1)))
+            session.add(Invoice(invoice_number="INV-2425-00042", date=datetime.date(2024, 5, 1)))
+            session.commit()
+            self.assertEqual(self.service.get_next_invoice_number(session), "INV-00008")
+            fiscal = InvoiceNumberService(per_fiscal_year=True)
+            self.assertEqual(fiscal.get_next_invoice_number(session, datetime.date(2024, 6, 1)), "INV-2425-00043")
+
+    def test_fiscal_year_series_and_blocks(self):
+        service = InvoiceNumberService(per_fiscal_year=True)
+        with self.Session() as session:
+            block = service.allocate_block(session, 3, datetime.date(2025, 3, 31))
+            next_year = service.get_next_invoice_number(session, datetime.date(2025, 4, 1))
+            session.commit()
+        self.assertEqual(block, ["INV-2425-00001", "INV-2425-00002", "INV-2425-00003"])
+        self.assertEqual(next_year, "INV-2526-00001")
+
+    def test_concurrent_allocators_never_duplicate(self):
+        allocated = []
+        lock = threading.Lock()
+
+        def worker():
+            for i in range(40):
+                with self.Session() as session:
+                    numbers = self.service.allocate_block(session, 1 + i % 3)
+                    session.commit()
+                with lock:
+                    allocated.extend(numbers)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(allocated), len(set(allocated)))
+        expected = 8 * sum(1 + i % 3 for i in range(40))
+        self.assertEqual(sorted(allocated), [f"INV-{n:05d}" for n in range(1, expected + 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
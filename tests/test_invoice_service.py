@@ -0,0 +1,85 @@
+# tests/test_invoice_service.py
+import datetime
+import os
+import tempfile
+import unittest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.invoice_service import InvoiceService, InsufficientStockError
+from src.utils.invoice_number_service import InvoiceNumberService
+from src.models import CustomerCompany, Product, Inventory, InvoiceItem
+
+
+class TestInvoiceService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.service = InvoiceService(InvoiceNumberService())
+        with self.Session() as session:
+            # Two companies selling an identically named product.
+            for company_name in ("Acme", "Globex"):
+                company = CustomerCompany(name=company_name)
+                session.add(company)
+                for i in range(200):
+                    session.add(Inventory(stock_quantity=1000, product=Product(name=f"Widget {i}", price=10.0, company=company)))
+            session.commit()
+            self.acme_id = session.query(CustomerCompany.id).filter_by(name="Acme").scalar()
+            self.globex_products = session.query(Product.id, Product.name).join(Product.company) \
+                .filter(CustomerCompany.name == "Globex").order_by(Product.id).all()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _invoice_data(self, lines, quantity=1):
+        return {
+            "customer_id": self.acme_id,
+            "vehicle_number": "MH-01",
+            "date": datetime.date(2024, 1, 1),
+            "total_amount": 10.0 * lines * quantity,
+            "items": [{"product_id": pid, "product_name": name, "quantity": quantity, "price_per_unit": 10.0}
+                      for pid, name in self.globex_products[:lines]],
+        }
+
+    def _count_statements(self, lines):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            with self.Session() as session:
+                self.service.save_invoice(session, self._invoice_data(lines))
+                session.commit()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        return len(statements)
+
+    def test_round_trips_do_not_grow_with_lines(self):
+        self._count_statements(1)  # creates the numbering series
+        self.assertEqual(self._count_statements(5), self._count_statements(200))
+
+    def test_items_link_to_the_chosen_product(self):
+        with self.Session() as session:
+            invoice = self.service.save_invoice(session, self._invoice_data(3, quantity=4))
+            session.commit()
+            linked = [pid for (pid,) in session.query(InvoiceItem.product_id)
+                      .filter_by(invoice_id=invoice.id).order_by(InvoiceItem.id)]
+            self.assertEqual(linked, [pid for pid, _ in self.globex_products[:3]])
+            self.assertEqual(session.get(Product, self.globex_products[0][0]).inventory.stock_quantity, 996)
+            # Acme's identically named product is untouched.
+            acme_widget = session.query(Product).filter_by(company_id=self.acme_id, name="Widget 0").one()
+            self.assertEqual(acme_widget.inventory.stock_quantity, 1000)
+
+    def test_insufficient_stock(self):
+        with self.Session() as session:
+            with self.assertRaises(InsufficientStockError):
+                self.service.save_invoice(session, self._invoice_data(1, quantity=5000))
+            session.rollback()
+            self.assertEqual(session.query(InvoiceItem).count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# tests/test_invoice_template.py
+import io
+import re
+import unittest
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from src.models import UserSettings
+from src.utils import pdf_fonts
+from src.utils.invoice_documents import DEFAULT_TEMPLATE, TEMPLATE_NAMES, pdf_settings
+from src.utils.invoice_template import TEMPLATES, InvoiceTemplate, ClassicTemplate, template_for, value_positions
+
+
+class TestInvoiceTemplate(unittest.TestCase):
+    def setUp(self):
+        self.settings = pdf_settings(UserSettings(company_name="Test Company", state_code="27", tagline="Thanks"))
+        self.invoice_data = {
+            "invoice_number": "INV-1",
+            "date": "2024-01-01",
+            "vehicle_number": "MH-01",
+            "customer": {"name": "Acme", "address": "Pune", "gstin": "27X", "state_code": "27"},
+            "items": [{"product_name": "Widget", "quantity": 2, "price_per_unit": 10.0}],
+        }
+
+    def _render(self, template_cls, pages=1, first_font=None, first_text=None):
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter, pageCompression=0)
+        if first_font:
+            pdf_fonts.register_fonts()
+            c.setFont(first_font, 10)
+        if first_text:
+            c.drawString(0, 0, first_text)
+        for _ in range(pages):
+            template_cls(c, *letter, self.settings).draw_invoice(self.invoice_data)
+            c.showPage()
+        c.save()
+        return buffer.getvalue().decode("latin-1")
+
+    def test_lookup_by_name(self):
+        self.assertEqual(set(TEMPLATES), {"Modern", "Classic"})
+        self.assertIs(template_for("Classic"), ClassicTemplate)
+        self.assertIs(template_for("Missing"), InvoiceTemplate)
+
+    def test_settings_offer_every_registered_template(self):
+        # SettingsTab offers TEMPLATE_NAMES, kept by hand so it need not import reportlab.
+        self.assertEqual(set(TEMPLATE_NAMES), set(TEMPLATES))
+        self.assertIn(DEFAULT_TEMPLATE, TEMPLATES)
+
+    def test_values_start_after_their_labels(self):
+        pdf_fonts.register_fonts()
+        x, y = value_positions(ClassicTemplate)["Invoice Date: "]
+        self.assertEqual(y, 675)
+        self.assertAlmostEqual(x, 350 + pdfmetrics.stringWidth("Invoice Date: ", pdf_fonts.BOLD, 12))
+
+    def test_form_defined_once_and_placed_on_every_page(self):
+        for template_cls in TEMPLATES.values():
+            pdf = self._render(template_cls, pages=3)
+            self.assertEqual(pdf.count("/Subtype /Form"), 1)
+            self.assertEqual(pdf.count(f"/FormXob.InvoiceStatic{template_cls.name} Do"), 3)
+            self.assertEqual(pdf.count("(Test Company) Tj"), 1)
+            self.assertEqual(pdf.count("(INV-1) Tj"), 3)
+
+    def test_settings_text_set_in_the_bundled_fonts(self):
+        self.settings = self.settings._replace(company_name="Sharma ₹ Traders", tagline="Pay in ₹ only")
+        for template_cls in TEMPLATES.values():
+            pdf = self._render(template_cls)
+            fonts = set(re.findall(r"/BaseFont /(?:\w+\+)?([\w-]+)", pdf))
+            # Helvetica is only the canvas's initial font; nothing is drawn in it.
+            self.assertEqual(fonts, {"Helvetica", "Roboto-Regular", "Roboto-Medium"}, template_cls.name)
+
+    def test_form_uses_this_documents_font_names(self):
+        pdf = self._render(InvoiceTemplate, first_font="Courier")
+        # Courier took /F2, so the company name must use Roboto-Medium's own name.
+        bold = re.search(r"/BaseFont /\w+\+Roboto-Medium .*?/Name (/F\d+)\+0", pdf, re.S).group(1)
+        self.assertNotEqual(bold, "/F2")
+        form = pdf[pdf.index("/Subtype /Form"):]
+        self.assertIn(f"{bold}+0 24 Tf", form[:form.index("(Test Company)")])
+
+    def test_form_uses_this_documents_glyph_codes(self):
+        self.settings = self.settings._replace(company_name="Café ₹", address="Café")
+        # Code 1 already went to another character before the form was drawn.
+        pdf = self._render(InvoiceTemplate, first_font=pdf_fonts.BOLD, first_text="ü")
+        self.assertIn("(\\001) Tj", pdf)
+        self.assertIn("(Caf\\002 \\003) Tj", pdf)
+
+
+if __name__ == '__main__':
+    unittest.main()
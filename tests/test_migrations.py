@@ -0,0 +1,69 @@
+# tests/test_migrations.py
+import os
+import tempfile
+import unittest
+from sqlalchemy import text
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations, get_schema_version, LATEST_VERSION
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _columns(self, conn, table):
+        return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+    def test_fresh_database_reaches_latest_version(self):
+        applied = run_migrations(self.engine)
+        self.assertEqual(applied[-1], LATEST_VERSION)
+        with self.engine.connect() as conn:
+            self.assertEqual(get_schema_version(conn), LATEST_VERSION)
+        self.assertEqual(run_migrations(self.engine), [])
+
+    def test_legacy_database_gets_columns_and_indexes(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE invoices (id INTEGER PRIMARY KEY, invoice_number VARCHAR NOT NULL, "
+                              "customer_id INTEGER, vehicle_number VARCHAR, date DATE NOT NULL, total_amount FLOAT)"))
+            conn.execute(text("INSERT INTO invoices (invoice_number, date) VALUES ('INV-00001', '2024-01-01')"))
+            conn.execute(text("CREATE TABLE user_settings (id INTEGER PRIMARY KEY, company_name VARCHAR)"))
+
+        run_migrations(self.engine)
+
+        with self.engine.connect() as conn:
+            self.assertIn("payment_status", self._columns(conn, "invoices"))
+            self.assertIn("state_code", self._columns(conn, "user_settings"))
+            self.assertEqual(conn.execute(text("SELECT payment_status FROM invoices")).scalar(), "Pending")
+            plan = conn.execute(text("EXPLAIN QUERY PLAN SELECT * FROM invoices ORDER BY date DESC")).all()
+            self.assertIn("ix_invoices_date", plan[0][-1])
+
+    def test_invoice_item_product_backfill(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                              "price FLOAT NOT NULL, company_id INTEGER)"))
+            conn.execute(text("CREATE TABLE invoices (id INTEGER PRIMARY KEY, invoice_number VARCHAR NOT NULL, "
+                              "customer_id INTEGER, vehicle_number VARCHAR, date DATE NOT NULL, total_amount FLOAT)"))
+            conn.execute(text("CREATE TABLE invoice_items (id INTEGER PRIMARY KEY, invoice_id INTEGER, "
+                              "product_name VARCHAR, quantity INTEGER, price_per_unit FLOAT)"))
+            # 'Bolt' is sold by companies 1 and 2; 'Nut' only by company 1.
+            conn.execute(text("INSERT INTO products (id, name, price, company_id) VALUES "
+                              "(1, 'Bolt', 1, 1), (2, 'Bolt', 1, 2), (3, 'Nut', 1, 1)"))
+            conn.execute(text("INSERT INTO invoices (id, invoice_number, customer_id, date) VALUES "
+                              "(1, 'INV-1', 2, '2024-01-01'), (2, 'INV-2', 3, '2024-01-01')"))
+            conn.execute(text("INSERT INTO invoice_items (id, invoice_id, product_name) VALUES "
+                              "(1, 1, 'Bolt'), (2, 2, 'Bolt'), (3, 2, 'Nut')"))
+
+        run_migrations(self.engine)
+
+        with self.engine.connect() as conn:
+            linked = dict(conn.execute(text("SELECT id, product_id FROM invoice_items")).all())
+        self.assertEqual(linked, {1: 2, 2: None, 3: 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/test_pdf_archive.py
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils import pdf_archive
+
+
+class TestPdfArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        self.invoice_data = {"invoice_number": "INV/7", "date": "2024-03-05"}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_laid_out_by_year_and_month(self):
+        path = pdf_archive.save_invoice_pdf(self.invoice_data, b"%PDF-1", root=self.root)
+        self.assertEqual(path, os.path.join(self.root, "2024", "03", "invoice_INV-7.pdf"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1")
+        dated = dict(self.invoice_data, date=datetime.date(2023, 12, 31))
+        self.assertEqual(pdf_archive.archive_path(dated, self.root),
+                         os.path.join(self.root, "2023", "12", "invoice_INV-7.pdf"))
+
+    def test_identical_bytes_are_not_rewritten(self):
+        pdf_archive.save_invoice_pdf(self.invoice_data, b"%PDF-1", root=self.root)
+        with mock.patch.object(pdf_archive, "write_atomic", wraps=pdf_archive.write_atomic) as write:
+            pdf_archive.save_invoice_pdf(self.invoice_data, memoryview(b"%PDF-1"), root=self.root)
+            self.assertEqual(write.call_count, 0)
+            pdf_archive.save_invoice_pdf(self.invoice_data, b"%PDF-2", root=self.root)
+            self.assertEqual(write.call_count, 1)
+
+    def test_failed_write_keeps_the_old_file(self):
+        path = pdf_archive.save_invoice_pdf(self.invoice_data, b"%PDF-1", root=self.root)
+        with mock.patch.object(pdf_archive.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                pdf_archive.save_invoice_pdf(self.invoice_data, b"%PDF-2", root=self.root)
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["invoice_INV-7.pdf"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1")
+
+
+if __name__ == '__main__':
+    unittest.main()
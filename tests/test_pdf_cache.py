@@ -0,0 +1,76 @@
+# tests/test_pdf_cache.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.pdf_cache import PdfCache
+from src.utils.pdf_service import PdfService
+from src.utils.invoice_documents import pdf_settings
+from src.models import UserSettings
+
+
+class TestPdfCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = PdfCache(os.path.join(self.tmp_dir.name, "cache"))
+        self.settings = pdf_settings(UserSettings(company_name="Test Company", state_code="27"))
+        self.invoice_data = {
+            "invoice_number": "INV-1",
+            "date": "2024-01-01",
+            "vehicle_number": "",
+            "customer": {"name": "Acme", "address": "", "gstin": "", "state_code": "27"},
+            "items": [{"product_name": "Widget", "quantity": 2, "price_per_unit": 10.0}],
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _download(self, settings=None, invoice_data=None):
+        with mock.patch.object(PdfService, "render", autospec=True, side_effect=PdfService.render) as render:
+            data = self.cache.invoice_pdf(settings or self.settings, invoice_data or self.invoice_data)
+        self.assertEqual(bytes(data[:5]), b"%PDF-")
+        return render.call_count
+
+    def test_second_download_is_a_read(self):
+        self.assertEqual(self._download(), 1)
+        self.assertEqual(self._download(), 0)
+
+    def test_changed_invoice_data_renders_again(self):
+        self._download()
+        changed = dict(self.invoice_data, vehicle_number="MH-01")
+        self.assertEqual(self._download(invoice_data=changed), 1)
+
+    def test_settings_change_invalidates_old_entries(self):
+        self._download()
+        old_path = self.cache.path_for(self.settings, self.invoice_data)
+        new_settings = self.settings._replace(chosen_template="Classic")
+        self.assertEqual(self._download(settings=new_settings), 1)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+    def test_evicts_least_recently_used(self):
+        invoices = [dict(self.invoice_data, invoice_number=f"INV-{i}") for i in range(3)]
+        for i, invoice_data in enumerate(invoices):
+            self._download(invoice_data=invoice_data)
+            os.utime(self.cache.path_for(self.settings, invoice_data), ns=(i * 10**9, i * 10**9))
+        # A hit makes INV-0 the most recently used.
+        self.assertIsNotNone(self.cache.get(self.settings, invoices[0]))
+        self.cache.max_bytes = self.cache.size() - 1
+        self._download(invoice_data=dict(self.invoice_data, invoice_number="INV-3"))
+        cached = [self.cache.get(self.settings, invoice_data) is not None for invoice_data in invoices]
+        self.assertEqual(cached, [True, False, False])
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+
+    def test_puts_below_the_cap_do_not_rescan(self):
+        with mock.patch.object(PdfCache, "_entries", autospec=True, side_effect=PdfCache._entries) as entries:
+            for i in range(20):
+                self.cache.put(self.settings, dict(self.invoice_data, invoice_number=f"INV-{i}"), b"x" * 100)
+        # One scan on first use, none per put.
+        self.assertEqual(entries.call_count, 1)
+        self.assertEqual(self.cache._total, self.cache.size())
+        self.cache.put(self.settings, dict(self.invoice_data, invoice_number="INV-0"), b"x" * 50)
+        self.assertEqual(self.cache._total, 20 * 100 - 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# tests/test_pdf_fonts.py
+import re
+import unittest
+import zlib
+from reportlab.pdfbase import pdfmetrics
+from src.models import UserSettings
+from src.utils import pdf_fonts
+from src.utils.pdf_service import PdfService
+
+
+class TestPdfFonts(unittest.TestCase):
+    def setUp(self):
+        self.service = PdfService(UserSettings(company_name="Test Company", state_code="27"))
+        self.invoice_data = {
+            "invoice_number": "INV-1",
+            "date": "2024-01-01",
+            "vehicle_number": "",
+            "customer": {"name": "Acme", "address": "Pune", "gstin": "27X", "state_code": "27"},
+            "items": [{"product_name": "Widget", "quantity": 2, "price_per_unit": 10.0}],
+        }
+
+    def test_registered_once_with_a_rupee_glyph(self):
+        pdf_fonts.register_fonts()
+        font = pdfmetrics.getFont(pdf_fonts.REGULAR)
+        pdf_fonts.register_fonts()
+        self.assertIs(pdfmetrics.getFont(pdf_fonts.REGULAR), font)
+        self.assertIn(ord("₹"), font.face.charToGlyph)
+
+    def test_subsets_embedded_in_every_document(self):
+        for _ in range(2):
+            pdf = bytes(self.service.render(self.invoice_data))
+            # Both fonts' streams are complete zlib data of the declared lengths.
+            font_files = list(re.finditer(rb"/Length (\d+) /Length1 (\d+)\s*>>\s*stream\n", pdf))
+            self.assertEqual(len(font_files), 2)
+            for match in font_files:
+                length, length1 = int(match.group(1)), int(match.group(2))
+                self.assertEqual(len(zlib.decompress(pdf[match.end():match.end() + length])), length1)
+
+if __name__ == '__main__':
+    unittest.main()
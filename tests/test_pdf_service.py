@@ -42,18 +42,16 @@ class TestPdfService(unittest.TestCase):
             ]
         }
 
-    def test_generate_invoice(self):
-        # Generate the PDF
+    def test_render_invoice(self):
+        # Render the PDF in memory
         pdf_service = PdfService(self.settings)
-        file_name = pdf_service.generate_invoice(self.invoice_data)
+        data = pdf_service.render(self.invoice_data)
 
-        # Check that the file was created
-        self.assertTrue(os.path.exists(file_name))
+        self.assertEqual(bytes(data[:5]), b"%PDF-")
+        self.assertTrue(bytes(data).rstrip().endswith(b"%%EOF"))
 
-        # TODO: Add assertions to check the content of the PDF
-
-        # Clean up the file
-        os.remove(file_name)
+        # Nothing is written to the working directory
+        self.assertFalse(os.path.exists("invoice_INV-20240101-1.pdf"))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_plot_canvas.py
+import os
+import sys
+import unittest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+from src.utils.plot_canvas import PlotCanvas, nice_ticks, format_value
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestPlotCanvas(unittest.TestCase):
+    def setUp(self):
+        self.canvas = PlotCanvas(width=4, height=3)
+        self.canvas.resize(400, 300)
+
+    def test_renders_every_kind(self):
+        self.canvas.plot_bar(["A", "B"], [3, 5], "Top", "Product", "Qty")
+        self.assertFalse(self.canvas.grab().isNull())
+        self.canvas.plot_pie([0, 0], ["Paid", "Unpaid"], "Status")
+        self.assertFalse(self.canvas.grab().isNull())
+        self.canvas.plot_line(["Jan", "Feb"], [("Revenue", [1.0, 2.0]), ("Previous", [0.5, 1.5])], "Trend", "", "₹")
+        self.assertFalse(self.canvas.grab().isNull())
+
+    def test_same_data_keeps_the_cached_layers(self):
+        self.canvas.plot_bar(["A", "B"], [3, 5], "Top", "Product", "Qty")
+        self.canvas.grab()
+        frame, plot = self.canvas._frame, self.canvas._plot
+        self.canvas.plot_bar(["A", "B"], [3, 5], "Top", "Product", "Qty")
+        self.assertIs(self.canvas._plot, plot)
+        self.canvas.plot_bar(["A", "B"], [4, 5], "Top", "Product", "Qty")
+        self.canvas.grab()
+        self.assertIs(self.canvas._frame, frame)
+        self.assertIsNot(self.canvas._plot, plot)
+
+    def test_does_not_need_matplotlib(self):
+        self.assertNotIn("matplotlib", sys.modules)
+
+    def test_axis_helpers(self):
+        self.assertEqual(nice_ticks(9), [0, 2, 4, 6, 8, 10])
+        self.assertEqual(nice_ticks(0), [0, 1])
+        self.assertEqual(format_value(950), "950")
+        self.assertEqual(format_value(12500), "12.5k")
+        self.assertEqual(format_value(250000), "2.5L")
+
+
+if __name__ == '__main__':
+    unittest.main()
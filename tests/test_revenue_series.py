@@ -0,0 +1,101 @@
+# tests/test_revenue_series.py
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils import revenue_series
+from src.utils.revenue_series import MONTHLY, WEEKLY
+from src.models import Invoice
+
+
+class TestRevenueSeries(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self._add([
+            (datetime.date(2024, 1, 5), 100.0, 1),
+            (datetime.date(2024, 1, 20), 300.0, 2),
+            (datetime.date(2024, 1, 21), 50.0, 2),
+            # Nothing in February.
+            (datetime.date(2024, 3, 1), 400.0, None),
+        ])
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _add(self, invoices):
+        with self.Session() as session:
+            start = session.query(Invoice).count()
+            session.execute(insert(Invoice), [
+                {"invoice_number": f"INV-{start + i}", "date": day, "total_amount": total, "customer_id": customer}
+                for i, (day, total, customer) in enumerate(invoices)
+            ])
+            session.commit()
+
+    def _series(self, period=MONTHLY):
+        with self.Session() as session:
+            return revenue_series.revenue_series(session, period)
+
+    def test_monthly_rollup_fills_gaps(self):
+        series = self._series()
+        self.assertEqual(revenue_series.period_start(series.first, MONTHLY), datetime.date(2024, 1, 1))
+        self.assertEqual(series.revenue.tolist(), [450.0, 0.0, 400.0])
+        self.assertEqual(series.invoice_count.tolist(), [3, 0, 1])
+        self.assertEqual(series.average_ticket.tolist(), [150.0, 0.0, 400.0])
+        self.assertEqual(series.customers.tolist(), [2, 0, 1])
+        self.assertEqual(revenue_series.period_labels(series), ["Jan 24", "Feb 24", "Mar 24"])
+
+    def test_weeks_start_on_monday(self):
+        series = self._series(WEEKLY)
+        self.assertEqual(revenue_series.period_start(series.first, WEEKLY), datetime.date(2024, 1, 1))
+        # Jan 20 (Saturday) and Jan 21 (Sunday) fall in the week of Monday Jan 15.
+        self.assertEqual(series.revenue[2], 350.0)
+        self.assertEqual(series.revenue.sum(), 850.0)
+
+    def test_cached_until_an_invoice_is_added(self):
+        first = self._series()
+        with mock.patch.object(revenue_series, "invoice_columns", side_effect=AssertionError("reloaded")):
+            self.assertIs(self._series(), first)
+        self._add([(datetime.date(2024, 3, 2), 10.0, 1)])
+        with mock.patch.object(revenue_series, "invoice_columns", wraps=revenue_series.invoice_columns) as columns:
+            self.assertEqual(self._series().revenue.tolist(), [450.0, 0.0, 410.0])
+        # Only the invoice added since the last call is read.
+        self.assertEqual(columns.call_args.kwargs, {"after_id": 4})
+
+    def test_reloaded_when_invoices_lose_their_customer_or_are_deleted(self):
+        self.assertEqual(self._series().customers.tolist(), [2, 0, 1])
+        with self.Session() as session:
+            # What deleting both companies does to their invoices.
+            session.execute(update(Invoice).where(Invoice.customer_id.in_([1, 2])).values(customer_id=None))
+            session.commit()
+        self.assertEqual(self._series().customers.tolist(), [1, 0, 1])
+
+        # A deleted invoice is not hidden by a new one with a higher id.
+        with self.Session() as session:
+            session.execute(delete(Invoice).where(Invoice.total_amount == 300.0))
+            session.execute(insert(Invoice).values(invoice_number="INV-NEW", date=datetime.date(2024, 3, 2),
+                                                   total_amount=10.0, customer_id=1))
+            session.commit()
+        self.assertEqual(self._series().revenue.tolist(), [150.0, 0.0, 410.0])
+
+    def test_window_and_comparisons(self):
+        series = self._series()
+        last = revenue_series.current_period(MONTHLY, today=datetime.date(2024, 4, 15))
+        recent = revenue_series.window(series, last, 4)
+        self.assertEqual(recent.revenue.tolist(), [450.0, 0.0, 400.0, 0.0])
+        change = revenue_series.compare(recent.revenue[:3])
+        self.assertEqual((change.current, change.previous, change.change_pct), (400.0, 0.0, None))
+        self.assertEqual(revenue_series.compare([200.0, 250.0]).change_pct, 25.0)
+        self.assertEqual(revenue_series.window(series, last - 12, 2).revenue.tolist(), [0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
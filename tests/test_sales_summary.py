@@ -0,0 +1,101 @@
+# tests/test_sales_summary.py
+import datetime
+import os
+import tempfile
+import unittest
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.invoice_service import InvoiceService
+from src.utils.invoice_number_service import InvoiceNumberService
+from src.utils import sales_summary
+from src.models import (CustomerCompany, Product, Inventory, Invoice,
+                        DailyCustomerSales, DailyProductSales, InvoiceStatusSummary)
+
+
+class TestSalesSummary(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.service = InvoiceService(InvoiceNumberService())
+        with self.Session() as session:
+            self.customers = []
+            for name in ("Acme", "Globex"):
+                company = CustomerCompany(name=name)
+                session.add(company)
+                session.flush()
+                self.customers.append(company.id)
+            for i in range(3):
+                session.add(Inventory(stock_quantity=1000, product=Product(name=f"Widget {i}", price=5.0 + i)))
+            session.commit()
+            self.products = session.query(Product.id, Product.name, Product.price).order_by(Product.id).all()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _save_invoices(self):
+        with self.Session() as session:
+            for n in range(12):
+                lines = self.products[:1 + n % 3]
+                quantity = 1 + n % 4
+                self.service.save_invoice(session, {
+                    "customer_id": self.customers[n % 2],
+                    "vehicle_number": "",
+                    "date": datetime.date(2024, 1, 1 + n % 5),
+                    "total_amount": sum(price * quantity for _, _, price in lines),
+                    "items": [{"product_id": pid, "product_name": name, "quantity": quantity, "price_per_unit": price}
+                              for pid, name, price in lines],
+                })
+            session.commit()
+
+    def _snapshot(self, session):
+        return {
+            model.__tablename__: sorted(tuple(row) for row in session.execute(select(*model.__table__.columns)))
+            for model in (DailyCustomerSales, DailyProductSales, InvoiceStatusSummary)
+        }
+
+    def test_incremental_updates_match_a_rebuild(self):
+        self._save_invoices()
+        with self.Session() as session:
+            invoice = session.query(Invoice).order_by(Invoice.id).first()
+            sales_summary.record_status_change(session, invoice.payment_status, "Paid", invoice.total_amount)
+            invoice.payment_status = "Paid"
+            session.commit()
+
+            incremental = self._snapshot(session)
+            sales_summary.rebuild(session)
+            self.assertEqual(self._snapshot(session), incremental)
+
+            total_invoices, paid, revenue = sales_summary.status_totals(session)
+            self.assertEqual((total_invoices, paid), (12, 1))
+            self.assertAlmostEqual(revenue, session.query(text("SUM(total_amount) FROM invoices")).scalar())
+            self.assertEqual(sales_summary.top_products(session, limit=1), [("Widget 0", 30)])
+            self.assertEqual(len(sales_summary.top_customers(session)), 2)
+
+    def test_rolled_back_invoice_leaves_summary_untouched(self):
+        with self.Session() as session:
+            self.service.save_invoice(session, {
+                "customer_id": self.customers[0], "vehicle_number": "", "date": datetime.date(2024, 2, 1),
+                "total_amount": 5.0, "items": [{"product_id": self.products[0][0], "product_name": "Widget 0",
+                                                "quantity": 1, "price_per_unit": 5.0}],
+            })
+            session.rollback()
+            self.assertEqual(sales_summary.status_totals(session), (0, 0, 0.0))
+
+    def test_migration_fills_summary_from_existing_invoices(self):
+        self._save_invoices()
+        with self.engine.begin() as conn:
+            for table in ("daily_customer_sales", "daily_product_sales", "invoice_status_summary"):
+                conn.execute(text(f"DROP TABLE {table}"))
+            conn.execute(text("DELETE FROM schema_version WHERE version >= 5"))
+        self.assertIn(5, run_migrations(self.engine))
+        with self.Session() as session:
+            self.assertEqual(sales_summary.status_totals(session)[0], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
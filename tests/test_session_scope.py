@@ -0,0 +1,61 @@
+# tests/test_session_scope.py
+import os
+import tempfile
+import unittest
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.session_scope import read_scope, write_scope, session_stats, ReadOnlySessionError
+from src.models import CustomerCompany
+
+
+class TestSessionScope(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        session_stats.reset()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_write_scope_commits(self):
+        with write_scope(self.factory) as session:
+            session.add(CustomerCompany(name="Acme"))
+        with read_scope(self.factory) as session:
+            company = session.query(CustomerCompany).one()
+        # Values loaded in a read scope remain readable after it closes.
+        self.assertEqual(company.name, "Acme")
+
+    def test_write_scope_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with write_scope(self.factory) as session:
+                session.add(CustomerCompany(name="Acme"))
+                session.flush()
+                raise ValueError("boom")
+        with read_scope(self.factory) as session:
+            self.assertEqual(session.query(CustomerCompany).count(), 0)
+
+    def test_read_scope_rejects_writes(self):
+        with self.assertRaises(ReadOnlySessionError):
+            with read_scope(self.factory) as session:
+                session.add(CustomerCompany(name="Acme"))
+                session.flush()
+
+    def test_identity_map_is_released_per_scope(self):
+        with write_scope(self.factory) as session:
+            session.add_all([CustomerCompany(name=f"Company {i}") for i in range(50)])
+        for _ in range(3):
+            with read_scope(self.factory) as session:
+                companies = session.query(CustomerCompany).all()
+        self.assertEqual(len(companies), 50)
+        stats = session_stats.as_dict()
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["last_identity_map_size"], 50)
+        self.assertEqual(stats["peak_identity_map_size"], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
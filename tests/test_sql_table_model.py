@@ -0,0 +1,117 @@
+# tests/test_sql_table_model.py
+import datetime
+import os
+import tempfile
+import unittest
+from PyQt6.QtCore import Qt
+from sqlalchemy import insert, update, delete
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.sql_table_model import SqlTableModel, SqlColumn, _bisect_descending
+from src.models import Invoice
+from src.models.rows import InvoiceRow
+
+
+class TestSqlTableModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            # Only 10 distinct dates, so the id tie-breaker matters for paging.
+            session.execute(insert(Invoice), [
+                {"invoice_number": f"INV-{i:05d}", "date": datetime.date(2024, 1, 1 + i % 10), "total_amount": float(i % 37)}
+                for i in range(1, 1001)
+            ])
+            session.commit()
+        self.model = SqlTableModel(
+            [
+                SqlColumn("Invoice #", "invoice_number", Invoice.invoice_number),
+                SqlColumn("Date", "date", Invoice.date),
+                SqlColumn("Total", "total_amount", Invoice.total_amount, lambda total: f"{total:.2f}"),
+            ],
+            lambda session: session.query(Invoice.id, Invoice.invoice_number, Invoice.invoice_number,
+                                          Invoice.date, Invoice.total_amount, Invoice.payment_status),
+            key_column=Invoice.id, row_type=InvoiceRow, page_size=128,
+            sort_column=1, sort_order=Qt.SortOrder.DescendingOrder, session_factory=self.Session
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _fetch_all(self):
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        return [self.model.row_at(i) for i in range(self.model.rowCount())]
+
+    def test_first_page_only(self):
+        self.model.refresh()
+        self.assertEqual(self.model.rowCount(), 128)
+        self.assertTrue(self.model.canFetchMore())
+        self.assertEqual(self.model.data(self.model.index(0, 0)), "INV-00999")
+
+    def test_keyset_pages_cover_every_row_in_order(self):
+        self.model.refresh()
+        rows = self._fetch_all()
+        self.assertEqual(len({row.id for row in rows}), 1000)
+        keys = [(row.date, row.id) for row in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_server_side_sort(self):
+        self.model.sort(2, Qt.SortOrder.AscendingOrder)
+        rows = self._fetch_all()
+        keys = [(row.total_amount, row.id) for row in rows]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(rows), 1000)
+
+    def test_editable_column_updates_the_loaded_row(self):
+        edits = []
+        self.model.columns.append(SqlColumn("Status", "payment_status", Invoice.payment_status,
+                                            on_edit=lambda row, value: edits.append((row.id, value))))
+        self.model.refresh()
+        index = self.model.index(0, 3)
+        self.assertTrue(self.model.flags(index) & Qt.ItemFlag.ItemIsEditable)
+        self.assertFalse(self.model.flags(self.model.index(0, 0)) & Qt.ItemFlag.ItemIsEditable)
+        self.assertTrue(self.model.setData(index, "Paid"))
+        self.assertEqual(edits, [(self.model.row_at(0).id, "Paid")])
+        self.assertEqual(self.model.data(index), "Paid")
+
+    def test_refresh_rows_updates_moves_removes_and_inserts(self):
+        self.model.refresh()
+        first, second, third = (self.model.row_at(i) for i in range(3))
+        with self.Session() as session:
+            session.execute(update(Invoice).where(Invoice.id == first.id).values(total_amount=500.0))
+            session.execute(update(Invoice).where(Invoice.id == second.id).values(date=datetime.date(2023, 1, 1)))
+            session.execute(delete(Invoice).where(Invoice.id == third.id))
+            new_id = session.execute(insert(Invoice).values(
+                invoice_number="INV-NEW", date=datetime.date(2024, 2, 1), total_amount=1.0)).inserted_primary_key[0]
+            session.commit()
+
+        self.model.refresh_rows([first.id, second.id, third.id, new_id])
+        self.assertEqual(self.model.rowCount(), 128 - 2 + 1)
+        self.assertEqual(self.model.row_at(0).id, new_id)
+        self.assertEqual(self.model.row_at(1).id, first.id)
+        self.assertEqual(self.model.row_at(1).total_amount, 500.0)
+        # The moved row now sorts past the loaded pages and arrives with a later one.
+        rows = self._fetch_all()
+        self.assertEqual([row.id for row in rows].count(second.id), 1)
+        self.assertEqual(rows[-1].id, second.id)
+        self.assertNotIn(third.id, [row.id for row in rows])
+        self.assertEqual(len(rows), 1000)
+
+
+class TestBisectDescending(unittest.TestCase):
+    def test_matches_bisect_left_on_the_reversed_order(self):
+        keys = [(5, 9), (5, 3), (4, 7), (2, 1), (2, 1), (1, 0)]
+        for key in [(6, 0), (5, 3), (3, 0), (2, 1), (0, 0)]:
+            position = _bisect_descending(keys, key)
+            self.assertTrue(all(k > key for k in keys[:position]))
+            self.assertTrue(all(k <= key for k in keys[position:]))
+        self.assertEqual(_bisect_descending(keys, (2, 1)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+# tests/test_startup_profile.py
+import io
+import unittest
+from src.utils.startup_profile import StartupProfile
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_nested_measurements_are_not_double_counted(self):
+        profile = StartupProfile(enabled=True)
+        profile.record("imports", 0.5)
+        with profile.measure("main window"):
+            with profile.measure("tab: Dashboard"):
+                pass
+        self.assertEqual([(label, depth) for label, _, depth in profile.timings],
+                         [("imports", 0), ("tab: Dashboard", 1), ("main window", 0)])
+        total = profile.timings[0][1] + profile.timings[2][1]
+        self.assertIn(f"{total * 1000:8.1f} ms", profile.format_report().splitlines()[-1])
+
+    def test_report_is_silent_unless_enabled(self):
+        stream = io.StringIO()
+        StartupProfile(enabled=False).report(stream)
+        self.assertEqual(stream.getvalue(), "")
+        profile = StartupProfile(enabled=True)
+        profile.record("imports", 0.1)
+        profile.report(stream)
+        profile.report(stream)
+        self.assertEqual(stream.getvalue().count("Startup timings:"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
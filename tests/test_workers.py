@@ -0,0 +1,116 @@
+# tests/test_workers.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+from PyQt6.QtCore import QCoreApplication, QThreadPool, Qt
+from PyQt6.QtTest import QTest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from src.utils.database import create_db_engine
+from src.utils.migrations import run_migrations
+from src.utils.sql_table_model import SqlTableModel, SqlColumn
+from src.utils.workers import DataLoader
+from src.models import CustomerCompany
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QTest.qWait(5)
+    return predicate()
+
+
+class TestDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_db_engine(os.path.join(self.tmp_dir.name, "test.db"))
+        run_migrations(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.execute(insert(CustomerCompany), [{"name": f"Company {i:04d}"} for i in range(500)])
+            session.commit()
+        self.pool = QThreadPool()
+        self.loader = DataLoader(session_factory=self.Session, pool=self.pool)
+        self.loading = []
+        self.loader.loadingChanged.connect(self.loading.append)
+
+    def tearDown(self):
+        self.pool.waitForDone()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_query_runs_off_the_gui_thread(self):
+        results = []
+        gui_thread = threading.get_ident()
+        self.loader.load("count", lambda session: (threading.get_ident(), session.query(CustomerCompany).count()),
+                         results.append)
+        self.assertTrue(wait_until(lambda: results))
+        worker_thread, count = results[0]
+        self.assertNotEqual(worker_thread, gui_thread)
+        self.assertEqual(count, 500)
+        self.assertEqual(self.loading, [True, False])
+
+    def test_superseded_request_is_dropped(self):
+        results = []
+        release = threading.Event()
+
+        def slow(session):
+            release.wait(5)
+            return "old"
+
+        self.loader.load("search", slow, results.append)
+        self.loader.load("search", lambda session: "new", results.append)
+        release.set()
+        self.assertTrue(wait_until(lambda: not self.loader.is_loading()))
+        self.pool.waitForDone()
+        QTest.qWait(20)
+        self.assertEqual(results, ["new"])
+        self.assertEqual(self.loading, [True, False])
+
+    def test_failure_reaches_error_callback(self):
+        errors = []
+        self.loader.load("broken", lambda session: 1 / 0, lambda result: None, errors.append)
+        self.assertTrue(wait_until(lambda: errors))
+        self.assertIn("division by zero", errors[0])
+        self.assertFalse(self.loader.is_loading())
+
+    def test_table_model_pages_in_the_background(self):
+        model = SqlTableModel(
+            [SqlColumn("Name", 1, CustomerCompany.name)],
+            lambda session: session.query(CustomerCompany.id, CustomerCompany.name),
+            key_column=CustomerCompany.id, page_size=200, loader=self.loader
+        )
+        model.refresh()
+        self.assertEqual(model.rowCount(), 0)
+        self.assertFalse(model.canFetchMore())  # a page is already in flight
+        self.assertTrue(wait_until(lambda: model.rowCount() == 200))
+        model.fetchMore()
+        model.sort(0, Qt.SortOrder.DescendingOrder)  # supersedes the page being fetched
+        self.assertTrue(wait_until(lambda: not self.loader.is_loading()))
+        self.assertEqual(model.rowCount(), 200)
+        self.assertEqual(model.data(model.index(0, 0)), "Company 0499")
+
+    def test_row_refresh_in_the_background(self):
+        model = SqlTableModel(
+            [SqlColumn("Name", 1, CustomerCompany.name)],
+            lambda session: session.query(CustomerCompany.id, CustomerCompany.name),
+            key_column=CustomerCompany.id, page_size=100, loader=self.loader
+        )
+        model.refresh()
+        self.assertTrue(wait_until(lambda: model.rowCount() == 100))
+        with self.Session() as session:
+            new_company = CustomerCompany(name="Company 0000a")
+            session.add(new_company)
+            session.commit()
+            new_id = new_company.id
+        model.refresh_rows([new_id])
+        self.assertTrue(wait_until(lambda: model.rowCount() == 101))
+        self.assertEqual(model.data(model.index(1, 0)), "Company 0000a")
+
+
+if __name__ == '__main__':
+    unittest.main()